@@ -1,9 +1,21 @@
+from os import getenv
+
 import numpy as np
 import pandas as pd
 import streamlit as st
 
+from src import data_fetcher, instrumentation
 from src.black_scholes import BlackScholes
-from src.data_fetcher import fetch_stock_data, get_risk_free_rate
+from src.grid_cache import HeatmapGridCache
+from src.heatmap_engine import refine_heatmap
+from src.instrumentation import PROFILE_MODES, ProfileCapture
+from src.lattice import LatticePricer
+from src.option_chain import VolSurface, compute_chain_ivs, load_option_chain
+from src.portfolio import STRATEGIES, Portfolio
+from src.scenarios import run_scenarios
+from src.shared_store import SharedMarketStore
+from src.streaming import QuoteStream, StreamingPricer
+from src.surface import DAYS_PER_YEAR, SurfaceCache
 from src.visualizations import (
     create_greeks_plot,
     create_heatmap,
@@ -12,6 +24,68 @@ from src.visualizations import (
 
 st.set_page_config(layout="wide", page_title="Options Pricer", page_icon="📈")
 
+# e.g. tcp://localhost:9000 or replay:///path/to/quotes.jsonl
+QUOTE_FEED_URL = getenv("QUOTE_FEED_URL")
+LIVE_REFRESH_RATE = 2.0
+
+# the panel's checkbox sits at the bottom of the sidebar, but timing has to start before anything else runs;
+# the run is local to this session's script thread, so other sessions keep their own setting
+debug_panel = st.session_state.get("debug_panel", False)
+# a rerun interrupted before finish_run() can leave its run on this thread
+instrumentation.finish_run()
+if debug_panel or instrumentation.ENABLED_BY_DEFAULT:
+    instrumentation.start_run()
+profiler = None
+if debug_panel and st.session_state.get("debug_profile", False):
+    try:
+        profiler = ProfileCapture(st.session_state.get("debug_profile_mode", "cprofile")).start()
+    except ImportError as e:
+        st.sidebar.warning(str(e))
+
+
+@st.cache_resource(show_spinner=False)
+def get_market_store():
+    # one store per server process, shared by every session
+    return SharedMarketStore().start()
+
+
+@st.cache_resource(show_spinner=False)
+def get_grid_cache():
+    return HeatmapGridCache(max_entries=32)
+
+
+@st.cache_resource(show_spinner=False)
+def get_surface_cache():
+    return SurfaceCache(max_entries=16)
+
+
+@st.cache_resource(show_spinner=False)
+def get_quote_stream(url):
+    return QuoteStream(url).start()
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def load_chain(ticker):
+    # the download is the slow part, so it is keyed on the ticker alone
+    try:
+        return load_option_chain(ticker)
+    except Exception as e:
+        print(f"Error loading option chain: {e}")
+        return None
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def load_vol_surface(ticker, spot, r, q):
+    chain = load_chain(ticker)
+    if chain is None:
+        return None
+    try:
+        return VolSurface.from_chain(compute_chain_ivs(chain, spot, r, q), spot)
+    except Exception as e:
+        print(f"Error building volatility surface: {e}")
+        return None
+
+
 # Sidebar
 st.sidebar.markdown(
     """
@@ -50,26 +124,45 @@ st.sidebar.markdown(
 
 st.sidebar.markdown("---")
 
+instrumentation.stage("app.market_data")
 st.sidebar.subheader("Stock Information")
 ticker = st.sidebar.text_input("Stock Ticker", value="AAPL")
-stock_data = fetch_stock_data(ticker)
+market_store = get_market_store()
+stock_data = market_store.stock_data(ticker)
 st.sidebar.markdown(f"**Company:** {stock_data['company_name']}")
-S = st.sidebar.number_input("Current Stock Price ($)", value=stock_data["current_price"], step=0.01)
+volatility_estimates = stock_data.get("volatility_estimates") or {}
+if volatility_estimates:
+    st.sidebar.caption(
+        "Historical volatility: " + ", ".join(f"{name} {value:.1%}" for name, value in volatility_estimates.items())
+    )
+S = st.sidebar.number_input("Current Stock Price ($)", value=float(stock_data["current_price"]), step=0.01)
+live_quotes = bool(QUOTE_FEED_URL) and st.sidebar.toggle("Stream Live Quotes", value=False)
 st.sidebar.markdown("<br>", unsafe_allow_html=True)
 
 st.sidebar.subheader("Option &  Market Parameters")
 K = st.sidebar.number_input("Strike Price ($)", value=S, step=0.01)
 T = st.sidebar.number_input("Time to Maturity (years)", value=1.0, min_value=0.1, max_value=10.0, step=0.1)
+default_rate = market_store.risk_free_rate(T)
+# rounded to 4 significant figures and whole basis points, so quote refreshes and maturity edits reuse the surface
+vol_surface = load_vol_surface(
+    ticker,
+    float(f"{stock_data['current_price']:.4g}"),
+    round(float(default_rate), 4),
+    round(float(stock_data["dividend_yield"]), 4),
+)
+default_sigma = vol_surface.vol(K, T) if vol_surface is not None else np.nan
+if not np.isfinite(default_sigma):
+    default_sigma = stock_data["volatility"]
 sigma = st.sidebar.number_input(
     "Volatility (σ)",
-    value=stock_data["volatility"],
+    value=float(np.clip(default_sigma, 0.01, 2.0)),
     min_value=0.01,
     max_value=2.0,
     step=0.01,
 )
 r = st.sidebar.number_input(
     "Risk-free Rate (%)",
-    value=get_risk_free_rate(T) * 100,
+    value=default_rate * 100,
     min_value=0.0,
     max_value=20.0,
     step=0.01,
@@ -84,6 +177,8 @@ q = st.sidebar.number_input(
     format="%.2f",
 )
 
+exercise_style = st.sidebar.selectbox("Exercise Style", ["European", "American"])
+
 r /= 100
 q /= 100
 
@@ -100,16 +195,24 @@ heatmap_price_range = st.sidebar.slider("Stock Price Range (%)", min_value=10, m
 heatmap_volatility_range = st.sidebar.slider(
     "Volatility Range (%)", min_value=10, max_value=500, value=(50, 150), step=10
 )
+high_res_heatmap = st.sidebar.checkbox("High-resolution heatmap", value=False)
 
 # Body
+instrumentation.stage("app.pricing")
 st.title("📊 Black-Scholes Option Pricer")
 
-bs_call = BlackScholes(S, K, T, r, sigma, q)
-bs_put = BlackScholes(S, K, T, r, sigma, q)
-call_price = bs_call.calculate_option_price("call")
-put_price = bs_put.calculate_option_price("put")
-call_greeks = bs_call.calculate_greeks()
-put_greeks = bs_put.calculate_greeks()
+if S <= 0 or K <= 0:
+    # the stock data fetch falls back to a price of 0, which nothing below can price
+    st.info("Enter a positive stock price and strike price to price options.")
+    st.stop()
+
+if exercise_style == "American":
+    option_result = LatticePricer(S, K, T, r, sigma, q).calculate_all()
+else:
+    option_result = BlackScholes(S, K, T, r, sigma, q).calculate_all()
+call_price = option_result.call
+put_price = option_result.put
+call_greeks = put_greeks = option_result.greeks()
 
 col1, col2 = st.columns(2)
 
@@ -178,59 +281,226 @@ with col2:
     else:
         st.info(f"Break-even   —   {status}")
 
-st.markdown("---")
 
-st.subheader("Option Price and PnL Heatmap")
-S_range = np.linspace(S * heatmap_price_range[0] / 100, S * heatmap_price_range[1] / 100, 50)
-sigma_range = np.linspace(
-    sigma * heatmap_volatility_range[0] / 100,
-    sigma * heatmap_volatility_range[1] / 100,
-    50,
-)
+@st.fragment(run_every=1 / LIVE_REFRESH_RATE)
+def live_prices():
+    # start() brings back a stream whose feed has ended since it was cached
+    stream = get_quote_stream(QUOTE_FEED_URL).start()
+    key = (ticker.upper(), K, T, r, sigma, q)
+    if st.session_state.get("live_key") != key:
+        if "live_pricer" in st.session_state:
+            stream.unsubscribe(st.session_state.live_pricer)
+        book = Portfolio(capacity=2)
+        book.add_legs(ticker.upper(), ["call", "put"], K, T)
+        # the session holds the pricer; the stream only keeps a weak reference
+        st.session_state.live_pricer = stream.subscribe(
+            StreamingPricer(book, S, sigma, r, q, max_rate=LIVE_REFRESH_RATE)
+        )
+        st.session_state.live_key = key
+
+    update = st.session_state.live_pricer.latest
+    call_value, put_value = update.position["value"]
+    spot_col, call_col, put_col = st.columns(3)
+    spot_col.metric("Spot", f"${update.spot[ticker.upper()]:.2f}", delta=f"{update.spot[ticker.upper()] - S:+.2f}")
+    call_col.metric("Call", f"${call_value:.2f}", delta=f"{call_value - call_price:+.2f}")
+    put_col.metric("Put", f"${put_value:.2f}", delta=f"{put_value - put_price:+.2f}")
+    if update.sequence:
+        st.caption(
+            f"Black-Scholes update {update.sequence}: {update.ticks} ticks coalesced, "
+            f"published {update.latency * 1000:.0f} ms after the first of them"
+        )
+    else:
+        st.caption(f"Waiting for {ticker.upper()} quotes from the feed")
 
-call_prices = np.array(
-    [[BlackScholes(s, K, T, r, sig, q).calculate_option_price("call") for s in S_range] for sig in sigma_range]
-)
-put_prices = np.array(
-    [[BlackScholes(s, K, T, r, sig, q).calculate_option_price("put") for s in S_range] for sig in sigma_range]
-)
 
-call_pnl = call_prices - call_purchase_price
-put_pnl = put_prices - put_purchase_price
+if live_quotes:
+    instrumentation.stage("app.live_quotes")
+    st.markdown("---")
+    st.subheader("Live Quotes")
+    live_prices()
 
-col1, col2 = st.columns(2)
-with col1:
-    st.plotly_chart(create_heatmap(S_range, sigma_range, call_pnl, call_prices, "Call Option PnL"))
-with col2:
-    st.plotly_chart(create_heatmap(S_range, sigma_range, put_pnl, put_prices, "Put Option PnL"))
+instrumentation.stage("app.heatmap")
+st.markdown("---")
 
+st.subheader("Option Price and PnL Heatmap")
+col1, col2 = st.columns(2)
+call_heatmap, put_heatmap = col1.empty(), col2.empty()
+
+if high_res_heatmap:
+    # render the coarse grid straight away and replace it as finer levels arrive
+    heatmap_levels = refine_heatmap(S, K, T, r, q, sigma, heatmap_price_range, heatmap_volatility_range)
+else:
+    heatmap_levels = [get_grid_cache().get(S, K, T, r, q, sigma, heatmap_price_range, heatmap_volatility_range)]
+
+for level in heatmap_levels:
+    S_range, sigma_range, call_prices, put_prices = level[-4:]
+    call_pnl = call_prices - call_purchase_price
+    put_pnl = put_prices - put_purchase_price
+    call_heatmap.plotly_chart(create_heatmap(S_range, sigma_range, call_pnl, call_prices, "Call Option PnL", lean=True))
+    put_heatmap.plotly_chart(create_heatmap(S_range, sigma_range, put_pnl, put_prices, "Put Option PnL", lean=True))
+
+instrumentation.stage("app.profit_loss")
 st.markdown("---")
 
 st.subheader("Profit/Loss Chart")
 S_range = np.linspace(0.5 * K, 1.5 * K, 100)  # type: ignore
-call_pnl_range = [max(s - K, 0) - call_purchase_price for s in S_range]
-put_pnl_range = [max(K - s, 0) - put_purchase_price for s in S_range]
-call_break_even = S_range[np.argmin(np.abs(call_pnl_range))]
-put_break_even = S_range[np.argmin(np.abs(put_pnl_range))]
+# prices and Greeks for every time to expiry up to T, so moving the slider below only slices the cached surface
+surface = get_surface_cache().get(S_range, K, T, r, sigma, q)
+days_to_expiry = round(T * DAYS_PER_YEAR)
+days_left = st.slider(
+    "Days to Expiry Shown", min_value=0, max_value=days_to_expiry, value=0, help="0 shows the P&L at expiry"
+)
+if exercise_style == "American":
+    st.caption("Curves before expiry use European (Black-Scholes) values.")
+reference_days = {"Today": days_to_expiry, "In 30 Days": days_to_expiry - 30, "Expiry": 0}
+reference_days = {name: days for name, days in reference_days.items() if 0 <= days != days_left}
+remaining = np.array([days_left, *reference_days.values()]) / DAYS_PER_YEAR
+col1, col2 = st.columns(2)
+for column, option_type, purchase_price in ((col1, "call", call_purchase_price), (col2, "put", put_purchase_price)):
+    pnl, *reference_pnl = surface.pnl(remaining, option_type, purchase_price)
+    break_even = S_range[np.argmin(np.abs(pnl))]
+    title = f"{option_type.capitalize()} Option P&L" + (f" with {days_left} Days Left" if days_left else "")
+    curves = dict(zip(reference_days, reference_pnl, strict=True))
+    column.plotly_chart(create_profit_loss_chart(S_range, pnl, break_even, title, lean=True, curves=curves))
+
+instrumentation.stage("app.greeks")
+st.markdown("---")
+
+st.subheader("Greeks")
+if exercise_style == "American":
+    range_greeks = LatticePricer(S_range, K, T, r, sigma, q, steps=100).calculate_all().greeks()
+else:
+    # the surface's last row is priced at exactly T
+    range_greeks = {name: values[-1] for name, values in surface.values.items() if name not in ("call", "put")}
+call_greeks_values = {greek: range_greeks[greek] for greek in ["delta_call", "gamma", "vega", "theta_call", "rho_call"]}
+put_greeks_values = {greek: range_greeks[greek] for greek in ["delta_put", "gamma", "vega", "theta_put", "rho_put"]}
+if "gamma_put" in range_greeks:
+    put_greeks_values |= {"gamma": range_greeks["gamma_put"], "vega": range_greeks["vega_put"]}
 col1, col2 = st.columns(2)
 with col1:
-    st.plotly_chart(create_profit_loss_chart(S_range, call_pnl_range, call_break_even, "Call Option P&L"))
+    st.plotly_chart(create_greeks_plot(S_range, call_greeks_values, "Call Option Greeks", lean=True))
 with col2:
-    st.plotly_chart(create_profit_loss_chart(S_range, put_pnl_range, put_break_even, "Put Option P&L"))
+    st.plotly_chart(create_greeks_plot(S_range, put_greeks_values, "Put Option Greeks", lean=True))
 
+instrumentation.stage("app.strategies")
 st.markdown("---")
 
-st.subheader("Greeks")
-call_greeks_values = {
-    greek: [BlackScholes(s, K, T, r, sigma, q).calculate_greeks()[greek] for s in S_range]
-    for greek in ["delta_call", "gamma", "vega", "theta_call", "rho_call"]
-}
-put_greeks_values = {
-    greek: [BlackScholes(s, K, T, r, sigma, q).calculate_greeks()[greek] for s in S_range]
-    for greek in ["delta_put", "gamma", "vega", "theta_put", "rho_put"]
-}
+st.subheader("Option Strategies")
+col1, col2 = st.columns(2)
+strategy = col1.selectbox("Strategy", list(STRATEGIES), index=list(STRATEGIES).index("Iron Condor"))
+# K is 0 when the stock data could not be fetched, and a default below min_value fails the whole page
+strike_width = col2.number_input("Strike Width ($)", value=max(round(0.05 * K, 2), 0.01), min_value=0.01, step=0.5)
+
+strategy_book = Portfolio()
+strategy_book.add_strategy(strategy, ticker, K, strike_width, T)
+# legs are opened at their model value, so the chart shows the P&L at expiry of entering the strategy today
+strategy_book.mark_premiums(S, sigma, r, q)
+strategy_legs = strategy_book.legs
+strategy_net = strategy_book.net_greeks(S, sigma, r, q)
+strategy_pnl = strategy_book.payoff_at_expiry(S_range)
+strategy_break_even = S_range[np.argmin(np.abs(strategy_pnl))]
+
 col1, col2 = st.columns(2)
 with col1:
-    st.plotly_chart(create_greeks_plot(S_range, call_greeks_values, "Call Option Greeks"))
+    st.write("Legs")
+    st.table(
+        pd.DataFrame(
+            {
+                "Type": np.where(strategy_legs["is_call"], "Call", "Put"),
+                "Strike": [f"${strike:.2f}" for strike in strategy_legs["strike"]],
+                "Quantity": strategy_legs["quantity"].astype(int),
+                "Premium": [f"${premium:.2f}" for premium in strategy_legs["premium"]],
+            }
+        )
+    )
+    st.write("Net Position")
+    net_rows = {
+        "Net Premium": strategy_net["value"],
+        "Δ (Delta)": strategy_net["delta"],
+        "Γ (Gamma)": strategy_net["gamma"],
+        "ν (Vega)": strategy_net["vega"],
+        "Θ (Theta)": strategy_net["theta"],
+        "ρ (Rho)": strategy_net["rho"],
+    }
+    st.table(
+        pd.DataFrame(
+            {name: f"{value:.4f}" for name, value in net_rows.items()}.items(), columns=["Greek", "Value"]
+        ).set_index("Greek")
+    )
 with col2:
-    st.plotly_chart(create_greeks_plot(S_range, put_greeks_values, "Put Option Greeks"))
+    st.plotly_chart(
+        create_profit_loss_chart(S_range, strategy_pnl, strategy_break_even, f"{strategy} P&L at Expiry", lean=True)
+    )
+
+instrumentation.stage("app.stress_test")
+st.write("Stress Test")
+stress = run_scenarios(strategy_book, S, sigma, r, q, worst_count=5)
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("95% VaR", f"${stress.var[0.95]:.2f}")
+col2.metric("95% ES", f"${stress.expected_shortfall[0.95]:.2f}")
+col3.metric("99% VaR", f"${stress.var[0.99]:.2f}")
+col4.metric("99% ES", f"${stress.expected_shortfall[0.99]:.2f}")
+st.table(
+    pd.DataFrame(
+        {
+            "Spot Shock": [f"{case['spot_shock']:+.1%}" for case in stress.worst],
+            "Vol Shock": [f"{case['vol_shock']:+.2f}" for case in stress.worst],
+            "Days Passed": [int(case["days"]) for case in stress.worst],
+            "Rate Shock": [f"{case['rate_shock']:+.2%}" for case in stress.worst],
+            "P&L": [f"${case['pnl']:.2f}" for case in stress.worst],
+        }
+    )
+)
+
+
+def show_debug_panel(run, profiler):
+    with st.expander(f"Performance: this rerun took {run.duration_ms:.0f} ms", expanded=True):
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Market data cache hit rate", f"{data_fetcher.market_data_cache.stats.hit_rate:.0%}")
+        col2.metric("Heatmap grid cache hit rate", f"{get_grid_cache().stats.hit_rate:.0%}")
+        col3.metric("P&L surface cache hit rate", f"{get_surface_cache().stats.hit_rate:.0%}")
+
+        breakdown = run.breakdown()
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write("Stages and spans")
+            st.table(
+                pd.DataFrame(
+                    {
+                        "Span": ["· " * row["depth"] + row["span"] for row in breakdown],
+                        "Calls": [row["calls"] for row in breakdown],
+                        "Time (ms)": [f"{row['total_ms']:.2f}" for row in breakdown],
+                        "Share": [f"{row['share']:.1%}" for row in breakdown],
+                    }
+                )
+            )
+        with col2:
+            st.write("Pricing kernels")
+            st.table(
+                pd.DataFrame(
+                    {
+                        "Kernel": list(run.counters),
+                        "Calls": [calls for calls, _ in run.counters.values()],
+                        "Contracts/Paths": [f"{items:,}" for _, items in run.counters.values()],
+                    }
+                )
+            )
+
+        col1, col2 = st.columns(2)
+        col1.checkbox("Profile every rerun", key="debug_profile")
+        col2.radio("Profiler", PROFILE_MODES, key="debug_profile_mode", horizontal=True)
+        if profiler is not None:
+            path = profiler.dump()
+            st.download_button("Download profile", path.read_bytes(), file_name=path.name)
+            st.caption(f"Saved to {path}")
+            st.code(profiler.summary())
+
+
+if profiler is not None:
+    profiler.stop()
+rerun = instrumentation.finish_run()
+st.sidebar.markdown("---")
+st.sidebar.checkbox("Performance Debug Panel", key="debug_panel")
+if debug_panel and rerun is not None:
+    st.markdown("---")
+    show_debug_panel(rerun, profiler)
@@ -0,0 +1,75 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.black_scholes import BlackScholes  # noqa: E402
+from src.visualizations import create_greeks_plot, create_heatmap, create_profit_loss_chart  # noqa: E402
+
+
+def heatmap_case(size):
+    s_range, sigma_range = np.linspace(80, 120, size), np.linspace(0.1, 0.5, size)
+    prices = BlackScholes.grid(s_range, sigma_range, 100, 1, 0.05).calculate_option_price("call")
+    return lambda lean: create_heatmap(s_range, sigma_range, prices - 10, prices, "Heatmap", lean=lean)
+
+
+def profit_loss_case(size, max_points=None):
+    s_range = np.linspace(50, 150, size)
+    pnl = np.maximum(s_range - 100, 0) - 10
+    return lambda lean: create_profit_loss_chart(s_range, pnl, 110, "P&L", lean=lean, max_points=max_points)
+
+
+def greeks_case(size, max_points=None):
+    s_range = np.linspace(50, 150, size)
+    greeks = BlackScholes(s_range, 100, 1, 0.05, 0.2).calculate_greeks()
+    values = {greek: greeks[greek] for greek in ["delta_call", "gamma", "vega", "theta_call", "rho_call"]}
+    return lambda lean: create_greeks_plot(s_range, values, "Greeks", lean=lean, max_points=max_points)
+
+
+CASES = {
+    "heatmap_50x50": heatmap_case(50),
+    "heatmap_500x500": heatmap_case(500),
+    "profit_loss_100": profit_loss_case(100),
+    "profit_loss_100k": profit_loss_case(100_000, max_points=2000),
+    "greeks_100": greeks_case(100),
+    "greeks_100k": greeks_case(100_000, max_points=2000),
+}
+
+
+def measure(build, lean, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fig = build(lean)
+        timings.append(time.perf_counter() - start)
+    payload = fig.to_json()
+    return {"build_ms": min(timings) * 1000, "payload_bytes": len(payload)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Figure build time and JSON payload size, standard vs lean.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args(argv)
+
+    results = {
+        name: {mode: measure(build, mode == "lean", args.repeat) for mode in ("standard", "lean")}
+        for name, build in CASES.items()
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'case':<18} {'mode':<9} {'build ms':>9} {'payload KiB':>12}")
+        for name, modes in results.items():
+            for mode, result in modes.items():
+                print(f"{name:<18} {mode:<9} {result['build_ms']:9.2f} {result['payload_bytes'] / 1024:12.1f}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import argparse
+import ast
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("scipy", "pandas", "streamlit", "yfinance", "fredapi", "plotly")
+
+
+def app_imports(path=ROOT / "app.py"):
+    modules = []
+    for node in ast.parse(path.read_text()).body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return modules
+
+
+def measure(modules):
+    # a fresh interpreter per run so every measurement is a cold start
+    code = "import sys, time\nstart = time.perf_counter()\n"
+    code += "".join(f"import {module}\n" for module in modules)
+    code += f"print(time.perf_counter() - start, sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    elapsed, heavy = result.stdout.strip().split(" ", 1)
+
+    self_times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            self_us, _, name = line.split(":", 1)[1].split("|")
+            self_times[name.strip()] = int(self_us)
+    slowest = sorted(self_times.items(), key=lambda item: item[1], reverse=True)[:5]
+    return float(elapsed) * 1000, ast.literal_eval(heavy), [(name, us / 1000) for name, us in slowest]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start import time of the pricing core and the app.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args(argv)
+
+    targets = {
+        "src.black_scholes": ["src.black_scholes"],
+        "src.data_fetcher": ["src.data_fetcher"],
+        "app.py": app_imports(),
+    }
+    results = {}
+    for label, modules in targets.items():
+        runs = sorted(measure(modules) for _ in range(args.repeat))
+        import_ms, heavy, slowest = runs[0]
+        results[label] = {"import_ms": import_ms, "heavy_modules": heavy, "slowest_modules_ms": dict(slowest)}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for label, result in results.items():
+            heavy = ", ".join(result["heavy_modules"]) or "none"
+            print(f"{label:<18} {result['import_ms']:8.1f} ms   heavy modules loaded: {heavy}")
+            for name, ms in result["slowest_modules_ms"].items():
+                print(f"    {name:<40} {ms:8.1f} ms self")
+    return results
+
+
+if __name__ == "__main__":
+    main()
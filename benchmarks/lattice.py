@@ -0,0 +1,62 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.lattice import METHODS, LatticePricer, backward_induction  # noqa: E402
+
+MARKET = {"s": 100.0, "k": 100.0, "t": 1.0, "r": 0.05, "sigma": 0.3, "q": 0.03}
+
+
+def reference_put(steps=10_000):
+    inputs = [np.array([MARKET[name]]) for name in ("s", "k", "t", "r", "sigma", "q")]
+    return float(backward_induction(*inputs, np.array([False]), np.array([True]), steps)[0][0])
+
+
+def measure(method, steps, contracts, accelerated, reference):
+    # a strip of strikes around the money, priced in one batched induction
+    strikes = np.linspace(0.8, 1.2, contracts) * MARKET["k"]
+    options = {} if accelerated else {"control_variate": False}
+    pricer = LatticePricer(**(MARKET | {"k": strikes}), steps=steps, method=method, **options)
+    start = time.perf_counter()
+    pricer.calculate_option_price("put")
+    elapsed = time.perf_counter() - start
+    atm = LatticePricer(**MARKET, steps=steps, method=method, **options).calculate_option_price("put")
+    return {"seconds": elapsed, "contracts_per_second": contracts / elapsed, "error": abs(atm - reference)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="American lattice throughput and accuracy by step count.")
+    parser.add_argument("--steps", type=int, nargs="+", default=[50, 100, 200, 400])
+    parser.add_argument("--contracts", type=int, default=1_000)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args(argv)
+
+    reference = reference_put()
+    # the control variate loads the closed-form backend on first use
+    measure(METHODS[0], 10, args.contracts, True, reference)
+    results = {
+        f"{method}{'' if accelerated else '.plain'}": {
+            str(steps): measure(method, steps, args.contracts, accelerated, reference) for steps in args.steps
+        }
+        for method in METHODS
+        for accelerated in (True, False)
+    }
+    if args.json:
+        print(json.dumps({"reference_put": reference, "results": results}, indent=2))
+    else:
+        print(f"American put reference (10,000 steps): {reference:.6f}")
+        print(f"{'tree':<16} {'steps':>6} {'contracts/s':>13} {'ATM error':>11}")
+        for tree, by_steps in results.items():
+            for steps, result in by_steps.items():
+                print(f"{tree:<16} {steps:>6} {result['contracts_per_second']:13,.0f} {result['error']:11.2e}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.black_scholes import BlackScholes  # noqa: E402
+from src.monte_carlo import MonteCarloPricer  # noqa: E402
+
+MARKET = {"s": 100.0, "k": 100.0, "t": 1.0, "r": 0.05, "sigma": 0.2, "q": 0.0}
+CASES = {
+    "european": {},
+    "asian": {},
+    "barrier": {"barrier": 130.0, "barrier_type": "up-and-out"},
+    "lookback": {},
+}
+
+
+def measure(payoff, options, paths, steps, workers):
+    pricer = MonteCarloPricer(**MARKET, paths=paths, steps=steps, seed=0, workers=workers)
+    start = time.perf_counter()
+    result = pricer.price("call", payoff, **options)
+    elapsed = time.perf_counter() - start
+    return {
+        "price": result.price,
+        "std_error": result.std_error,
+        "seconds": elapsed,
+        "paths_per_second": result.paths / elapsed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo pricing throughput in paths per second.")
+    parser.add_argument("--paths", type=int, default=200_000)
+    parser.add_argument("--steps", type=int, default=252)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, os.cpu_count() or 1}))
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args(argv)
+
+    results = {
+        payoff: {
+            str(workers): measure(payoff, options, args.paths, args.steps, workers if workers > 1 else None)
+            for workers in args.workers
+        }
+        for payoff, options in CASES.items()
+    }
+    exact = BlackScholes(**MARKET).calculate_option_price("call")
+    if args.json:
+        print(json.dumps({"black_scholes_call": exact, "results": results}, indent=2))
+    else:
+        print(f"Black-Scholes call: {exact:.4f}")
+        print(f"{'payoff':<10} {'workers':>7} {'price':>9} {'std err':>9} {'paths/s':>12}")
+        for payoff, by_workers in results.items():
+            for workers, result in by_workers.items():
+                print(
+                    f"{payoff:<10} {workers:>7} {result['price']:9.4f} {result['std_error']:9.5f} "
+                    f"{result['paths_per_second']:12,.0f}"
+                )
+    return results
+
+
+if __name__ == "__main__":
+    main()
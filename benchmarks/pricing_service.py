@@ -0,0 +1,111 @@
+import argparse
+import http.client
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.pricing_service import PricingServer  # noqa: E402
+
+CONTRACT = {"s": 100.0, "k": 100.0, "t": 0.5, "r": 0.04, "sigma": 0.25, "q": 0.0}
+
+
+def client(host, port, path, payload, deadline, latencies):
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    # bytes, so http.client sends headers and body in one write
+    body = json.dumps(payload).encode()
+    headers = {"Content-Type": "application/json"}
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        connection.request("POST", path, body, headers)
+        response = connection.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f"{path} returned {response.status}")
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+
+
+def run_load(host, port, path, payload, clients, seconds):
+    deadline = time.perf_counter() + seconds
+    per_client = [[] for _ in range(clients)]
+    threads = [
+        threading.Thread(target=client, args=(host, port, path, payload, deadline, latencies))
+        for latencies in per_client
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = np.concatenate([np.asarray(latencies) for latencies in per_client]) * 1000
+    return {
+        "requests": int(latencies.size),
+        "requests_per_second": latencies.size / elapsed,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the pricing service: latency percentiles and throughput.")
+    parser.add_argument("--url", help="existing service to target; by default one is started in-process")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--bulk-size", type=int, default=1000)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url:
+        target = urlparse(args.url)
+        host, port = target.hostname, target.port or 80
+    else:
+        server = PricingServer(("127.0.0.1", 0), max_wait=args.max_wait_ms / 1000)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = server.server_address
+
+    bulk = CONTRACT | {"k": np.linspace(50, 150, args.bulk_size).tolist()}
+    results = {}
+    try:
+        for clients in args.clients:
+            results[f"single_{clients}"] = run_load(host, port, "/price", CONTRACT, clients, args.seconds)
+        bulk_result = run_load(host, port, "/price/bulk", bulk, 1, args.seconds)
+        bulk_result["contracts_per_second"] = bulk_result["requests_per_second"] * args.bulk_size
+        results[f"bulk_{args.bulk_size}"] = bulk_result
+        if server is not None:
+            sizes = server.batcher.batch_sizes
+            results["mean_batch_size"] = sizes.sum / sizes.count if sizes.count else 0.0
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'load':<12} {'requests':>9} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+        for name, result in results.items():
+            if isinstance(result, dict):
+                print(
+                    f"{name:<12} {result['requests']:>9,} {result['requests_per_second']:>10,.0f} "
+                    f"{result['p50_ms']:8.2f} {result['p99_ms']:8.2f}"
+                )
+        bulk_result = results[f"bulk_{args.bulk_size}"]
+        print(f"bulk throughput: {bulk_result['contracts_per_second']:,.0f} contracts/s")
+        if "mean_batch_size" in results:
+            print(f"mean micro-batch size: {results['mean_batch_size']:.1f}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
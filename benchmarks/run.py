@@ -0,0 +1,340 @@
+import argparse
+import fnmatch
+import json
+import platform
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import data_fetcher  # noqa: E402
+from src.black_scholes import BlackScholes  # noqa: E402
+from src.cache import MarketDataCache  # noqa: E402
+from src.grid_cache import HeatmapGridCache  # noqa: E402
+from src.heatmap_engine import refine_heatmap  # noqa: E402
+from src.history_store import HistoryStore  # noqa: E402
+from src.surface import SurfaceCache, TimeSurface  # noqa: E402
+from src.visualizations import create_greeks_plot, create_heatmap, create_profit_loss_chart  # noqa: E402
+from src.workspace import PricingWorkspace  # noqa: E402
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_THRESHOLD = 0.25
+# the app's default inputs
+S, K, T, R, SIGMA, Q = 150.0, 150.0, 1.0, 0.05, 0.25, 0.01
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    # each benchmark is a context manager that sets up its inputs and yields the callable to time
+    def register(setup):
+        BENCHMARKS[name] = contextmanager(setup)
+        return setup
+
+    return register
+
+
+def _random_inputs(size, seed=0):
+    rng = np.random.default_rng(seed)
+    return (
+        rng.uniform(50, 150, size),
+        rng.uniform(50, 150, size),
+        rng.uniform(0.1, 2.0, size),
+        rng.uniform(0.0, 0.08, size),
+        rng.uniform(0.1, 0.6, size),
+    )
+
+
+for _label, _size in (("scalar", None), ("1k", 1_000), ("100k", 100_000), ("1m", 1_000_000)):
+
+    @benchmark(f"black_scholes.price.{_label}")
+    def _price(size=_size):
+        bs = BlackScholes(S, K, T, R, SIGMA, Q) if size is None else BlackScholes(*_random_inputs(size), Q)
+        yield lambda: bs.calculate_option_price("call")
+
+    @benchmark(f"black_scholes.greeks.{_label}")
+    def _greeks(size=_size):
+        bs = BlackScholes(S, K, T, R, SIGMA, Q) if size is None else BlackScholes(*_random_inputs(size), Q)
+        yield bs.calculate_greeks
+
+
+for _label, _size, _precision in (
+    ("100k", 100_000, "float64"),
+    ("1m", 1_000_000, "float64"),
+    ("1m.float32", 1_000_000, "float32"),
+):
+
+    @benchmark(f"workspace.greeks.{_label}")
+    def _workspace_greeks(size=_size, precision=_precision):
+        # inputs are kept in the working precision and outputs are reused, as a caller repricing a book would
+        workspace = PricingWorkspace(precision)
+        inputs = [np.asarray(v, dtype=precision) for v in (*_random_inputs(size), Q)]
+        out = workspace.calculate_all(*inputs)
+        yield lambda: workspace.calculate_all(*inputs, out=out)
+
+
+def _heatmap_figures(s_axis, sigma_axis, call, put):
+    # what app.py renders for one heatmap pass, including the JSON Streamlit sends to the browser
+    for prices, title in ((call, "Call Option PnL"), (put, "Put Option PnL")):
+        create_heatmap(s_axis, sigma_axis, prices - 10.0, prices, title, lean=True).to_json()
+
+
+@benchmark("app.heatmap.cold")
+def _heatmap_cold():
+    def run():
+        _heatmap_figures(*HeatmapGridCache().get(S, K, T, R, Q, SIGMA, (80, 120), (50, 150)))
+
+    yield run
+
+
+@benchmark("app.heatmap.cached")
+def _heatmap_cached():
+    cache = HeatmapGridCache()
+    cache.get(S, K, T, R, Q, SIGMA, (80, 120), (50, 150))
+    yield lambda: _heatmap_figures(*cache.get(S, K, T, R, Q, SIGMA, (80, 120), (50, 150)))
+
+
+@benchmark("app.heatmap.high_res")
+def _heatmap_high_res():
+    def run():
+        for level in refine_heatmap(S, K, T, R, Q, SIGMA, (80, 120), (50, 150)):
+            _heatmap_figures(*level[-4:])
+
+    yield run
+
+
+@benchmark("app.greeks")
+def _greeks_pipeline():
+    s_range = np.linspace(0.5 * K, 1.5 * K, 100)
+
+    def run():
+        greeks = BlackScholes(s_range, K, T, R, SIGMA, Q).calculate_all().greeks()
+        for side in ("call", "put"):
+            names = [f"delta_{side}", "gamma", "vega", f"theta_{side}", f"rho_{side}"]
+            create_greeks_plot(s_range, {name: greeks[name] for name in names}, "Greeks", lean=True).to_json()
+
+    yield run
+
+
+@benchmark("surface.build")
+def _surface_build():
+    # the P&L chart's spot axis over every time to expiry up to T
+    s_range = np.linspace(0.5 * K, 1.5 * K, 100)
+    yield lambda: TimeSurface.build(s_range, K, T, R, SIGMA, Q)
+
+
+@benchmark("surface.scrub")
+def _surface_scrub():
+    # one slider move: a cache hit and the shown, today, 30-day and expiry P&L curves for both option types
+    cache, s_range = SurfaceCache(), np.linspace(0.5 * K, 1.5 * K, 100)
+    cache.get(s_range, K, T, R, SIGMA, Q)
+    remaining = np.array([200, 365, 335, 0]) / 365
+
+    def run():
+        surface = cache.get(s_range, K, T, R, SIGMA, Q)
+        surface.pnl(remaining, "call", 10.0)
+        surface.pnl(remaining, "put", 10.0)
+
+    yield run
+
+
+@benchmark("visualizations.heatmap")
+def _heatmap_figure():
+    s_axis, sigma_axis = np.linspace(120, 180, 50), np.linspace(0.1, 0.4, 50)
+    prices = BlackScholes.grid(s_axis, sigma_axis, K, T, R, Q).calculate_option_price("call")
+    yield lambda: create_heatmap(s_axis, sigma_axis, prices - 10, prices, "Heatmap")
+
+
+@benchmark("visualizations.heatmap.lean")
+def _heatmap_figure_lean():
+    s_axis, sigma_axis = np.linspace(120, 180, 50), np.linspace(0.1, 0.4, 50)
+    prices = BlackScholes.grid(s_axis, sigma_axis, K, T, R, Q).calculate_option_price("call")
+    yield lambda: create_heatmap(s_axis, sigma_axis, prices - 10, prices, "Heatmap", lean=True)
+
+
+@benchmark("visualizations.profit_loss")
+def _profit_loss_figure():
+    s_range = np.linspace(75, 225, 100)
+    pnl = np.maximum(s_range - K, 0) - 10
+    yield lambda: create_profit_loss_chart(s_range, pnl, 160, "P&L")
+
+
+@benchmark("visualizations.greeks")
+def _greeks_figure():
+    s_range = np.linspace(75, 225, 100)
+    greeks = BlackScholes(s_range, K, T, R, SIGMA, Q).calculate_greeks()
+    values = {name: greeks[name] for name in ("delta_call", "gamma", "vega", "theta_call", "rho_call")}
+    yield lambda: create_greeks_plot(s_range, values, "Greeks")
+
+
+class _FakeTicker:
+    latency = 0.0
+    # a year of daily closes, what the first fetch of a ticker downloads
+    history_frame = pd.DataFrame(
+        {"Close": 150 + np.cumsum(np.random.default_rng(0).normal(size=252))},
+        index=pd.bdate_range("2024-01-02", periods=252, tz="America/New_York"),
+    )
+
+    def __init__(self, ticker, session=None):
+        self.ticker = ticker
+
+    @property
+    def info(self):
+        time.sleep(self.latency)
+        return {"regularMarketPrice": 150.0, "dividendYield": 0.01, "longName": f"{self.ticker} Inc."}
+
+    def history(self, period=None, start=None):
+        time.sleep(self.latency)
+        return self.history_frame if start is None else self.history_frame.iloc[-1:]
+
+
+@contextmanager
+def _mocked_upstream(latency=0.0):
+    # yfinance and the HTTP session are replaced, so only our own fetch, cache and processing code is timed
+    cache = MarketDataCache(ttls=data_fetcher.MARKET_DATA_TTLS)
+    store = HistoryStore()
+    ticker = type("Ticker", (_FakeTicker,), {"latency": latency})
+    with (
+        mock.patch("yfinance.Ticker", ticker),
+        mock.patch.object(data_fetcher, "get_http_session", lambda: None),
+        mock.patch.object(data_fetcher, "market_data_cache", cache),
+        mock.patch.object(data_fetcher, "history_store", store),
+        mock.patch.object(data_fetcher, "volatility_trackers", {}),
+    ):
+        yield cache
+
+
+@benchmark("data.fetch_stock_data.cold")
+def _fetch_cold():
+    with _mocked_upstream() as cache:
+        # after the warm-up call the history is stored, so this times the incremental refresh on a cache miss
+        def run():
+            cache.clear()
+            data_fetcher.fetch_stock_data("AAPL")
+
+        yield run
+
+
+@benchmark("data.fetch_stock_data.cached")
+def _fetch_cached():
+    with _mocked_upstream():
+        data_fetcher.fetch_stock_data("AAPL")
+        yield lambda: data_fetcher.fetch_stock_data("AAPL")
+
+
+@benchmark("data.fetch_many.16_tickers_5ms")
+def _fetch_many():
+    tickers = [f"T{i}" for i in range(16)]
+    with _mocked_upstream(latency=0.005) as cache:
+
+        def run():
+            cache.clear()
+            data_fetcher.fetch_many(tickers, backoff=0)
+
+        yield run
+
+
+def time_case(fn, repeat, min_time):
+    # timeit-style: grow the loop count until one sample takes min_time, then keep the per-call times
+    fn()
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9) * 1.2))
+
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / loops)
+    return {"min_s": min(samples), "median_s": statistics.median(samples), "loops": loops}
+
+
+def run_benchmarks(patterns=None, repeat=5, min_time=0.05, report=print):
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if patterns and not any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+            continue
+        with setup() as fn:
+            results[name] = time_case(fn, repeat, min_time)
+        report(f"{name:<36} {results[name]['min_s'] * 1e3:12.4f} ms")
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    # the minimum over repeats is the tracked metric; it is the least sensitive to background noise
+    rows = []
+    for name, result in results.items():
+        if name not in baseline:
+            rows.append((name, None, "new"))
+            continue
+        ratio = result["min_s"] / baseline[name]["min_s"]
+        status = "regressed" if ratio > 1 + threshold else "improved" if ratio < 1 / (1 + threshold) else "ok"
+        rows.append((name, ratio, status))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the pricing, data and rendering hot paths.")
+    parser.add_argument("patterns", nargs="*", help="glob patterns selecting benchmarks, e.g. 'black_scholes.*'")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per timing sample")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--output", type=Path, help="also write the results to this JSON file")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+
+    results = run_benchmarks(args.patterns, args.repeat, args.min_time)
+    document = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2) + "\n")
+
+    if args.save_baseline:
+        if args.baseline.exists():
+            # keep entries for benchmarks that were filtered out of this run
+            document["results"] = json.loads(args.baseline.read_text())["results"] | results
+        args.baseline.write_text(json.dumps(document, indent=2, sort_keys=True) + "\n")
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+
+    rows = compare(results, json.loads(args.baseline.read_text())["results"], args.threshold)
+    print(f"\n{'benchmark':<36} {'vs baseline':>12}  status")
+    for name, ratio, status in rows:
+        print(f"{name:<36} {'' if ratio is None else f'{ratio:11.2f}x':>12}  {status}")
+    regressed = [name for name, _, status in rows if status == "regressed"]
+    if regressed:
+        print(f"\n{len(regressed)} benchmark(s) regressed by more than {args.threshold:.0%}: {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.portfolio import Portfolio  # noqa: E402
+from src.scenarios import ScenarioGrid, run_scenarios  # noqa: E402
+
+SPOTS = {"AAPL": 190.0, "MSFT": 420.0, "SPY": 520.0}
+
+
+def random_book(legs, seed=0):
+    rng = np.random.default_rng(seed)
+    underlyings = rng.choice(list(SPOTS), legs)
+    spots = np.array([SPOTS[name] for name in underlyings])
+    portfolio = Portfolio(capacity=legs)
+    portfolio.add_legs(
+        underlyings,
+        rng.choice(["call", "put"], legs),
+        spots * rng.uniform(0.7, 1.3, legs),
+        rng.uniform(0.05, 2.0, legs),
+        rng.integers(-10, 11, legs),
+    )
+    return portfolio
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Full-revaluation scenario engine throughput.")
+    parser.add_argument("--legs", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, os.cpu_count() or 1}))
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args(argv)
+
+    portfolio = random_book(args.legs)
+    grid = ScenarioGrid.build()
+    evaluations = grid.size * args.legs
+    results = {}
+    for workers in args.workers:
+        start = time.perf_counter()
+        report = run_scenarios(portfolio, SPOTS, 0.25, 0.04, grid=grid, workers=workers if workers > 1 else None)
+        elapsed = time.perf_counter() - start
+        results[str(workers)] = {
+            "seconds": elapsed,
+            "evaluations_per_second": evaluations / elapsed,
+            "var_99": report.var[0.99],
+        }
+
+    if args.json:
+        print(json.dumps({"scenarios": grid.size, "legs": args.legs, "results": results}, indent=2))
+    else:
+        print(f"{grid.size:,} scenarios x {args.legs:,} legs = {evaluations:,} evaluations")
+        print(f"{'workers':>7} {'seconds':>9} {'evals/s':>14} {'99% VaR':>12}")
+        for workers, result in results.items():
+            print(
+                f"{workers:>7} {result['seconds']:9.2f} {result['evaluations_per_second']:14,.0f} "
+                f"{result['var_99']:12,.2f}"
+            )
+    return results
+
+
+if __name__ == "__main__":
+    main()
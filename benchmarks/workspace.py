@@ -0,0 +1,85 @@
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.black_scholes import BlackScholes  # noqa: E402
+from src.workspace import PricingWorkspace  # noqa: E402
+
+CASES = {
+    "black_scholes": lambda inputs: BlackScholes(*inputs).calculate_all(),
+    "workspace": lambda inputs: PricingWorkspace().calculate_all(*inputs),
+    "workspace.float32": lambda inputs: PricingWorkspace("float32").calculate_all(*inputs),
+}
+
+
+def random_inputs(size, seed=0):
+    rng = np.random.default_rng(seed)
+    s = rng.uniform(50, 150, size)
+    return s, s * rng.uniform(0.7, 1.3, size), rng.uniform(0.05, 2.0, size), 0.04, rng.uniform(0.1, 0.6, size), 0.01
+
+
+def _max_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024**2 if sys.platform == "darwin" else 1024)
+
+
+def measure(case, size, repeat):
+    # run in a fresh process by main(), so the peak belongs to this case alone; imports are warmed on a tiny batch
+    CASES[case](random_inputs(16))
+    inputs = random_inputs(size)
+    baseline = _max_rss_mb()
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        CASES[case](inputs)
+        seconds.append(time.perf_counter() - start)
+    return {
+        "seconds": min(seconds),
+        "contracts_per_second": size / min(seconds),
+        "peak_rss_mb": _max_rss_mb(),
+        # the high-water mark above what the interpreter and the inputs already hold: outputs plus temporaries
+        "call_rss_mb": _max_rss_mb() - baseline,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Peak memory and throughput of the pricing workspace.")
+    parser.add_argument("--size", type=int, default=2_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    parser.add_argument("--child", choices=list(CASES), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.size, args.repeat)))
+        return None
+
+    results = {}
+    for case in args.cases:
+        command = [sys.executable, __file__, "--child", case, "--size", str(args.size), "--repeat", str(args.repeat)]
+        results[case] = json.loads(subprocess.run(command, check=True, capture_output=True, text=True).stdout)
+
+    if args.json:
+        print(json.dumps({"size": args.size, "results": results}, indent=2))
+    else:
+        print(f"{args.size:,} contracts, first-order prices and Greeks")
+        print(f"{'case':<20} {'seconds':>9} {'contracts/s':>14} {'peak RSS MB':>12} {'above inputs MB':>16}")
+        for case, result in results.items():
+            print(
+                f"{case:<20} {result['seconds']:9.3f} {result['contracts_per_second']:14,.0f} "
+                f"{result['peak_rss_mb']:12.1f} {result['call_rss_mb']:16.1f}"
+            )
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -1,51 +1,133 @@
+from dataclasses import dataclass, fields
+
 import numpy as np
-from scipy.stats import norm
+
+from src.instrumentation import count
+from src.norm_backends import select_backend
+
+
+def _as_input(value):
+    return np.asarray(value, dtype=float) if np.ndim(value) else value
+
+
+@dataclass(slots=True)
+class PricingResult:
+    call: np.ndarray
+    put: np.ndarray
+    delta_call: np.ndarray
+    delta_put: np.ndarray
+    gamma: np.ndarray
+    vega: np.ndarray
+    theta_call: np.ndarray
+    theta_put: np.ndarray
+    rho_call: np.ndarray
+    rho_put: np.ndarray
+    vanna: np.ndarray | None = None
+    volga: np.ndarray | None = None
+    charm_call: np.ndarray | None = None
+    charm_put: np.ndarray | None = None
+    speed: np.ndarray | None = None
+    color: np.ndarray | None = None
+    # only set when early exercise makes the put's gamma and vega differ from the call's
+    gamma_put: np.ndarray | None = None
+    vega_put: np.ndarray | None = None
+
+    def greeks(self):
+        return {f.name: getattr(self, f.name) for f in fields(self)[2:] if getattr(self, f.name) is not None}
 
 
 class BlackScholes:
     def __init__(self, s, k, t, r, sigma, q=0.0):
-        self.s, self.k, self.t, self.r, self.sigma, self.q = s, k, t, r, sigma, q
+        self.s, self.k, self.t, self.r, self.sigma, self.q = (_as_input(v) for v in (s, k, t, r, sigma, q))
+
+    @property
+    def shape(self):
+        return np.broadcast_shapes(*(np.shape(v) for v in (self.s, self.k, self.t, self.r, self.sigma, self.q)))
+
+    @classmethod
+    def grid(cls, s_range, sigma_range, k, t, r, q=0.0):
+        return cls(np.asarray(s_range)[np.newaxis, :], k, t, r, np.asarray(sigma_range)[:, np.newaxis], q)
+
+    def _d1_d2(self):
+        sqrt_t = np.sqrt(self.t)
+        sigma_sqrt_t = self.sigma * sqrt_t
+        d1 = (np.log(self.s / self.k) + (self.r - self.q + 0.5 * self.sigma**2) * self.t) / sigma_sqrt_t
+        return d1, d1 - sigma_sqrt_t, sqrt_t, sigma_sqrt_t
 
     def calculate_option_price(self, option_type="call"):
-        d1 = (np.log(self.s / self.k) + (self.r - self.q + 0.5 * self.sigma**2) * self.t) / (
-            self.sigma * np.sqrt(self.t)
-        )
-        d2 = d1 - self.sigma * np.sqrt(self.t)
+        d1, d2, _, _ = self._d1_d2()
+        size = np.size(d1)
+        count("black_scholes.price", size)
+        cdf = select_backend(size).cdf
+        s_disc = self.s * np.exp(-self.q * self.t)
+        k_disc = self.k * np.exp(-self.r * self.t)
 
         if option_type == "call":
-            price = self.s * np.exp(-self.q * self.t) * norm.cdf(d1) - self.k * np.exp(-self.r * self.t) * norm.cdf(d2)
-        else:
-            price = self.k * np.exp(-self.r * self.t) * norm.cdf(-d2) - self.s * np.exp(-self.q * self.t) * norm.cdf(
-                -d1
-            )
+            return s_disc * cdf(d1) - k_disc * cdf(d2)
+        return k_disc * cdf(-d2) - s_disc * cdf(-d1)
 
-        return price
+    def calculate_all(self, higher_order=False):
+        d1, d2, sqrt_t, sigma_sqrt_t = self._d1_d2()
+        size = np.size(d1)
+        count("black_scholes.calculate_all", size)
+        backend = select_backend(size)
+        cdf = backend.cdf
+        q_disc = np.exp(-self.q * self.t)
+        k_disc = self.k * np.exp(-self.r * self.t)
+        s_disc = self.s * q_disc
 
-    def calculate_greeks(self):
-        d1 = (np.log(self.s / self.k) + (self.r - self.q + 0.5 * self.sigma**2) * self.t) / (
-            self.sigma * np.sqrt(self.t)
+        nd1 = cdf(d1)
+        nd2 = cdf(d2)
+        n_neg_d1 = cdf(-d1)
+        n_neg_d2 = cdf(-d2)
+        pdf_d1 = backend.pdf(d1)
+        s_disc_pdf = s_disc * pdf_d1
+
+        gamma = q_disc * pdf_d1 / (self.s * sigma_sqrt_t)
+        vega = s_disc_pdf * sqrt_t
+        theta_decay = -s_disc_pdf * self.sigma / (2 * sqrt_t)
+        result = PricingResult(
+            call=s_disc * nd1 - k_disc * nd2,
+            put=k_disc * n_neg_d2 - s_disc * n_neg_d1,
+            delta_call=q_disc * nd1,
+            delta_put=-q_disc * n_neg_d1,
+            gamma=gamma,
+            vega=vega,
+            theta_call=theta_decay - self.r * k_disc * nd2 + self.q * s_disc * nd1,
+            theta_put=theta_decay + self.r * k_disc * n_neg_d2 - self.q * s_disc * n_neg_d1,
+            rho_call=k_disc * self.t * nd2,
+            rho_put=-k_disc * self.t * n_neg_d2,
         )
-        d2 = d1 - self.sigma * np.sqrt(self.t)
-
-        greeks = {
-            "delta_call": np.exp(-self.q * self.t) * norm.cdf(d1),
-            "delta_put": -np.exp(-self.q * self.t) * norm.cdf(-d1),
-            "gamma": np.exp(-self.q * self.t) * norm.pdf(d1) / (self.s * self.sigma * np.sqrt(self.t)),
-            "vega": self.s * np.exp(-self.q * self.t) * norm.pdf(d1) * np.sqrt(self.t),
-            "theta_call": -self.s * np.exp(-self.q * self.t) * norm.pdf(d1) * self.sigma / (2 * np.sqrt(self.t))
-            - self.r * self.k * np.exp(-self.r * self.t) * norm.cdf(d2)
-            + self.q * self.s * np.exp(-self.q * self.t) * norm.cdf(d1),
-            "theta_put": -self.s * np.exp(-self.q * self.t) * norm.pdf(d1) * self.sigma / (2 * np.sqrt(self.t))
-            + self.r * self.k * np.exp(-self.r * self.t) * norm.cdf(-d2)
-            - self.q * self.s * np.exp(-self.q * self.t) * norm.cdf(-d1),
-            "rho_call": self.k * self.t * np.exp(-self.r * self.t) * norm.cdf(d2),
-            "rho_put": -self.k * self.t * np.exp(-self.r * self.t) * norm.cdf(-d2),
+
+        if higher_order:
+            # charm and color follow the theta convention: change per unit of elapsed time
+            drift_term = (2 * (self.r - self.q) * self.t - d2 * sigma_sqrt_t) / (2 * self.t * sigma_sqrt_t)
+            charm_common = q_disc * pdf_d1 * drift_term
+            result.vanna = -q_disc * pdf_d1 * d2 / self.sigma
+            result.volga = vega * d1 * d2 / self.sigma
+            result.charm_call = self.q * q_disc * nd1 - charm_common
+            result.charm_put = -self.q * q_disc * n_neg_d1 - charm_common
+            result.speed = -gamma / self.s * (d1 / sigma_sqrt_t + 1)
+            result.color = gamma / (2 * self.t) * (2 * self.q * self.t + 1 + 2 * self.t * drift_term * d1)
+
+        return result
+
+    def calculate_greeks(self):
+        result = self.calculate_all()
+        return {
+            "delta_call": result.delta_call,
+            "delta_put": result.delta_put,
+            "gamma": result.gamma,
+            "vega": result.vega,
+            "theta_call": result.theta_call,
+            "theta_put": result.theta_put,
+            "rho_call": result.rho_call,
+            "rho_put": result.rho_put,
         }
-        return greeks
 
     def calculate_profit_loss(self, option_type, purchase_price, current_stock_price):
         if option_type == "call":
-            pnl = max(current_stock_price - self.k, 0) - purchase_price
+            pnl = np.maximum(current_stock_price - self.k, 0) - purchase_price
         else:
-            pnl = max(self.k - current_stock_price, 0) - purchase_price
+            pnl = np.maximum(self.k - current_stock_price, 0) - purchase_price
         return pnl
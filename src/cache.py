@@ -0,0 +1,178 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import closing, contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        # concurrent callers for the same key wait on the first caller's result instead of repeating the work
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stale_served: int = 0
+    errors: int = 0
+    evictions: int = 0
+    fetch_seconds: float = 0.0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / lookups if lookups else 0.0
+
+    def as_dict(self):
+        return asdict(self) | {"hit_rate": self.hit_rate}
+
+
+class MarketDataCache:
+    def __init__(self, path=None, ttls=None, default_ttl=300.0, max_entries=256, clock=time.time):
+        self.path = Path(path).expanduser() if path else None
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.stats = CacheStats()
+        self._memory = OrderedDict()
+        self._lock = threading.RLock()
+        self._db_ready = False
+
+    def ttl_for(self, source):
+        return self.ttls.get(source, self.default_ttl)
+
+    def get_or_fetch(self, source, key, fetch, ttl=None):
+        ttl = self.ttl_for(source) if ttl is None else ttl
+        entry = self._lookup(source, key, ttl)
+        if entry is not None and self.clock() - entry[1] < ttl:
+            return entry[0]
+
+        with self._lock:
+            self.stats.misses += 1
+        start = time.perf_counter()
+        try:
+            value = fetch()
+        except Exception:
+            with self._lock:
+                self.stats.errors += 1
+                if entry is None:
+                    raise
+                self.stats.stale_served += 1
+            return entry[0]
+        finally:
+            with self._lock:
+                self.stats.fetch_seconds += time.perf_counter() - start
+
+        self.set(source, key, value)
+        return value
+
+    def get(self, source, key, ttl=None):
+        ttl = self.ttl_for(source) if ttl is None else ttl
+        entry = self._lookup(source, key, ttl)
+        return entry[0] if entry is not None and self.clock() - entry[1] < ttl else None
+
+    def age(self, source, key):
+        with self._lock:
+            entry = self._memory.get((source, key))
+        return None if entry is None else self.clock() - entry[1]
+
+    def set(self, source, key, value, stored_at=None):
+        stored_at = self.clock() if stored_at is None else stored_at
+        with self._lock:
+            self._remember((source, key), value, stored_at)
+            if self.path is None:
+                return
+            try:
+                with self._connect() as db:
+                    db.execute(
+                        "INSERT OR REPLACE INTO market_data (source, key, value, stored_at) VALUES (?, ?, ?, ?)",
+                        (source, key, json.dumps(value), stored_at),
+                    )
+            except (OSError, sqlite3.Error) as e:
+                print(f"Error writing market data cache: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self.path is not None:
+                with self._connect() as db:
+                    db.execute("DELETE FROM market_data")
+
+    def _lookup(self, source, key, ttl):
+        # returns (value, stored_at) regardless of age so stale data can back up a failed fetch
+        with self._lock:
+            entry = self._memory.get((source, key))
+            if entry is not None:
+                self._memory.move_to_end((source, key))
+                self.stats.hits += self.clock() - entry[1] < ttl
+                return entry
+            if self.path is None:
+                return None
+            try:
+                with self._connect() as db:
+                    row = db.execute(
+                        "SELECT value, stored_at FROM market_data WHERE source = ? AND key = ?", (source, key)
+                    ).fetchone()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Error reading market data cache: {e}")
+                return None
+            if row is None:
+                return None
+            entry = (json.loads(row[0]), row[1])
+            self._remember((source, key), *entry)
+            self.stats.disk_hits += self.clock() - entry[1] < ttl
+            return entry
+
+    def _remember(self, cache_key, value, stored_at):
+        self._memory[cache_key] = (value, stored_at)
+        self._memory.move_to_end(cache_key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    @contextmanager
+    def _connect(self):
+        if not self._db_ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self.path, timeout=5)) as db, db:
+            if not self._db_ready:
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS market_data "
+                    "(source TEXT, key TEXT, value TEXT, stored_at REAL, PRIMARY KEY (source, key))"
+                )
+                self._db_ready = True
+            yield db
@@ -1,16 +1,46 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 from datetime import datetime, timedelta
 from os import getenv
 
-import streamlit as st
-import yfinance as yf
-from fredapi import Fred
+import numpy as np
+
+from src.cache import MarketDataCache, SingleFlight
+from src.history_store import HistoryStore, frame_to_bars
+from src.instrumentation import span, timed
+from src.volatility import VolatilityTracker
+from src.yield_curve import SERIES_MATURITIES, YieldCurve
+
+MARKET_DATA_TTLS = {"stock": 300.0, "yield_curve": 3600.0}
+
+market_data_cache = MarketDataCache(
+    path=getenv("MARKET_DATA_CACHE_PATH", "~/.cache/black-scholes-pricer/market_data.sqlite"),
+    ttls=MARKET_DATA_TTLS,
+)
+
+# only the first fetch for a ticker downloads this much; later ones fetch the bars missing since the last update
+HISTORY_PERIOD = "1y"
+history_store = HistoryStore(getenv("PRICE_HISTORY_PATH", "~/.cache/black-scholes-pricer/history"))
+# estimator state per ticker, fed only the bars the history store appended since the last fetch
+volatility_trackers = {}
+_volatility_trackers_lock = threading.Lock()
+
+MAX_CONCURRENT_REQUESTS = 8
+
+_in_flight = SingleFlight()
+_request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+_http_session = None
+_http_session_lock = threading.Lock()
 
 
 def get_fred_api_key():
     api_key = getenv("FRED_API_KEY")
 
     if not api_key:
+        import streamlit as st
+
         with suppress(AttributeError, RuntimeError):
             api_key = st.secrets.get("FRED_API_KEY")
 
@@ -20,66 +50,116 @@ def get_fred_api_key():
     return api_key
 
 
-fred = Fred(api_key=get_fred_api_key())
+def get_http_session():
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            try:
+                # yfinance needs a browser-impersonating curl_cffi session to reach Yahoo reliably
+                from curl_cffi import requests as curl_requests
 
+                _http_session = curl_requests.Session(impersonate="chrome")
+            except ImportError:
+                import requests
+                from requests.adapters import HTTPAdapter
 
-def get_risk_free_rate(maturity_years):
-    series_map = {
-        1 / 12: "DTB4WK",
-        2 / 12: "DTB4WK",
-        3 / 12: "DTB3",
-        6 / 12: "DTB6",
-        1: "DGS1",
-        2: "DGS2",
-        3: "DGS3",
-        5: "DGS5",
-        7: "DGS7",
-        10: "DGS10",
-        20: "DGS20",
-        30: "DGS30",
-    }
+                _http_session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=MAX_CONCURRENT_REQUESTS, pool_maxsize=MAX_CONCURRENT_REQUESTS)
+                _http_session.mount("https://", adapter)
+                _http_session.mount("http://", adapter)
+        return _http_session
 
-    closest_maturity = min(series_map.keys(), key=lambda x: abs(x - maturity_years))
-    series_id = series_map[closest_maturity]
 
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=7)
+_fred = None
 
+
+def get_fred():
+    global _fred
+    if _fred is None:
+        from fredapi import Fred
+
+        _fred = Fred(api_key=get_fred_api_key())
+    return _fred
+
+
+_yield_curve = (None, None)
+
+
+def get_yield_curve():
+    global _yield_curve
+    quotes = market_data_cache.get_or_fetch(
+        "yield_curve", "treasury", lambda: _in_flight.do(("yield_curve", "treasury"), _fetch_treasury_quotes)
+    )
+    if _yield_curve[0] is not quotes:
+        _yield_curve = (quotes, YieldCurve.from_quotes(quotes))
+    return _yield_curve[1]
+
+
+def get_risk_free_rate(maturity_years):
     try:
-        data = fred.get_series(series_id, start_date, end_date)
-        if not data.empty:
-            last_value = data.iloc[-1]
-            return float(last_value) / 100
-        else:
-            return 0.05  # set to 5% if data is empty
+        return get_yield_curve().rate(maturity_years)
     except Exception as e:
         print(f"Error fetching risk-free rate: {e}")
         return 0.05  # set to 5% if data retrieval fails
 
 
+def refresh_yield_curve():
+    quotes = _in_flight.do(("yield_curve", "treasury"), _fetch_treasury_quotes)
+    market_data_cache.set("yield_curve", "treasury", quotes)
+    return quotes
+
+
+@timed("data.fetch_treasury")
+def _fetch_treasury_quotes():
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=7)
+
+    fred = get_fred()
+
+    def latest(series_id):
+        try:
+            data = fred.get_series(series_id, start_date, end_date).dropna()
+        except Exception as e:
+            print(f"Error fetching {series_id}: {e}")
+            return None
+        return float(data.iloc[-1]) if not data.empty else None
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        values = dict(zip(SERIES_MATURITIES, executor.map(latest, SERIES_MATURITIES), strict=True))
+
+    quotes = {series_id: value for series_id, value in values.items() if value is not None}
+    if not quotes:
+        raise ValueError("No recent Treasury observations available from FRED")
+    return quotes
+
+
 def fetch_stock_data(ticker):
-    try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
-        history = stock.history(period="1mo")
-
-        if history.empty:
-            return {
-                "current_price": info.get("regularMarketPrice", 0),
-                "volatility": 0,
-                "dividend_yield": float(info.get("dividendYield", 0)),
-                "company_name": info.get("longName", ticker),
-            }
+    return _fetch_one(ticker, _fetch_stock_data, retries=0, backoff=0)
 
-        return {
-            "current_price": info.get(
-                "regularMarketPrice",
-                history["Close"].iloc[-1] if not history.empty else 0,
-            ),
-            "volatility": history["Close"].pct_change().std() * (252**0.5) if not history.empty else 0,
-            "dividend_yield": float(info.get("dividendYield", 0)),
-            "company_name": info.get("longName", ticker),
-        }
+
+def fetch_many(tickers, max_workers=MAX_CONCURRENT_REQUESTS, retries=3, backoff=0.5, fetch=None):
+    fetch = fetch or _fetch_stock_data
+    unique_tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(lambda ticker: _fetch_one(ticker, fetch, retries, backoff), unique_tickers)
+        return dict(zip(unique_tickers, results, strict=True))
+
+
+def refresh_stock_data(ticker, retries=2, backoff=0.5):
+    key = ticker.upper()
+    data = _in_flight.do(("stock", key), lambda: _with_retries(lambda: _fetch_stock_data(ticker), retries, backoff))
+    market_data_cache.set("stock", key, data)
+    return data
+
+
+def _fetch_one(ticker, fetch, retries, backoff):
+    key = ticker.upper()
+
+    def load():
+        return _in_flight.do(("stock", key), lambda: _with_retries(lambda: fetch(ticker), retries, backoff))
+
+    try:
+        return market_data_cache.get_or_fetch("stock", key, load)
     except Exception as e:
         print(f"Error fetching stock data: {str(e)}")
         return {
@@ -88,3 +168,50 @@ def fetch_stock_data(ticker):
             "dividend_yield": 0,
             "company_name": ticker,
         }
+
+
+def _with_retries(fetch, retries, backoff):
+    for attempt in range(retries + 1):
+        try:
+            with _request_slots:
+                return fetch()
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2**attempt)
+
+
+def _volatility_estimates(ticker, bars):
+    with _volatility_trackers_lock:
+        tracker = volatility_trackers.setdefault(ticker.upper(), VolatilityTracker())
+    with tracker.lock:
+        # the last bar may still be revised by a later fetch in the same session, so it is never settled
+        tracker.update(bars[:-1])
+        return tracker.estimates(bars[-1:])
+
+
+@timed("data.fetch_stock")
+def _fetch_stock_data(ticker):
+    import yfinance as yf
+
+    stock = yf.Ticker(ticker, session=get_http_session())
+    info = stock.info
+
+    def missing_bars(start):
+        # the last stored day is fetched again, as it may have been stored mid-session
+        history = stock.history(period=HISTORY_PERIOD) if start is None else stock.history(start=start)
+        return frame_to_bars(history)
+
+    with span("data.history_update"):
+        bars = history_store.update(ticker, missing_bars)
+    with span("data.volatility_estimates"):
+        estimates = _volatility_estimates(ticker, bars)
+    volatility = estimates.get("ewma", 0.0)
+
+    return {
+        "current_price": info.get("regularMarketPrice", float(bars["close"][-1]) if len(bars) else 0),
+        "volatility": volatility if np.isfinite(volatility) else 0.0,
+        "volatility_estimates": estimates,
+        "dividend_yield": float(info.get("dividendYield", 0)),
+        "company_name": info.get("longName", ticker),
+    }
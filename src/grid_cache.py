@@ -0,0 +1,107 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.black_scholes import BlackScholes
+from src.instrumentation import timed
+
+PRICE_STEP_PCT = 1
+VOL_STEP_PCT = 2
+
+
+def axis_percentages(pct_range, step):
+    # a fixed-step lattice, so a wider range shares every existing point with the narrower one
+    low, high = pct_range
+    return np.arange(low, high + step / 2, step, dtype=np.int64)
+
+
+@dataclass
+class GridStats:
+    hits: int = 0
+    partial_hits: int = 0
+    misses: int = 0
+    cells_computed: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self):
+        # a partial hit reuses part of a cached grid, so it counts as a hit
+        lookups = self.hits + self.partial_hits + self.misses
+        return (self.hits + self.partial_hits) / lookups if lookups else 0.0
+
+
+class HeatmapGridCache:
+    def __init__(self, max_entries=32, price_step_pct=PRICE_STEP_PCT, vol_step_pct=VOL_STEP_PCT):
+        self.max_entries = max_entries
+        self.price_step_pct = price_step_pct
+        self.vol_step_pct = vol_step_pct
+        self.stats = GridStats()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @timed("heatmap.grid_cache")
+    def get(self, s, k, t, r, q, sigma, price_range, vol_range):
+        key = (float(s), float(k), float(t), float(r), float(q), float(sigma))
+        price_pcts = axis_percentages(price_range, self.price_step_pct)
+        vol_pcts = axis_percentages(vol_range, self.vol_step_pct)
+        s_axis = s * price_pcts / 100
+        sigma_axis = sigma * vol_pcts / 100
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+
+        if cached is None:
+            self.stats.misses += 1
+            call, put = self._price(s_axis, sigma_axis, k, t, r, q)
+        else:
+            call, put = self._extend(cached, price_pcts, vol_pcts, s_axis, sigma_axis, k, t, r, q)
+
+        # cached grids are shared between callers, so hand them out read-only
+        call.flags.writeable = put.flags.writeable = False
+        with self._lock:
+            self._entries[key] = (price_pcts, vol_pcts, call, put)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+        return s_axis, sigma_axis, call, put
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _extend(self, cached, price_pcts, vol_pcts, s_axis, sigma_axis, k, t, r, q):
+        cached_price_pcts, cached_vol_pcts, cached_call, cached_put = cached
+        if np.array_equal(price_pcts, cached_price_pcts) and np.array_equal(vol_pcts, cached_vol_pcts):
+            self.stats.hits += 1
+            return cached_call, cached_put
+
+        self.stats.partial_hits += 1
+        known_cols = np.isin(price_pcts, cached_price_pcts)
+        known_rows = np.isin(vol_pcts, cached_vol_pcts)
+        call = np.empty((vol_pcts.size, price_pcts.size))
+        put = np.empty_like(call)
+
+        rows = np.searchsorted(cached_vol_pcts, vol_pcts[known_rows])
+        cols = np.searchsorted(cached_price_pcts, price_pcts[known_cols])
+        call[np.ix_(known_rows, known_cols)] = cached_call[np.ix_(rows, cols)]
+        put[np.ix_(known_rows, known_cols)] = cached_put[np.ix_(rows, cols)]
+
+        # only the new rows (every column) and the new columns of the reused rows are priced
+        if (~known_rows).any():
+            new_call, new_put = self._price(s_axis, sigma_axis[~known_rows], k, t, r, q)
+            call[~known_rows], put[~known_rows] = new_call, new_put
+        if (~known_cols).any() and known_rows.any():
+            new_call, new_put = self._price(s_axis[~known_cols], sigma_axis[known_rows], k, t, r, q)
+            call[np.ix_(known_rows, ~known_cols)] = new_call
+            put[np.ix_(known_rows, ~known_cols)] = new_put
+        return call, put
+
+    def _price(self, s_axis, sigma_axis, k, t, r, q):
+        self.stats.cells_computed += s_axis.size * sigma_axis.size
+        grid = BlackScholes.grid(s_axis, sigma_axis, k, t, r, q)
+        return grid.calculate_option_price("call"), grid.calculate_option_price("put")
@@ -0,0 +1,67 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from src.black_scholes import BlackScholes
+
+DEFAULT_RESOLUTIONS = (25, 50, 100, 250, 500)
+
+
+class HeatmapLevel(NamedTuple):
+    resolution: int
+    s_axis: np.ndarray
+    sigma_axis: np.ndarray
+    call: np.ndarray
+    put: np.ndarray
+
+
+def adaptive_axis(axis, curvature, n, uniform_share=0.5):
+    # inverse-CDF sampling of a density that mixes a uniform floor with the observed curvature
+    def cumulative(values):
+        return np.concatenate([[0.0], np.cumsum(0.5 * (values[1:] + values[:-1]) * np.diff(axis))])
+
+    curvature = np.nan_to_num(np.abs(curvature))
+    span = axis[-1] - axis[0]
+    mass = cumulative(curvature)[-1]
+    shaped = curvature / mass if mass > 0 else np.full(axis.size, 1 / span)
+    cdf = cumulative(uniform_share / span + (1 - uniform_share) * shaped)
+    return np.interp(np.linspace(0, 1, n), cdf / cdf[-1], axis)
+
+
+def _curvature(values, axis, along):
+    return np.abs(np.gradient(np.gradient(values, axis, axis=along), axis, axis=along)).mean(axis=1 - along)
+
+
+def price_heatmap(s_axis, sigma_axis, k, t, r, q, chunk_rows=64):
+    call = np.empty((sigma_axis.size, s_axis.size))
+    put = np.empty_like(call)
+    for start in range(0, sigma_axis.size, chunk_rows):
+        rows = slice(start, start + chunk_rows)
+        grid = BlackScholes.grid(s_axis, sigma_axis[rows], k, t, r, q)
+        call[rows] = grid.calculate_option_price("call")
+        put[rows] = grid.calculate_option_price("put")
+    return call, put
+
+
+def refine_heatmap(
+    s, k, t, r, q, sigma, price_range, vol_range, resolutions=DEFAULT_RESOLUTIONS, adaptive=True, chunk_rows=64
+):
+    s_bounds = (s * price_range[0] / 100, s * price_range[1] / 100)
+    sigma_bounds = (sigma * vol_range[0] / 100, sigma * vol_range[1] / 100)
+
+    previous = None
+    for resolution in resolutions:
+        if previous is None or not adaptive:
+            s_axis = np.linspace(*s_bounds, resolution)
+            sigma_axis = np.linspace(*sigma_bounds, resolution)
+        else:
+            # spend the extra samples where the surface bends most: gamma along S, volga along sigma
+            s_axis = adaptive_axis(previous.s_axis, _curvature(previous.call, previous.s_axis, 1), resolution)
+            sigma_axis = adaptive_axis(
+                previous.sigma_axis, _curvature(previous.call, previous.sigma_axis, 0), resolution
+            )
+
+        call, put = price_heatmap(s_axis, sigma_axis, k, t, r, q, chunk_rows)
+        # only the latest level is kept alive, so memory is bounded by the finest grid
+        previous = HeatmapLevel(resolution, s_axis, sigma_axis, call, put)
+        yield previous
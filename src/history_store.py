@@ -0,0 +1,100 @@
+import threading
+from pathlib import Path
+
+import numpy as np
+
+BAR_DTYPE = np.dtype(
+    [
+        ("time", "datetime64[s]"),
+        ("open", "f8"),
+        ("high", "f8"),
+        ("low", "f8"),
+        ("close", "f8"),
+        ("volume", "f8"),
+    ]
+)
+
+
+def frame_to_bars(frame):
+    import pandas as pd
+
+    # yfinance history frame -> bar records; a frame without OHLC columns uses its close for all of them
+    bars = np.empty(len(frame), dtype=BAR_DTYPE)
+    index = pd.DatetimeIndex(frame.index)
+    if index.tz is not None:
+        # keep exchange-local wall time, so a daily bar stays on its trading date
+        index = index.tz_localize(None)
+    bars["time"] = index.to_numpy(dtype="datetime64[s]")
+    bars["close"] = frame["Close"].to_numpy(dtype=float)
+    for field in ("open", "high", "low"):
+        column = field.capitalize()
+        bars[field] = frame[column].to_numpy(dtype=float) if column in frame.columns else bars["close"]
+    bars["volume"] = frame["Volume"].to_numpy(dtype=float) if "Volume" in frame.columns else 0.0
+    return bars
+
+
+class HistoryStore:
+    # one append-only file of fixed-width bar records per ticker, read back through a memory map
+    def __init__(self, root=None):
+        self.root = Path(root).expanduser() if root else None
+        self._series = {}
+        self._lock = threading.RLock()
+
+    def bars(self, ticker):
+        key = ticker.upper()
+        with self._lock:
+            cached = self._series.get(key)
+            if self.root is None:
+                return cached if cached is not None else np.empty(0, dtype=BAR_DTYPE)
+            path = self._path(key)
+            count = path.stat().st_size // BAR_DTYPE.itemsize if path.exists() else 0
+            # another process may have appended since the file was mapped
+            if cached is None or len(cached) != count:
+                cached = np.memmap(path, BAR_DTYPE, mode="r", shape=(count,)) if count else np.empty(0, BAR_DTYPE)
+                self._series[key] = cached
+            return cached
+
+    def last_time(self, ticker):
+        bars = self.bars(ticker)
+        return bars["time"][-1] if len(bars) else None
+
+    def append(self, ticker, bars):
+        key = ticker.upper()
+        bars = np.asarray(bars, dtype=BAR_DTYPE)
+        # sorted by time, keeping the last copy of any repeated bar
+        bars = bars[np.argsort(bars["time"], kind="stable")]
+        keep = np.ones(len(bars), dtype=bool)
+        keep[:-1] = bars["time"][1:] != bars["time"][:-1]
+        bars = bars[keep]
+
+        with self._lock:
+            existing = self.bars(key)
+            start = len(existing)
+            if start:
+                last = existing["time"][-1]
+                bars = bars[bars["time"] >= last]
+                # the last stored bar may have been fetched mid-session, so a newer copy replaces it
+                if len(bars) and bars["time"][0] == last:
+                    start -= 1
+            if not len(bars):
+                return 0
+
+            if self.root is None:
+                self._series[key] = np.concatenate((existing[:start], bars))
+            else:
+                path = self._path(key)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, "r+b" if path.exists() else "wb") as f:
+                    f.seek(start * BAR_DTYPE.itemsize)
+                    f.write(bars.tobytes())
+                self._series.pop(key, None)
+            return start + len(bars) - len(existing)
+
+    def update(self, ticker, fetch):
+        # fetch(start) returns bars from `start` (a date) on, or the full history when start is None
+        last = self.last_time(ticker)
+        self.append(ticker, fetch(None if last is None else last.astype("datetime64[D]").item()))
+        return self.bars(ticker)
+
+    def _path(self, key):
+        return self.root / f"{key}.bars"
@@ -0,0 +1,118 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+from src.norm_backends import select_backend
+
+MAX_TOTAL_VOL = 10.0
+
+
+class IVResult(NamedTuple):
+    sigma: np.ndarray
+    converged: np.ndarray
+    iterations: np.ndarray
+
+
+def _is_call(option_type):
+    option_type = np.asarray(option_type)
+    if option_type.dtype == bool:
+        return option_type
+    return np.char.lower(option_type.astype(str)) == "call"
+
+
+def _otm_black(forward, strike, total_vol, is_call, cdf, pdf):
+    d1 = np.log(forward / strike) / total_vol + 0.5 * total_vol
+    d2 = d1 - total_vol
+    sign = np.where(is_call, 1.0, -1.0)
+    price = sign * (forward * cdf(sign * d1) - strike * cdf(sign * d2))
+    vega = forward * pdf(d1)
+    return price, vega, vega * d1 * d2 / total_vol
+
+
+def _initial_guess(forward, strike, call_value):
+    # Corrado-Miller rational approximation of sigma * sqrt(t)
+    half_moneyness = 0.5 * (forward - strike)
+    excess = call_value - half_moneyness
+    root = np.sqrt(np.maximum(excess**2 - (forward - strike) ** 2 / math.pi, 0.0))
+    return math.sqrt(2 * math.pi) / (forward + strike) * (excess + root)
+
+
+def _solve(price, s, k, t, r, q, is_call, tol, max_iter):
+    forward = s * np.exp((r - q) * t)
+    discount = np.exp(-r * t)
+    undiscounted = price / discount
+    call_value = np.where(is_call, undiscounted, undiscounted + forward - k)
+
+    # solve on the out-of-the-money side, which is better conditioned
+    otm_call = forward <= k
+    target = np.where(otm_call, call_value, call_value - (forward - k))
+    upper = np.where(otm_call, forward, k)
+
+    n = price.size
+    total_vol = np.full(n, np.nan)
+    converged = np.zeros(n, dtype=bool)
+    iterations = np.zeros(n, dtype=np.int32)
+
+    # prices indistinguishable from intrinsic value carry no volatility information
+    valid = np.isfinite(target) & (t > 0) & (target > tol * k) & (target < upper)
+
+    active = np.flatnonzero(valid)
+    guess = _initial_guess(forward[active], k[active], call_value[active])
+    w = np.clip(np.nan_to_num(guess, nan=0.1), 1e-4, MAX_TOTAL_VOL)
+    lo = np.zeros(active.size)
+    hi = np.full(active.size, MAX_TOTAL_VOL)
+    f_k, f_target, f_call = forward[active], target[active], otm_call[active]
+
+    for iteration in range(1, max_iter + 1):
+        if active.size == 0:
+            break
+        backend = select_backend(active.size)
+        model, vega, volga = _otm_black(f_k, k[active], w, f_call, backend.cdf, backend.pdf)
+        diff = model - f_target
+        np.copyto(hi, w, where=diff > 0)
+        np.copyto(lo, w, where=diff <= 0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = diff / vega
+            step = newton / np.maximum(1.0 - 0.5 * newton * volga / vega, 0.5)
+        w_new = w - step
+        outside = ~np.isfinite(w_new) | (w_new <= lo) | (w_new >= hi)
+        w_new = np.where(outside, 0.5 * (lo + hi), w_new)
+
+        done = (np.abs(diff) <= tol * k[active]) | (np.abs(w_new - w) <= tol * w)
+        iterations[active] = iteration
+        finished = active[done]
+        total_vol[finished] = np.where(np.abs(diff[done]) <= tol * k[finished], w[done], w_new[done])
+        converged[finished] = True
+
+        keep = ~done
+        active, w = active[keep], w_new[keep]
+        lo, hi, f_k, f_target, f_call = lo[keep], hi[keep], f_k[keep], f_target[keep], f_call[keep]
+
+    total_vol[active] = w
+    return total_vol / np.sqrt(t), converged, iterations
+
+
+def implied_volatility(
+    price, s, k, t, r, q=0.0, option_type="call", tol=1e-10, max_iter=50, workers=None, chunk_size=250_000
+):
+    arrays = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (price, s, k, t, r, q)), _is_call(option_type))
+    shape = arrays[0].shape
+    flat = [a.ravel() for a in arrays]
+
+    if workers and flat[0].size > chunk_size:
+        bounds = range(0, flat[0].size, chunk_size)
+        chunks = [[a[i : i + chunk_size] for a in flat] for i in bounds]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(_solve_chunk, chunks, [tol] * len(chunks), [max_iter] * len(chunks)))
+        sigma, converged, iterations = (np.concatenate(part) for part in zip(*parts, strict=True))
+    else:
+        sigma, converged, iterations = _solve(*flat, tol, max_iter)
+
+    return IVResult(sigma.reshape(shape), converged.reshape(shape), iterations.reshape(shape))
+
+
+def _solve_chunk(chunk, tol, max_iter):
+    return _solve(*chunk, tol, max_iter)
@@ -0,0 +1,233 @@
+import contextvars
+import io
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from datetime import datetime
+from functools import wraps
+from os import getenv
+from pathlib import Path
+
+ENABLED_BY_DEFAULT = getenv("PRICER_INSTRUMENTATION", "") not in ("", "0")
+PROFILE_MODES = ("cprofile", "sampling")
+# profiles written to the default directory beyond this many are deleted, oldest first
+PROFILE_KEEP = 20
+
+# a process-wide override; without it only code running inside a started run is recorded
+_enabled = ENABLED_BY_DEFAULT
+# one shared no-op context manager, so an unrecorded span allocates nothing
+_NULL_SPAN = nullcontext()
+_current_run = contextvars.ContextVar("instrumentation_run", default=None)
+_totals_lock = threading.Lock()
+
+# process-wide totals, including work done outside a recorded run (e.g. background refreshes)
+span_totals = defaultdict(lambda: [0, 0])
+counter_totals = defaultdict(lambda: [0, 0])
+
+
+def enabled():
+    return _enabled or _current_run.get() is not None
+
+
+def enable(flag=True):
+    global _enabled
+    _enabled = flag
+
+
+def reset():
+    with _totals_lock:
+        span_totals.clear()
+        counter_totals.clear()
+
+
+class Run:
+    def __init__(self):
+        self.start_ns = time.perf_counter_ns()
+        self.duration_ns = None
+        # (path, start_ns, duration_ns); the path holds the names of the enclosing stage and spans
+        self.spans = []
+        # name -> [calls, items]
+        self.counters = defaultdict(lambda: [0, 0])
+        self.stack = []
+        self.stage = None
+
+    @property
+    def duration_ms(self):
+        end = self.duration_ns if self.duration_ns is not None else time.perf_counter_ns() - self.start_ns
+        return end / 1e6
+
+    def breakdown(self):
+        # one row per span path, in the order the spans started
+        rows = {}
+        for path, _, duration in sorted(self.spans, key=lambda span: span[1]):
+            row = rows.setdefault(path, {"span": path[-1], "depth": len(path) - 1, "calls": 0, "total_ms": 0.0})
+            row["calls"] += 1
+            row["total_ms"] += duration / 1e6
+        total = self.duration_ms
+        for row in rows.values():
+            row["share"] = row["total_ms"] / total if total else 0.0
+        return list(rows.values())
+
+
+class _Span:
+    __slots__ = ("name", "run", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.run = _current_run.get()
+        if self.run is not None:
+            self.run.stack.append(self.name)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        duration = time.perf_counter_ns() - self.start
+        if self.run is not None:
+            self.run.spans.append((tuple(self.run.stack), self.start, duration))
+            self.run.stack.pop()
+        _add(span_totals, self.name, duration)
+        return False
+
+
+def _add(totals, name, amount):
+    with _totals_lock:
+        total = totals[name]
+        total[0] += 1
+        total[1] += amount
+
+
+def span(name):
+    return _Span(name) if enabled() else _NULL_SPAN
+
+
+def timed(name):
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled():
+                return fn(*args, **kwargs)
+            with _Span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def count(name, items=1):
+    # one call of a kernel that processed `items` contracts, paths or nodes
+    run = _current_run.get()
+    if run is not None:
+        counter = run.counters[name]
+        counter[0] += 1
+        counter[1] += items
+    elif not _enabled:
+        return
+    _add(counter_totals, name, items)
+
+
+def start_run():
+    # the run belongs to the calling thread (or task), so one session recording does not switch others on
+    run = Run()
+    _current_run.set(run)
+    return run
+
+
+def stage(name):
+    # ends the running stage and starts the next, so a flat script can be split into stages without `with` blocks
+    run = _current_run.get()
+    if run is None:
+        return
+    now = time.perf_counter_ns()
+    if run.stage is not None:
+        previous, started = run.stage
+        run.spans.append(((previous,), started, now - started))
+        _add(span_totals, previous, now - started)
+    run.stage = (name, now) if name is not None else None
+    run.stack = [name] if name is not None else []
+
+
+def finish_run():
+    run = _current_run.get()
+    if run is None:
+        return None
+    stage(None)
+    run.duration_ns = time.perf_counter_ns() - run.start_ns
+    _current_run.set(None)
+    return run
+
+
+def profile_path(mode="cprofile", directory=None):
+    directory = Path(directory or getenv("PROFILE_DIR") or Path(tempfile.gettempdir()) / "black-scholes-profiles")
+    suffix = "prof" if mode == "cprofile" else "html"
+    return directory / f"profile-{datetime.now():%Y%m%d-%H%M%S-%f}.{suffix}"
+
+
+class ProfileCapture:
+    def __init__(self, mode="cprofile", interval=0.001):
+        if mode == "cprofile":
+            import cProfile
+
+            self._profiler = cProfile.Profile()
+        elif mode == "sampling":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                raise ImportError("Sampling profiles need pyinstrument: pip install pyinstrument") from None
+            self._profiler = Profiler(interval=interval)
+        else:
+            raise ValueError(f"Unknown profile mode '{mode}', expected one of {PROFILE_MODES}")
+        self.mode = mode
+
+    def start(self):
+        if self.mode == "cprofile":
+            self._profiler.enable()
+        else:
+            self._profiler.start()
+        return self
+
+    def stop(self):
+        if self.mode == "cprofile":
+            self._profiler.disable()
+        else:
+            self._profiler.stop()
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        return False
+
+    def summary(self, limit=25):
+        if self.mode == "sampling":
+            return self._profiler.output_text()
+        import pstats
+
+        stream = io.StringIO()
+        pstats.Stats(self._profiler, stream=stream).sort_stats("cumulative").print_stats(limit)
+        return stream.getvalue()
+
+    def dump(self, path=None, keep=PROFILE_KEEP):
+        # .prof files open in snakeviz or pstats; sampling profiles are written as pyinstrument HTML
+        default = path is None
+        path = profile_path(self.mode) if default else Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self.mode == "cprofile":
+            self._profiler.dump_stats(path)
+        else:
+            path.write_text(self._profiler.output_html())
+        if default:
+            _prune_profiles(path.parent, keep)
+        return path
+
+
+def _prune_profiles(directory, keep):
+    # the names embed their timestamp, so they sort oldest first
+    for old in sorted(directory.glob("profile-*"))[:-keep]:
+        old.unlink(missing_ok=True)
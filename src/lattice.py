@@ -0,0 +1,190 @@
+import numpy as np
+
+from src.black_scholes import BlackScholes, PricingResult
+from src.instrumentation import count
+
+METHODS = ("binomial", "trinomial")
+VOL_BUMP = 0.01
+# low volatilities are bumped by this fraction of sigma instead, so sigma - bump stays well above zero
+RELATIVE_VOL_BUMP = 0.1
+RATE_BUMP = 0.001
+
+
+def _greeks_from_nodes(v0, nodes, s, center, growth, elapsed):
+    # three nodes at spots center / growth, center and center * growth, `elapsed` years after the valuation date;
+    # a drift-adjusted tree centres them off s, so delta and theta are carried back to s with the tree's gamma
+    low, mid, high = nodes[:, 0], nodes[:, 1], nodes[:, 2]
+    s_low, s_high = center / growth, center * growth
+    delta = (high - low) / (s_high - s_low)
+    gamma = ((high - mid) / (s_high - center) - (mid - low) / (center - s_low)) / (0.5 * (s_high - s_low))
+    shift = center - s
+    theta = (mid - delta * shift + 0.5 * gamma * shift**2 - v0) / elapsed
+    return v0, delta - gamma * shift, gamma, theta
+
+
+def _out_of_range(*probabilities):
+    return np.logical_or.reduce([(p < 0) | (p > 1) for p in probabilities])
+
+
+def backward_induction(s, k, t, r, sigma, q, is_call, american, steps, method="binomial"):
+    # every argument is a 1-d array with one entry per contract; all contracts step back through time together
+    if method not in METHODS:
+        raise ValueError(f"Unknown lattice method '{method}'. Choose from {', '.join(METHODS)}.")
+    if steps < 3:
+        raise ValueError("A lattice needs at least 3 steps.")
+    count("lattice.backward_induction", s.size)
+
+    dt = (t / steps)[:, np.newaxis]
+    disc = np.exp(-r[:, np.newaxis] * dt)
+    growth = np.exp((r - q)[:, np.newaxis] * dt)
+    sign = np.where(is_call, 1.0, -1.0)[:, np.newaxis]
+    s_col, k_col, exercise = s[:, np.newaxis], k[:, np.newaxis], american[:, np.newaxis]
+
+    if method == "binomial":
+        u = np.exp(sigma[:, np.newaxis] * np.sqrt(dt))
+
+        def probabilities(drift):
+            p_up = (drift - 1 / u) / (u - 1 / u)
+            return 1 - p_up, p_up
+
+        nodes_at, spacing, greek_step = (lambda i: np.arange(-i, i + 1, 2)), u**2, 2
+    else:
+        u = np.exp(sigma[:, np.newaxis] * np.sqrt(2 * dt))
+        half_up, half_down = np.sqrt(u), 1 / np.sqrt(u)
+
+        def probabilities(drift):
+            p_up = ((np.sqrt(drift) - half_down) / (half_up - half_down)) ** 2
+            p_down = ((half_up - np.sqrt(drift)) / (half_up - half_down)) ** 2
+            return p_down, 1 - p_up - p_down, p_up
+
+        nodes_at, spacing, greek_step = (lambda i: np.arange(-i, i + 1)), u, 1
+
+    # when sigma * sqrt(dt) < |r - q| * dt the CRR probabilities leave [0, 1] and the tree diverges; those contracts
+    # get a tree whose centre moves with the forward (Jarrow-Rudd style), which leaves only the symmetric spread
+    tilt = np.where(_out_of_range(*probabilities(growth)), growth, 1.0)
+    weights = tuple(disc * p for p in probabilities(growth / tilt))
+
+    # one rolling row per contract, overwritten in place as the induction moves back a step
+    values = np.maximum(sign * (s_col * tilt**steps * u ** nodes_at(steps) - k_col), 0.0)
+    greek_nodes = None
+    for i in range(steps - 1, -1, -1):
+        width = nodes_at(i).size
+        stepped = sum(w * values[:, j : j + width] for j, w in enumerate(weights))
+        values[:, :width] = stepped
+        exercised = np.maximum(values[:, :width], sign * (s_col * tilt**i * u ** nodes_at(i) - k_col))
+        np.copyto(values[:, :width], exercised, where=exercise)
+        if i == greek_step:
+            greek_nodes = values[:, :3].copy()
+
+    center = s * tilt[:, 0] ** greek_step
+    return _greeks_from_nodes(values[:, 0], greek_nodes, s, center, spacing[:, 0], greek_step * dt[:, 0])
+
+
+class LatticePricer:
+    def __init__(
+        self,
+        s,
+        k,
+        t,
+        r,
+        sigma,
+        q=0.0,
+        steps=200,
+        method="binomial",
+        american=True,
+        richardson=False,
+        control_variate=True,
+    ):
+        self.s, self.k, self.t, self.r, self.sigma, self.q = s, k, t, r, sigma, q
+        self.steps = steps
+        self.method = method
+        self.american = american
+        self.richardson = richardson
+        self.control_variate = control_variate
+
+    @property
+    def shape(self):
+        return np.broadcast_shapes(*(np.shape(v) for v in (self.s, self.k, self.t, self.r, self.sigma, self.q)))
+
+    def calculate_option_price(self, option_type="call"):
+        prices = self._evaluate([option_type == "call"], [(0.0, 0.0)])[0]
+        return self._shaped(prices[0, 0])
+
+    def calculate_all(self):
+        # vega and rho come from re-running the tree with bumped inputs, batched with the base contracts
+        sigma = np.broadcast_to(np.asarray(self.sigma, dtype=float), self.shape).ravel()
+        vol_bump = np.minimum(VOL_BUMP, RELATIVE_VOL_BUMP * sigma)
+        bumps = [(0.0, 0.0), (vol_bump, 0.0), (-vol_bump, 0.0), (0.0, RATE_BUMP), (0.0, -RATE_BUMP)]
+        price, delta, gamma, theta = self._evaluate([True, False], bumps)
+        vega = (price[:, 1] - price[:, 2]) / (2 * vol_bump)
+        rho = (price[:, 3] - price[:, 4]) / (2 * RATE_BUMP)
+        return PricingResult(
+            call=self._shaped(price[0, 0]),
+            put=self._shaped(price[1, 0]),
+            delta_call=self._shaped(delta[0, 0]),
+            delta_put=self._shaped(delta[1, 0]),
+            gamma=self._shaped(gamma[0, 0]),
+            vega=self._shaped(vega[0]),
+            theta_call=self._shaped(theta[0, 0]),
+            theta_put=self._shaped(theta[1, 0]),
+            rho_call=self._shaped(rho[0]),
+            rho_put=self._shaped(rho[1]),
+            gamma_put=self._shaped(gamma[1, 0]),
+            vega_put=self._shaped(vega[1]),
+        )
+
+    def calculate_greeks(self):
+        return self.calculate_all().greeks()
+
+    def _shaped(self, values):
+        values = values.reshape(self.shape)
+        return values if values.ndim else values[()]
+
+    def _evaluate(self, is_call, bumps):
+        # returns price, delta, gamma and theta indexed by [option type, bump, contract]
+        s, k, t, r, sigma, q = (
+            np.broadcast_to(np.asarray(v, dtype=float), self.shape).ravel()
+            for v in (self.s, self.k, self.t, self.r, self.sigma, self.q)
+        )
+        batch = (len(is_call), len(bumps), s.size)
+        # bumps may be scalars or one value per contract
+        bumped_r = np.stack([np.broadcast_to(r + rate_bump, s.shape) for _, rate_bump in bumps])
+        bumped_sigma = np.stack([np.broadcast_to(sigma + vol_bump, s.shape) for vol_bump, _ in bumps])
+        contracts = (
+            *(np.tile(v, batch[0] * batch[1]) for v in (s, k, t)),
+            np.tile(bumped_r.ravel(), batch[0]),
+            np.tile(bumped_sigma.ravel(), batch[0]),
+            np.tile(q, batch[0] * batch[1]),
+            np.repeat(is_call, batch[1] * batch[2]),
+        )
+
+        estimate = self._corrected(contracts, self.steps)
+        if self.richardson:
+            # off by default: extrapolation assumes the error shrinks smoothly in 1 / steps, but an American price's
+            # error oscillates with where the spot and strike fall between nodes, and the extrapolation amplifies it;
+            # the coarse tree keeps an even step count because binomial errors alternate with parity
+            coarse = max(self.steps // 4 * 2, 4)
+            estimate = (self.steps * estimate - coarse * self._corrected(contracts, coarse)) / (self.steps - coarse)
+        return estimate.reshape((4, *batch))
+
+    def _corrected(self, contracts, steps):
+        s, k, t, r, sigma, q, is_call = contracts
+        if not (self.american and self.control_variate):
+            american = np.full(s.size, self.american)
+            return np.stack(backward_induction(s, k, t, r, sigma, q, is_call, american, steps, self.method))
+
+        # the American and European trees share the same discretization error, so their difference is accurate;
+        # both run in a single batched induction
+        both = [np.concatenate([v, v]) for v in contracts]
+        american = np.repeat([True, False], s.size)
+        tree = np.stack(backward_induction(*both, american, steps, self.method))
+        exact = BlackScholes(s, k, t, r, sigma, q).calculate_all()
+        closed_form = np.stack(
+            [
+                np.where(is_call, exact.call, exact.put),
+                np.where(is_call, exact.delta_call, exact.delta_put),
+                exact.gamma,
+                np.where(is_call, exact.theta_call, exact.theta_put),
+            ]
+        )
+        return tree[:, : s.size] - tree[:, s.size :] + closed_form
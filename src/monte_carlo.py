@@ -0,0 +1,171 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+from src.black_scholes import BlackScholes
+from src.instrumentation import count
+
+PAYOFFS = ("european", "asian", "barrier", "lookback")
+BARRIER_TYPES = ("up-and-out", "down-and-out", "up-and-in", "down-and-in")
+
+
+class MCResult(NamedTuple):
+    price: float
+    std_error: float
+    paths: int
+
+
+class _Contract(NamedTuple):
+    s: float
+    k: float
+    t: float
+    r: float
+    sigma: float
+    q: float
+    option_type: str
+    payoff: str
+    barrier: float | None
+    barrier_type: str
+    steps: int
+    antithetic: bool
+    control_variate: bool
+
+
+def _intrinsic(level, k, option_type):
+    return np.maximum(level - k, 0.0) if option_type == "call" else np.maximum(k - level, 0.0)
+
+
+def _payoff(paths, contract):
+    if contract.payoff == "european":
+        return _intrinsic(paths[:, -1], contract.k, contract.option_type)
+    if contract.payoff == "asian":
+        return _intrinsic(paths.mean(axis=1), contract.k, contract.option_type)
+    if contract.payoff == "lookback":
+        extreme = paths.max(axis=1) if contract.option_type == "call" else paths.min(axis=1)
+        return _intrinsic(extreme, contract.k, contract.option_type)
+
+    # barriers are monitored discretely, at the start and at every step
+    if contract.barrier_type.startswith("up"):
+        hit = (paths.max(axis=1) >= contract.barrier) | (contract.s >= contract.barrier)
+    else:
+        hit = (paths.min(axis=1) <= contract.barrier) | (contract.s <= contract.barrier)
+    alive = hit if contract.barrier_type.endswith("in") else ~hit
+    return np.where(alive, _intrinsic(paths[:, -1], contract.k, contract.option_type), 0.0)
+
+
+def _simulate_chunk(contract, seed, n_paths):
+    # returns the running sums the estimator needs, so chunks merge without keeping any paths around
+    rng = np.random.default_rng(seed)
+    steps = 1 if contract.payoff == "european" else contract.steps
+    draws = math.ceil(n_paths / 2) if contract.antithetic else n_paths
+
+    paths = np.empty((2 * draws if contract.antithetic else draws, steps))
+    rng.standard_normal(out=paths[:draws])
+    if contract.antithetic:
+        np.negative(paths[:draws], out=paths[draws:])
+
+    dt = contract.t / steps
+    paths *= contract.sigma * math.sqrt(dt)
+    paths += (contract.r - contract.q - 0.5 * contract.sigma**2) * dt
+    np.cumsum(paths, axis=1, out=paths)
+    np.exp(paths, out=paths)
+    paths *= contract.s
+
+    discount = math.exp(-contract.r * contract.t)
+    payoff = discount * _payoff(paths, contract)
+    control = discount * _intrinsic(paths[:, -1], contract.k, contract.option_type)
+    if contract.antithetic:
+        # each antithetic pair is one sample
+        payoff = 0.5 * (payoff[:draws] + payoff[draws:])
+        control = 0.5 * (control[:draws] + control[draws:])
+
+    sums = [payoff.size, payoff.sum(), payoff @ payoff, control.sum(), control @ control, payoff @ control]
+    return np.array(sums, dtype=float), paths.shape[0]
+
+
+class MonteCarloPricer:
+    def __init__(
+        self,
+        s,
+        k,
+        t,
+        r,
+        sigma,
+        q=0.0,
+        paths=100_000,
+        steps=252,
+        chunk_size=10_000,
+        antithetic=True,
+        control_variate=True,
+        seed=None,
+        workers=None,
+    ):
+        self.s, self.k, self.t, self.r, self.sigma, self.q = (float(v) for v in (s, k, t, r, sigma, q))
+        self.paths = paths
+        self.steps = steps
+        self.chunk_size = chunk_size
+        self.antithetic = antithetic
+        self.control_variate = control_variate
+        self.seed = seed
+        self.workers = workers
+
+    def price(self, option_type="call", payoff="european", barrier=None, barrier_type="up-and-out"):
+        if payoff not in PAYOFFS:
+            raise ValueError(f"Unknown payoff '{payoff}'. Choose from {', '.join(PAYOFFS)}.")
+        if payoff == "barrier" and (barrier is None or barrier_type not in BARRIER_TYPES):
+            raise ValueError(f"Barrier options need a barrier level and one of {', '.join(BARRIER_TYPES)}.")
+
+        # the European payoff is its own control, so the control variate only applies to path-dependent payoffs
+        control_variate = self.control_variate and payoff != "european"
+        contract = _Contract(
+            self.s,
+            self.k,
+            self.t,
+            self.r,
+            self.sigma,
+            self.q,
+            option_type,
+            payoff,
+            barrier,
+            barrier_type,
+            self.steps,
+            self.antithetic,
+            control_variate,
+        )
+
+        count("monte_carlo.paths", self.paths)
+        sizes = [min(self.chunk_size, self.paths - start) for start in range(0, self.paths, self.chunk_size)]
+        # one child seed per chunk, so results are identical whatever the number of workers
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        if self.workers and len(sizes) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                parts = list(executor.map(_simulate_chunk, [contract] * len(sizes), seeds, sizes))
+        else:
+            parts = [_simulate_chunk(contract, seed, size) for seed, size in zip(seeds, sizes, strict=True)]
+
+        sums = np.sum([part[0] for part in parts], axis=0)
+        simulated = sum(part[1] for part in parts)
+        return self._estimate(sums, simulated, contract)
+
+    def calculate_option_price(self, option_type="call"):
+        return self.price(option_type).price
+
+    def _estimate(self, sums, simulated, contract):
+        n, sum_y, sum_yy, sum_c, sum_cc, sum_yc = sums
+        mean_y = sum_y / n
+        var_y = (sum_yy - n * mean_y**2) / (n - 1)
+        price, variance = mean_y, var_y
+
+        if contract.control_variate:
+            mean_c = sum_c / n
+            var_c = (sum_cc - n * mean_c**2) / (n - 1)
+            cov = (sum_yc - n * mean_y * mean_c) / (n - 1)
+            if var_c > 0:
+                beta = cov / var_c
+                exact = BlackScholes(self.s, self.k, self.t, self.r, self.sigma, self.q)
+                price = mean_y - beta * (mean_c - exact.calculate_option_price(contract.option_type))
+                variance = var_y - beta * cov
+
+        return MCResult(float(price), float(math.sqrt(max(variance, 0.0) / n)), int(simulated))
@@ -0,0 +1,129 @@
+import math
+from collections.abc import Callable
+from contextlib import contextmanager
+from functools import cache
+from importlib.util import find_spec
+from os import getenv
+from typing import NamedTuple
+
+import numpy as np
+
+# Every backend must agree with scipy.stats.norm to within these bounds (see tests/test_norm_backends.py).
+ABSOLUTE_TOLERANCE = 1e-14
+RELATIVE_TOLERANCE = 1e-12
+
+# Inputs at least this large are routed to a compiled backend when one is installed.
+LARGE_ARRAY_SIZE = 100_000
+
+_SQRT_2 = math.sqrt(2.0)
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+
+
+class NormBackend(NamedTuple):
+    name: str
+    cdf: Callable
+    pdf: Callable
+
+
+def _math_cdf_scalar(x):
+    return 0.5 * math.erfc(-x / _SQRT_2)
+
+
+def _math_pdf_scalar(x):
+    return _INV_SQRT_2PI * math.exp(-0.5 * x * x)
+
+
+_math_cdf_array = np.vectorize(_math_cdf_scalar, otypes=[float])
+_math_pdf_array = np.vectorize(_math_pdf_scalar, otypes=[float])
+
+
+def _math_cdf(x):
+    return _math_cdf_array(x) if np.ndim(x) else _math_cdf_scalar(x)
+
+
+def _math_pdf(x):
+    return _math_pdf_array(x) if np.ndim(x) else _math_pdf_scalar(x)
+
+
+def _numpy_pdf(x):
+    return _INV_SQRT_2PI * np.exp(-0.5 * np.square(x))
+
+
+def _load_ndtr():
+    from scipy.special import ndtr
+
+    return NormBackend("ndtr", ndtr, _numpy_pdf)
+
+
+def _load_numexpr():
+    import numexpr as ne
+    from scipy.special import ndtr
+
+    # numexpr has no erf, so only the pdf is evaluated through it
+    def pdf(x):
+        return ne.evaluate("c * exp(-0.5 * x * x)", local_dict={"x": np.asarray(x, dtype=float), "c": _INV_SQRT_2PI})
+
+    return NormBackend("numexpr", ndtr, pdf)
+
+
+def _load_numba():
+    import numba
+
+    cdf = numba.vectorize(["float64(float64)"], nopython=True, cache=True)(_math_cdf_scalar)
+    pdf = numba.vectorize(["float64(float64)"], nopython=True, cache=True)(_math_pdf_scalar)
+    return NormBackend("numba", cdf, pdf)
+
+
+_LOADERS = {
+    "math": lambda: NormBackend("math", _math_cdf, _math_pdf),
+    "ndtr": _load_ndtr,
+    "numexpr": _load_numexpr,
+    "numba": _load_numba,
+}
+_REQUIREMENTS = {"ndtr": ("scipy",), "numexpr": ("numexpr", "scipy"), "numba": ("numba",)}
+_loaded = {}
+_override = getenv("BS_NORM_BACKEND") or None
+
+
+@cache
+def available_backends():
+    # installed packages do not change while the process runs, so the import lookups happen once, not per pricing call
+    return tuple(name for name in _LOADERS if all(find_spec(module) for module in _REQUIREMENTS.get(name, ())))
+
+
+def get_backend(name):
+    if name not in _LOADERS:
+        raise ValueError(f"Unknown norm backend '{name}'. Choose from {sorted(_LOADERS)}.")
+    if name not in _loaded:
+        _loaded[name] = _LOADERS[name]()
+    return _loaded[name]
+
+
+def set_backend(name):
+    global _override
+    if name is not None:
+        get_backend(name)
+    _override = name
+
+
+@contextmanager
+def use_backend(name):
+    previous = _override
+    set_backend(name)
+    try:
+        yield get_backend(name)
+    finally:
+        set_backend(previous)
+
+
+def select_backend(size):
+    if _override is not None:
+        return get_backend(_override)
+    if size <= 1:
+        return get_backend("math")
+    available = available_backends()
+    if size >= LARGE_ARRAY_SIZE:
+        for name in ("numba", "numexpr"):
+            if name in available:
+                return get_backend(name)
+    return get_backend("ndtr" if "ndtr" in available else "math")
@@ -0,0 +1,131 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.implied_volatility import implied_volatility
+
+SECONDS_PER_YEAR = 365 * 24 * 60 * 60
+CHAIN_COLUMNS = {
+    "contractSymbol": "contract",
+    "strike": "strike",
+    "bid": "bid",
+    "ask": "ask",
+    "lastPrice": "last_price",
+    "volume": "volume",
+    "openInterest": "open_interest",
+}
+
+
+def fetch_raw_option_chain(ticker):
+    import yfinance as yf
+
+    stock = yf.Ticker(ticker)
+    raw_chain = {}
+    for expiry in stock.options:
+        chain = stock.option_chain(expiry)
+        raw_chain[expiry] = (chain.calls, chain.puts)
+    return raw_chain
+
+
+def normalize_option_chain(raw_chain, now=None):
+    now = pd.Timestamp(now or datetime.now())
+    frames = []
+    for expiry, (calls, puts) in raw_chain.items():
+        # listed equity options stop trading at 16:00 on the expiry date
+        expiry_time = pd.Timestamp(expiry) + pd.Timedelta(hours=16)
+        t = (expiry_time - now).total_seconds() / SECONDS_PER_YEAR
+        if t <= 0:
+            continue
+        for option_type, quotes in (("call", calls), ("put", puts)):
+            if quotes.empty:
+                continue
+            frame = quotes.reindex(columns=list(CHAIN_COLUMNS)).rename(columns=CHAIN_COLUMNS)
+            frame.insert(0, "option_type", option_type)
+            frame.insert(0, "t", t)
+            frame.insert(0, "expiry", expiry_time.normalize())
+            frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame(columns=["expiry", "t", "option_type", *CHAIN_COLUMNS.values(), "mid"])
+
+    chain = pd.concat(frames, ignore_index=True)
+    numeric = ["strike", "bid", "ask", "last_price", "volume", "open_interest"]
+    chain[numeric] = chain[numeric].apply(pd.to_numeric, errors="coerce").fillna(0.0)
+    quoted = (chain["bid"] > 0) & (chain["ask"] >= chain["bid"])
+    chain["mid"] = np.where(quoted, 0.5 * (chain["bid"] + chain["ask"]), chain["last_price"])
+    return chain.sort_values(["t", "option_type", "strike"], ignore_index=True)
+
+
+def load_option_chain(ticker, now=None):
+    return normalize_option_chain(fetch_raw_option_chain(ticker), now)
+
+
+def compute_chain_ivs(chain, spot, r, q=0.0):
+    result = implied_volatility(
+        chain["mid"].to_numpy(dtype=float),
+        spot,
+        chain["strike"].to_numpy(dtype=float),
+        chain["t"].to_numpy(dtype=float),
+        r,
+        q,
+        chain["option_type"].to_numpy(),
+    )
+    return chain.assign(iv=result.sigma, iv_converged=result.converged)
+
+
+class VolSurface:
+    def __init__(self, maturities, strikes, total_variance):
+        self.maturities = np.asarray(maturities, dtype=float)
+        self.strikes = np.asarray(strikes, dtype=float)
+        self.total_variance = np.asarray(total_variance, dtype=float)
+
+    @classmethod
+    def from_chain(cls, chain, spot):
+        # out-of-the-money quotes carry the cleanest volatility information
+        otm = np.where(chain["option_type"] == "call", chain["strike"] >= spot, chain["strike"] < spot)
+        quotes = chain[otm & chain["iv_converged"] & (chain["iv"] > 0)]
+        if quotes.empty:
+            raise ValueError("No usable implied volatilities to build a surface from.")
+
+        strikes = np.unique(quotes["strike"].to_numpy(dtype=float))
+        maturities, slices = [], []
+        for t, expiry_quotes in quotes.groupby("t", sort=True):
+            expiry_quotes = expiry_quotes.sort_values("strike")
+            total_variance = expiry_quotes["iv"].to_numpy() ** 2 * t
+            maturities.append(t)
+            slices.append(np.interp(strikes, expiry_quotes["strike"].to_numpy(dtype=float), total_variance))
+
+        # keep total variance non-decreasing in maturity so interpolation stays calendar-arbitrage free
+        return cls(maturities, strikes, np.maximum.accumulate(np.vstack(slices), axis=0))
+
+    def vol(self, k, t):
+        k, t = np.broadcast_arrays(np.asarray(k, dtype=float), np.asarray(t, dtype=float))
+        strikes, maturities = self.strikes, self.maturities
+
+        k = np.clip(k, strikes[0], strikes[-1])
+        j = np.clip(np.searchsorted(strikes, k, side="right") - 1, 0, strikes.size - 1)
+        j_next = np.minimum(j + 1, strikes.size - 1)
+        i = np.clip(np.searchsorted(maturities, t, side="right") - 1, 0, maturities.size - 1)
+        i_next = np.minimum(i + 1, maturities.size - 1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k_weight = np.where(j_next > j, (k - strikes[j]) / (strikes[j_next] - strikes[j]), 0.0)
+            w_lo = self.total_variance[i, j] * (1 - k_weight) + self.total_variance[i, j_next] * k_weight
+            w_hi = self.total_variance[i_next, j] * (1 - k_weight) + self.total_variance[i_next, j_next] * k_weight
+            t_lo, t_hi = maturities[i], maturities[i_next]
+
+            # linear in total variance between expiries, constant volatility beyond the listed range
+            t_weight = np.where(t_hi > t_lo, (t - t_lo) / (t_hi - t_lo), 0.0)
+            total_variance = np.where(
+                t < t_lo,
+                w_lo / t_lo * t,
+                np.where(t > t_hi, w_hi / t_hi * t, w_lo + (w_hi - w_lo) * t_weight),
+            )
+            vol = np.sqrt(total_variance / t)
+        return vol if vol.ndim else float(vol)
+
+
+def build_vol_surface(ticker, spot, r, q=0.0, now=None):
+    chain = compute_chain_ivs(load_option_chain(ticker, now), spot, r, q)
+    return VolSurface.from_chain(chain, spot)
@@ -0,0 +1,148 @@
+import numpy as np
+
+from src.black_scholes import BlackScholes
+
+LEG_DTYPE = np.dtype(
+    [
+        ("underlying", np.int32),
+        ("is_call", np.bool_),
+        ("strike", np.float64),
+        ("expiry", np.float64),
+        ("quantity", np.float64),
+        ("premium", np.float64),
+    ]
+)
+
+# legs as (option type, strike offset in strike widths, quantity)
+STRATEGIES = {
+    "Long Call": (("call", 0, 1),),
+    "Long Put": (("put", 0, 1),),
+    "Bull Call Spread": (("call", 0, 1), ("call", 1, -1)),
+    "Bear Put Spread": (("put", 0, 1), ("put", -1, -1)),
+    "Long Straddle": (("call", 0, 1), ("put", 0, 1)),
+    "Long Strangle": (("put", -1, 1), ("call", 1, 1)),
+    "Butterfly": (("call", -1, 1), ("call", 0, -2), ("call", 1, 1)),
+    "Iron Condor": (("put", -2, 1), ("put", -1, -1), ("call", 1, -1), ("call", 2, 1)),
+}
+
+
+class Portfolio:
+    def __init__(self, capacity=64):
+        self._legs = np.zeros(capacity, dtype=LEG_DTYPE)
+        self._size = 0
+        self.underlyings = []
+        self._codes = {}
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def legs(self):
+        # a view, so edits to columns write straight through to the book
+        return self._legs[: self._size]
+
+    def add_legs(self, underlying, option_type, strike, expiry, quantity=1.0, premium=0.0):
+        columns = np.broadcast_arrays(
+            np.asarray(underlying),
+            np.char.lower(np.asarray(option_type, dtype=str)) == "call",
+            *(np.asarray(v, dtype=float) for v in (strike, expiry, quantity, premium)),
+        )
+        count = columns[0].size
+        self._reserve(self._size + count)
+
+        new = self._legs[self._size : self._size + count]
+        new["underlying"] = [self._code(str(name)) for name in columns[0].ravel()]
+        for field, column in zip(LEG_DTYPE.names[1:], columns[1:], strict=True):
+            new[field] = column.ravel()
+        self._size += count
+        return np.arange(self._size - count, self._size)
+
+    def add_leg(self, underlying, option_type, strike, expiry, quantity=1.0, premium=0.0):
+        return int(self.add_legs(underlying, option_type, strike, expiry, quantity, premium)[0])
+
+    def add_strategy(self, name, underlying, strike, width, expiry, quantity=1.0):
+        option_types, offsets, quantities = zip(*STRATEGIES[name], strict=True)
+        strikes = strike + width * np.array(offsets)
+        return self.add_legs(underlying, option_types, strikes, expiry, quantity * np.array(quantities))
+
+    def remove_legs(self, indices):
+        # compacts the surviving legs in place; indices of later legs shift down
+        keep = np.ones(self._size, dtype=bool)
+        keep[indices] = False
+        survivors = int(keep.sum())
+        self._legs[:survivors] = self.legs[keep]
+        self._size = survivors
+
+    def clear(self):
+        self._size = 0
+
+    def evaluate(self, spot, sigma, r, q=0.0, indices=None):
+        # one Black-Scholes pass over every leg, or only over `indices`;
+        # spot, sigma and q are scalars, per-underlying dicts or per-leg arrays
+        legs = self.legs if indices is None else self.legs[indices]
+        s, vol, div = (self.per_leg(v, indices) for v in (spot, sigma, q))
+        result = BlackScholes(s, legs["strike"], legs["expiry"], r, vol, div).calculate_all()
+        is_call = legs["is_call"]
+        unit = {
+            "value": np.where(is_call, result.call, result.put),
+            "delta": np.where(is_call, result.delta_call, result.delta_put),
+            "gamma": result.gamma,
+            "vega": result.vega,
+            "theta": np.where(is_call, result.theta_call, result.theta_put),
+            "rho": np.where(is_call, result.rho_call, result.rho_put),
+        }
+        position = {name: legs["quantity"] * values for name, values in unit.items()}
+        position["pnl"] = legs["quantity"] * (unit["value"] - legs["premium"])
+        return position
+
+    def net_greeks(self, spot, sigma, r, q=0.0):
+        return {name: float(values.sum()) for name, values in self.evaluate(spot, sigma, r, q).items()}
+
+    def group_by(self, spot, sigma, r, q=0.0, by=("underlying", "expiry")):
+        position = self.evaluate(spot, sigma, r, q)
+        keys, groups = np.unique(self.legs[list(by)], return_inverse=True)
+        totals = {name: np.bincount(groups, weights=values, minlength=keys.size) for name, values in position.items()}
+        return {
+            self._label(key, by): {name: float(total[i]) for name, total in totals.items()}
+            for i, key in enumerate(keys)
+        }
+
+    def mark_premiums(self, spot, sigma, r, q=0.0):
+        # books every leg at its current model value, e.g. when a strategy is opened at fair value
+        legs = self.legs
+        with np.errstate(invalid="ignore", divide="ignore"):
+            legs["premium"] = np.nan_to_num(self.evaluate(spot, sigma, r, q)["value"] / legs["quantity"])
+
+    def payoff_at_expiry(self, s_range, underlying=None):
+        legs = self.legs
+        if underlying is not None:
+            legs = legs[legs["underlying"] == self._codes[underlying]]
+        s_range = np.asarray(s_range, dtype=float)[:, np.newaxis]
+        intrinsic = np.where(legs["is_call"], s_range - legs["strike"], legs["strike"] - s_range)
+        return (np.maximum(intrinsic, 0.0) - legs["premium"]) @ legs["quantity"]
+
+    def _code(self, underlying):
+        if underlying not in self._codes:
+            self._codes[underlying] = len(self.underlyings)
+            self.underlyings.append(underlying)
+        return self._codes[underlying]
+
+    def _reserve(self, size):
+        if size > self._legs.size:
+            grown = np.zeros(max(size, 2 * self._legs.size), dtype=LEG_DTYPE)
+            grown[: self._size] = self.legs
+            self._legs = grown
+
+    def per_leg(self, value, indices=None):
+        if isinstance(value, dict):
+            codes = self.legs["underlying"] if indices is None else self.legs["underlying"][indices]
+            return np.array([value[name] for name in self.underlyings], dtype=float)[codes]
+        if indices is not None and np.ndim(value):
+            return np.asarray(value)[indices]
+        return value
+
+    def _label(self, key, by):
+        return tuple(
+            self.underlyings[value] if field == "underlying" else value.item()
+            for field, value in zip(by, key, strict=True)
+        )
@@ -0,0 +1,265 @@
+import argparse
+import json
+import queue
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from src.black_scholes import BlackScholes, PricingResult
+
+INPUT_FIELDS = ("s", "k", "t", "r", "sigma", "q")
+RESULT_FIELDS = tuple(field.name for field in fields(PricingResult)[:10])
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+ROUTES = ("/price", "/price/bulk")
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.counts[bisect_left(self.buckets, value)] += 1
+            self.sum += value
+            self.count += 1
+
+    def render(self, name, labels=""):
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        separator = "," if labels else ""
+        lines, cumulative = [], 0
+        for bound, bucket_count in zip((*self.buckets, "+Inf"), counts, strict=True):
+            cumulative += bucket_count
+            lines.append(f'{name}_bucket{{{labels}{separator}le="{bound}"}} {cumulative}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines += [f"{name}_sum{suffix} {total}", f"{name}_count{suffix} {count}"]
+        return lines
+
+
+def parse_contracts(payload, require=INPUT_FIELDS[:-1]):
+    # scalars broadcast against lists, so a bulk request can share e.g. one rate across every contract
+    missing = [name for name in require if name not in payload]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+    try:
+        values = [np.asarray(payload.get(name, 0.0), dtype=float) for name in INPUT_FIELDS]
+        return np.broadcast_arrays(*values)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid contract fields: {e}") from None
+
+
+def price_contracts(arrays, option_type=None):
+    result = BlackScholes(*arrays).calculate_all()
+    priced = {name: getattr(result, name) for name in RESULT_FIELDS}
+    if option_type is not None:
+        is_call = np.char.lower(np.asarray(option_type, dtype=str)) == "call"
+        priced["price"] = np.where(is_call, result.call, result.put)
+    return priced
+
+
+class MicroBatcher:
+    def __init__(self, max_batch=1024, max_wait=0.002, expected=None):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        # callable giving how many requests could still join the batch; lets a lone request skip the wait
+        self.expected = expected
+        self.batch_sizes = Histogram(BATCH_BUCKETS)
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="pricing-batcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def submit(self, values):
+        future = Future()
+        self._queue.put((values, future))
+        return future
+
+    def _run(self):
+        running = True
+        while running:
+            item = self._queue.get()
+            if item is None:
+                return
+            # the first request opens a short window; everything arriving inside it is priced together
+            batch, deadline = [item], time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                if self.expected is not None and len(batch) >= self.expected():
+                    break
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.perf_counter(), 0.0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+            self._price(batch)
+
+    def _price(self, batch):
+        self.batch_sizes.observe(len(batch))
+        try:
+            priced = price_contracts(np.array([values for values, _ in batch]).T)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for i, (_, future) in enumerate(batch):
+            future.set_result({name: float(column[i]) for name, column in priced.items()})
+
+
+class PricingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body go out in separate writes; with Nagle on, each response would wait for a delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/metrics":
+            body = self.server.render_metrics().encode()
+            self._send(200, body, "text/plain; version=0.0.4")
+        else:
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path not in ROUTES:
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+        elif self.path == "/price":
+            # counted from the start, so the batcher knows a request is still being parsed and worth waiting for
+            with self.server.tracking_single_request():
+                self._handle_post()
+        else:
+            self._handle_post()
+
+    def _handle_post(self):
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("Request body must be a JSON object.")
+            price = self._price_single if self.path == "/price" else self._price_bulk
+            response = price(payload)
+        except ValueError as e:
+            self.server.record_error()
+            self._send_json(400, {"error": str(e)})
+            return
+        except Exception as e:
+            self.server.record_error()
+            self._send_json(500, {"error": f"Pricing failed: {e}"})
+            return
+        self._send_json(200, response)
+        self.server.latency[self.path].observe(time.perf_counter() - start)
+
+    def _price_single(self, payload):
+        arrays = parse_contracts(payload)
+        if arrays[0].ndim:
+            raise ValueError("Use /price/bulk for more than one contract.")
+        response = self.server.batcher.submit([float(a) for a in arrays]).result()
+        if "option_type" in payload:
+            response["price"] = response["call" if str(payload["option_type"]).lower() == "call" else "put"]
+        return response
+
+    def _price_bulk(self, payload):
+        priced = price_contracts(parse_contracts(payload), payload.get("option_type"))
+        return {name: np.atleast_1d(values).tolist() for name, values in priced.items()}
+
+    def _send_json(self, status, payload):
+        self._send(status, json.dumps(payload).encode(), "application/json")
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PricingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, max_batch=1024, max_wait=0.002):
+        super().__init__(address, PricingHandler)
+        self.batcher = MicroBatcher(max_batch, max_wait, expected=lambda: self.single_requests).start()
+        self.latency = {route: Histogram(LATENCY_BUCKETS) for route in ROUTES}
+        self.errors = 0
+        self.single_requests = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def tracking_single_request(self):
+        with self._lock:
+            self.single_requests += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.single_requests -= 1
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def render_metrics(self):
+        lines = ["# TYPE pricing_request_latency_seconds histogram"]
+        for route, histogram in self.latency.items():
+            lines += histogram.render("pricing_request_latency_seconds", f'endpoint="{route}"')
+        lines += ["# TYPE pricing_batch_size histogram", *self.batcher.batch_sizes.render("pricing_batch_size")]
+        lines += [
+            "# TYPE pricing_queue_depth gauge",
+            f"pricing_queue_depth {self.batcher.queue_depth()}",
+            "# TYPE pricing_request_errors_total counter",
+            f"pricing_request_errors_total {self.errors}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def server_close(self):
+        super().server_close()
+        self.batcher.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP/JSON Black-Scholes pricing service with micro-batching.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch", type=int, default=1024)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="how long a batch waits for more requests")
+    args = parser.parse_args(argv)
+
+    server = PricingServer((args.host, args.port), args.max_batch, args.max_wait_ms / 1000)
+    print(f"Pricing service listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
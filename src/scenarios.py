@@ -0,0 +1,163 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import NamedTuple
+
+import numpy as np
+
+from src.black_scholes import BlackScholes
+
+CONFIDENCE_LEVELS = (0.95, 0.99)
+
+_shared_block = None
+
+
+class ScenarioGrid(NamedTuple):
+    spot: np.ndarray
+    vol: np.ndarray
+    days: np.ndarray
+    rate: np.ndarray
+
+    @classmethod
+    def build(
+        cls,
+        spot_range=(-0.3, 0.3),
+        spot_steps=25,
+        vol_range=(-0.1, 0.1),
+        vol_steps=9,
+        days=(0, 1, 7, 30),
+        rate_range=(-0.01, 0.01),
+        rate_steps=5,
+    ):
+        return cls(
+            np.linspace(*spot_range, spot_steps),
+            np.linspace(*vol_range, vol_steps),
+            np.asarray(days, dtype=float),
+            np.linspace(*rate_range, rate_steps),
+        )
+
+    @property
+    def shape(self):
+        return tuple(axis.size for axis in self)
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    def shocks(self, start, stop):
+        indices = np.unravel_index(np.arange(start, stop), self.shape)
+        return tuple(axis[index] for axis, index in zip(self, indices, strict=True))
+
+
+class ScenarioReport(NamedTuple):
+    grid: ScenarioGrid
+    pnl: np.ndarray
+    pnl_by_underlying: dict
+    var: dict
+    expected_shortfall: dict
+    worst: list
+
+
+def _leg_values(s, k, t, r, sigma, q, is_call):
+    call = BlackScholes(s, k, t, r, sigma, q).calculate_option_price("call")
+    # puts from put-call parity, so each scenario needs a single pricing pass
+    put = call - s * np.exp(-q * t) + k * np.exp(-r * t)
+    return np.where(is_call, call, put)
+
+
+def _revalue(block, grid, r, n_groups, start, stop):
+    s, k, t, sigma, q, is_call, quantity, base_value, group = block
+    spot_shock, vol_shock, days, rate_shock = (shock[:, np.newaxis] for shock in grid.shocks(start, stop))
+
+    # legs that expire inside a scenario are valued at (almost) zero time to maturity, i.e. at intrinsic value
+    t_left = np.maximum(t - days / 365, 1e-10)
+    values = _leg_values(
+        s * (1 + spot_shock), k, t_left, r + rate_shock, np.maximum(sigma + vol_shock, 1e-4), q, is_call > 0
+    )
+    leg_pnl = (values - base_value) * quantity
+    membership = group.astype(np.intp)[:, np.newaxis] == np.arange(n_groups)
+    return leg_pnl @ membership
+
+
+def _attach_block(name, shape):
+    global _shared_block
+    memory = shared_memory.SharedMemory(name=name)
+    _shared_block = (memory, np.ndarray(shape, dtype=np.float64, buffer=memory.buf))
+
+
+def _revalue_shared(grid, r, n_groups, start, stop):
+    return _revalue(_shared_block[1], grid, r, n_groups, start, stop)
+
+
+def _chunk_bounds(n_scenarios, n_legs, chunk_cells):
+    # each chunk prices at most `chunk_cells` scenario-leg pairs, so memory stays flat however large the cube is
+    step = max(1, chunk_cells // max(n_legs, 1))
+    return [(start, min(start + step, n_scenarios)) for start in range(0, n_scenarios, step)]
+
+
+def run_scenarios(
+    portfolio,
+    spot,
+    sigma,
+    r,
+    q=0.0,
+    grid=None,
+    workers=None,
+    chunk_cells=1_000_000,
+    confidence_levels=CONFIDENCE_LEVELS,
+    worst_count=10,
+):
+    grid = ScenarioGrid.build() if grid is None else grid
+    legs = portfolio.legs
+    s, leg_sigma, leg_q = (np.broadcast_to(portfolio.per_leg(v), legs.shape).astype(float) for v in (spot, sigma, q))
+    base_value = _leg_values(s, legs["strike"], legs["expiry"], r, leg_sigma, leg_q, legs["is_call"])
+    columns = (s, legs["strike"], legs["expiry"], leg_sigma, leg_q, legs["is_call"], legs["quantity"], base_value)
+    # one float64 row per field, in the order _revalue unpacks them
+    block = np.vstack([*columns, legs["underlying"]]).astype(np.float64)
+    n_groups = len(portfolio.underlyings)
+
+    bounds = _chunk_bounds(grid.size, legs.size, chunk_cells)
+    group_pnl = np.empty((grid.size, n_groups))
+    if workers and len(bounds) > 1:
+        # legs go to the workers once through shared memory; each task only carries its scenario range
+        memory = shared_memory.SharedMemory(create=True, size=block.nbytes)
+        try:
+            np.ndarray(block.shape, dtype=np.float64, buffer=memory.buf)[:] = block
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_attach_block, initargs=(memory.name, block.shape)
+            ) as executor:
+                futures = [executor.submit(_revalue_shared, grid, r, n_groups, start, stop) for start, stop in bounds]
+                for (start, stop), future in zip(bounds, futures, strict=True):
+                    group_pnl[start:stop] = future.result()
+        finally:
+            memory.close()
+            memory.unlink()
+    else:
+        for start, stop in bounds:
+            group_pnl[start:stop] = _revalue(block, grid, r, n_groups, start, stop)
+
+    pnl = group_pnl.sum(axis=1)
+    losses = -pnl
+    var = {level: float(np.quantile(losses, level)) for level in confidence_levels}
+    expected_shortfall = {level: float(losses[losses >= var[level]].mean()) for level in confidence_levels}
+
+    worst = []
+    for index in np.argsort(pnl)[:worst_count]:
+        spot_shock, vol_shock, days, rate_shock = (float(v[0]) for v in grid.shocks(index, index + 1))
+        worst.append(
+            {
+                "spot_shock": spot_shock,
+                "vol_shock": vol_shock,
+                "days": days,
+                "rate_shock": rate_shock,
+                "pnl": float(pnl[index]),
+            }
+        )
+
+    return ScenarioReport(
+        grid,
+        pnl.reshape(grid.shape),
+        {name: group_pnl[:, i].reshape(grid.shape) for i, name in enumerate(portfolio.underlyings)},
+        var,
+        expected_shortfall,
+        worst,
+    )
@@ -0,0 +1,87 @@
+import threading
+import time
+
+from src import data_fetcher
+
+YIELD_CURVE_KEY = ("yield_curve", "treasury")
+
+
+class SharedMarketStore:
+    def __init__(self, refresh_interval=15.0, refresh_ahead=0.8, idle_timeout=3600.0, clock=time.time):
+        self.refresh_interval = refresh_interval
+        self.refresh_ahead = refresh_ahead
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self._watched = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def stock_data(self, ticker):
+        self._touch(("stock", ticker.upper()))
+        return data_fetcher.fetch_stock_data(ticker)
+
+    def risk_free_rate(self, maturity_years):
+        self._touch(YIELD_CURVE_KEY)
+        return data_fetcher.get_risk_free_rate(maturity_years)
+
+    def warm(self, tickers=()):
+        self._touch(YIELD_CURVE_KEY)
+        data_fetcher.get_yield_curve()
+        data_fetcher.fetch_many(tickers, retries=1)
+        for ticker in tickers:
+            self._touch(("stock", ticker.upper()))
+
+    def watched(self):
+        with self._lock:
+            return sorted(self._watched)
+
+    def refresh_due(self):
+        now = self.clock()
+        with self._lock:
+            idle = [key for key, last_access in self._watched.items() if now - last_access > self.idle_timeout]
+            for key in idle:
+                del self._watched[key]
+            watched = list(self._watched)
+
+        refreshed = []
+        cache = data_fetcher.market_data_cache
+        for source, key in watched:
+            age = cache.age(source, key)
+            # refresh ahead of expiry so readers keep hitting a warm entry
+            if age is not None and age < cache.ttl_for(source) * self.refresh_ahead:
+                continue
+            try:
+                if source == "stock":
+                    data_fetcher.refresh_stock_data(key)
+                else:
+                    data_fetcher.refresh_yield_curve()
+            except Exception as e:
+                self.refresh_errors += 1
+                print(f"Error refreshing {source} {key}: {e}")
+                continue
+            self.refreshes += 1
+            refreshed.append((source, key))
+        return refreshed
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="market-data-refresh", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_interval):
+            self.refresh_due()
+
+    def _touch(self, key):
+        with self._lock:
+            self._watched[key] = self.clock()
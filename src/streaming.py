@@ -0,0 +1,255 @@
+import asyncio
+import csv
+import json
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import NamedTuple
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+DEFAULT_MAX_RATE = 4.0
+RECONNECT_DELAY = 1.0
+
+
+class Quote(NamedTuple):
+    symbol: str
+    price: float
+    timestamp: float
+
+
+class StreamUpdate(NamedTuple):
+    sequence: int
+    symbols: tuple
+    spot: dict
+    position: dict
+    totals: dict
+    repriced: int
+    ticks: int
+    latency: float
+
+
+def parse_quote(record):
+    # a JSON line or CSV row with symbol, price and an optional timestamp in epoch seconds
+    if isinstance(record, (str, bytes)):
+        record = json.loads(record)
+    try:
+        return Quote(
+            str(record["symbol"]).upper(), float(record["price"]), float(record.get("timestamp") or time.time())
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid quote {record!r}: {e}") from None
+
+
+def _parse_or_skip(record, on_error):
+    # with an on_error callback a bad record is reported and skipped instead of ending the feed
+    try:
+        return parse_quote(record)
+    except ValueError as e:
+        if on_error is None:
+            raise
+        on_error(e)
+        return None
+
+
+async def replay_feed(path, speed=1.0, on_error=None):
+    # replays a .jsonl or .csv quote file, keeping the recorded gaps between ticks scaled by `speed`;
+    # speed=0 replays as fast as the consumer keeps up
+    path = Path(path)
+    with open(path, newline="") as f:
+        records = csv.DictReader(f) if path.suffix.lower() == ".csv" else (line for line in f if line.strip())
+        previous = None
+        for record in records:
+            quote = _parse_or_skip(record, on_error)
+            if quote is None:
+                continue
+            delay = 0.0 if previous is None or not speed else (quote.timestamp - previous) / speed
+            previous = quote.timestamp
+            await asyncio.sleep(max(delay, 0.0))
+            yield quote
+
+
+async def socket_feed(host, port, on_error=None):
+    # newline-delimited JSON quotes over TCP, e.g. from a market data gateway
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while line := await reader.readline():
+            if line.strip() and (quote := _parse_or_skip(line, on_error)) is not None:
+                yield quote
+    finally:
+        writer.close()
+
+
+def open_feed(url, on_error=None):
+    # replay:///path/quotes.jsonl?speed=10 or tcp://host:port
+    parsed = urlparse(url)
+    if parsed.scheme == "replay":
+        speed = float(parse_qs(parsed.query).get("speed", ["1"])[0])
+        return replay_feed(parsed.netloc + parsed.path, speed, on_error)
+    if parsed.scheme == "tcp":
+        return socket_feed(parsed.hostname, parsed.port, on_error)
+    raise ValueError(f"Unsupported quote feed '{url}', expected replay:// or tcp://")
+
+
+class StreamingPricer:
+    def __init__(self, portfolio, spot, sigma, r, q=0.0, max_rate=DEFAULT_MAX_RATE, on_update=None):
+        self.portfolio = portfolio
+        self.spot = {name: float(spot[name] if isinstance(spot, dict) else spot) for name in portfolio.underlyings}
+        self.sigma, self.r, self.q = sigma, r, q
+        self.min_interval = 1.0 / max_rate
+        self.on_update = on_update
+        self._codes = {name: code for code, name in enumerate(portfolio.underlyings)}
+        self._position = portfolio.evaluate(self.spot, sigma, r, q)
+        self._pending = {}
+        self._first_tick = None
+        self._flush_handle = None
+        self._last_flush = -np.inf
+        self.latest = self._snapshot(0, (), 0, 0, 0.0)
+
+    def on_quote(self, quote):
+        # runs on the event loop; a burst of ticks for one underlying collapses into its latest price
+        if quote.symbol not in self._codes:
+            return
+        loop = asyncio.get_running_loop()
+        if not self._pending:
+            self._first_tick = loop.time()
+        ticks, _ = self._pending.get(quote.symbol, (0, None))
+        self._pending[quote.symbol] = (ticks + 1, quote.price)
+        if self._flush_handle is None:
+            # repricing waits out the rest of the refresh interval, so at most max_rate updates go out per second
+            delay = max(self._last_flush + self.min_interval - loop.time(), 0.0)
+            self._flush_handle = loop.call_later(delay, self.flush)
+
+    def flush(self):
+        self._flush_handle = None
+        if not self._pending:
+            return None
+        pending, self._pending = self._pending, {}
+        for symbol, (_, price) in pending.items():
+            self.spot[symbol] = price
+
+        # only legs on an underlying that moved are repriced; the rest of the book keeps its last values
+        moved = np.array([self._codes[symbol] for symbol in pending])
+        indices = np.flatnonzero(np.isin(self.portfolio.legs["underlying"], moved))
+        repriced = self.portfolio.evaluate(self.spot, self.sigma, self.r, self.q, indices=indices)
+        for name, values in repriced.items():
+            self._position[name][indices] = values
+
+        loop = asyncio.get_running_loop()
+        self._last_flush = loop.time()
+        update = self._snapshot(
+            self.latest.sequence + 1,
+            tuple(pending),
+            indices.size,
+            sum(count for count, _ in pending.values()),
+            self._last_flush - self._first_tick,
+        )
+        self.latest = update
+        if self.on_update is not None:
+            self.on_update(update)
+        return update
+
+    async def run(self, feed):
+        async for quote in feed:
+            self.on_quote(quote)
+        if self._flush_handle is not None:
+            # the last burst still waits for its refresh slot
+            self._flush_handle.cancel()
+            await asyncio.sleep(max(self._last_flush + self.min_interval - asyncio.get_running_loop().time(), 0.0))
+            self.flush()
+        return self.latest
+
+    def _snapshot(self, sequence, symbols, repriced, ticks, latency):
+        # copies, so a reader on another thread never sees a half-written update
+        position = {name: values.copy() for name, values in self._position.items()}
+        totals = {name: float(values.sum()) for name, values in position.items()}
+        return StreamUpdate(sequence, symbols, dict(self.spot), position, totals, repriced, ticks, latency)
+
+
+class QuoteStream:
+    # one feed per process on a background event loop, fanned out to every subscribed pricer
+    def __init__(self, url, reconnect_delay=RECONNECT_DELAY):
+        self.url = url
+        self.reconnect_delay = reconnect_delay
+        self.quotes = {}
+        self.errors = 0
+        self.rejected = 0
+        self._subscribers = weakref.WeakSet()
+        self._subscribers_lock = threading.Lock()
+        self._loop = None
+        self._ready = threading.Event()
+        self._stop = None
+        self._thread = None
+
+    def start(self):
+        # also restarts a stream whose thread has ended, e.g. a finished replay or a feed that failed
+        if self._thread is None or not self._thread.is_alive():
+            self._ready.clear()
+            self._thread = threading.Thread(target=asyncio.run, args=(self._run(),), name="quote-stream", daemon=True)
+            self._thread.start()
+            self._ready.wait()
+        return self
+
+    def stop(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._stop.set)
+            self._thread.join()
+
+    def subscribe(self, pricer):
+        # pricers are held weakly, so one dropped with its session stops receiving quotes; the set outlives the
+        # loop, so a subscription made while the stream restarts still gets the new feed
+        with self._subscribers_lock:
+            self._subscribers.add(pricer)
+        return pricer
+
+    def unsubscribe(self, pricer):
+        with self._subscribers_lock:
+            self._subscribers.discard(pricer)
+
+    def _subscribed(self):
+        with self._subscribers_lock:
+            return list(self._subscribers)
+
+    async def _run(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        self._ready.set()
+        consume = asyncio.create_task(self._consume())
+        stop = asyncio.create_task(self._stop.wait())
+        # the thread ends with the feed, so start() can tell a dead stream from a live one
+        await asyncio.wait((consume, stop), return_when=asyncio.FIRST_COMPLETED)
+        stop.cancel()
+        consume.cancel()
+        if consume.done() and not consume.cancelled() and consume.exception() is not None:
+            print(f"Quote feed stopped: {consume.exception()!r}")
+        # publish what is pending now, so no pricer is left waiting on a timer from this loop
+        for pricer in self._subscribed():
+            pricer.flush()
+
+    def _reject(self, error):
+        self.rejected += 1
+
+    async def _consume(self):
+        replay = urlparse(self.url).scheme == "replay"
+        while True:
+            try:
+                async for quote in open_feed(self.url, on_error=self._reject):
+                    self.quotes[quote.symbol] = quote
+                    for pricer in self._subscribed():
+                        pricer.on_quote(quote)
+                if replay:
+                    return
+                # the gateway hung up cleanly, e.g. on a restart; a live feed has no natural end
+                self.errors += 1
+                print("Quote feed closed, reconnecting")
+            except ValueError as e:
+                # bad records are skipped by the feed, so this is a bad URL and reconnecting will not fix it
+                self.errors += 1
+                print(f"Quote feed stopped: {e}")
+                return
+            except OSError as e:
+                self.errors += 1
+                print(f"Quote feed error, reconnecting: {e}")
+            await asyncio.sleep(self.reconnect_delay)
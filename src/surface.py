@@ -0,0 +1,107 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from src.black_scholes import BlackScholes, PricingResult
+from src.grid_cache import GridStats
+from src.instrumentation import timed
+
+DEFAULT_TIME_STEPS = 128
+DAYS_PER_YEAR = 365
+FIELDS = tuple(PricingResult.__dataclass_fields__)[:10]
+
+
+def _expiry_values(s_axis, k):
+    # the t -> 0 limits: payoff, a step in delta and no time value left for the other Greeks
+    itm = np.where(s_axis > k, 1.0, np.where(s_axis == k, 0.5, 0.0))
+    zeros = np.zeros_like(s_axis)
+    values = dict.fromkeys(FIELDS, zeros)
+    values |= {
+        "call": np.maximum(s_axis - k, 0.0),
+        "put": np.maximum(k - s_axis, 0.0),
+        "delta_call": itm,
+        "delta_put": itm - 1.0,
+    }
+    return values
+
+
+class TimeSurface:
+    # prices and Greeks over (time to expiry, spot), rows from expiry up to the full maturity; rows are spaced
+    # evenly in sqrt(t), which packs them towards expiry where time value decays fastest
+    def __init__(self, s_axis, maturity, values):
+        self.s_axis = s_axis
+        self.maturity = maturity
+        self.steps = next(iter(values.values())).shape[0] - 1
+        self.t_axis = maturity * (np.arange(self.steps + 1) / self.steps) ** 2
+        self.values = values
+
+    @classmethod
+    def build(cls, s_axis, k, t, r, sigma, q=0.0, steps=DEFAULT_TIME_STEPS):
+        s_axis = np.asarray(s_axis, dtype=float)
+        t_axis = t * (np.arange(1, steps + 1) / steps)[:, np.newaxis] ** 2
+        # every row after expiry in one vectorized pass
+        result = BlackScholes(s_axis[np.newaxis, :], k, t_axis, r, sigma, q).calculate_all()
+        expiry = _expiry_values(s_axis, k)
+        values = {}
+        for name in FIELDS:
+            values[name] = np.vstack((expiry[name], getattr(result, name)))
+            # surfaces are shared between callers, so hand them out read-only
+            values[name].flags.writeable = False
+        return cls(s_axis, float(t), values)
+
+    @property
+    def size(self):
+        return self.t_axis.size * self.s_axis.size
+
+    def at(self, remaining, field=None):
+        # curves for any time to expiry in [0, maturity], interpolated linearly in sqrt(t) between stored rows;
+        # an array of times gives one row per time, e.g. the frames of a decay animation
+        remaining = np.clip(np.asarray(remaining, dtype=float), 0.0, self.maturity)
+        position = np.sqrt(remaining / self.maturity) * self.steps if self.maturity > 0 else np.zeros_like(remaining)
+        lower = np.minimum(np.floor(position).astype(int), self.steps - 1)
+        weight = (position - lower)[..., np.newaxis]
+
+        def interpolate(values):
+            return values[lower] * (1 - weight) + values[lower + 1] * weight
+
+        if field is not None:
+            return interpolate(self.values[field])
+        return {name: interpolate(values) for name, values in self.values.items()}
+
+    def pnl(self, remaining, option_type, purchase_price):
+        return self.at(remaining, option_type) - purchase_price
+
+
+class SurfaceCache:
+    def __init__(self, max_entries=16, steps=DEFAULT_TIME_STEPS):
+        self.max_entries = max_entries
+        self.steps = steps
+        self.stats = GridStats()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @timed("surface.cache")
+    def get(self, s_axis, k, t, r, sigma, q=0.0):
+        s_axis = np.asarray(s_axis, dtype=float)
+        key = (float(s_axis[0]), float(s_axis[-1]), s_axis.size, float(k), float(t), float(r), float(sigma), float(q))
+        with self._lock:
+            surface = self._entries.get(key)
+            if surface is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return surface
+
+        surface = TimeSurface.build(s_axis, k, t, r, sigma, q, self.steps)
+        with self._lock:
+            self.stats.misses += 1
+            self.stats.cells_computed += surface.size
+            self._entries[key] = surface
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+        return surface
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -1,13 +1,90 @@
 import numpy as np
 import plotly.graph_objects as go
 
+from src.instrumentation import timed
 
-def create_heatmap(s_range, sigma_range, pnl, option_prices, title):
+# shared by every lean figure; replaces plotly's default template, which is serialized into each payload
+LEAN_TEMPLATE = go.layout.Template(
+    layout={
+        "height": 500,
+        "width": 700,
+        "dragmode": "pan",
+        "xaxis": {"fixedrange": True},
+        "yaxis": {"fixedrange": True},
+    }
+)
+
+
+def lttb_downsample(x, y, n_out):
+    # largest-triangle-three-buckets: keeps the points that preserve the visual shape of the line
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    n = x.size
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    # the third triangle vertex is the mean of the following bucket (the last point for the final bucket)
+    counts = np.diff(np.append(edges, n))
+    mean_x = np.add.reduceat(x[1:], edges - 1) / counts
+    mean_y = np.add.reduceat(y[1:], edges - 1) / counts
+
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        px, py = x[previous], y[previous]
+        area = np.abs((px - mean_x[i + 1]) * (y[start:end] - py) - (px - x[start:end]) * (mean_y[i + 1] - py))
+        previous = start + int(area.argmax())
+        selected[i + 1] = previous
+    return selected
+
+
+def _axis(values, name):
+    # uniform axes are sent as start and step instead of one value per point
+    values = np.asarray(values, dtype=float)
+    step = np.diff(values)
+    if values.size > 1 and np.allclose(step, step[0]):
+        return {f"{name}0": float(values[0]), f"d{name}": float(step[0])}
+    return {name: values.astype(np.float32)}
+
+
+def _line_data(s_range, values, max_points):
+    s_range, values = np.asarray(s_range, dtype=float), np.asarray(values, dtype=float)
+    if max_points is not None:
+        keep = lttb_downsample(s_range, values, max_points)
+        s_range, values = s_range[keep], values[keep]
+    return s_range, values
+
+
+def _apply_layout(fig, title, xaxis_title, yaxis_title, lean):
+    if lean:
+        fig.update_layout(template=LEAN_TEMPLATE, title=title, xaxis_title=xaxis_title, yaxis_title=yaxis_title)
+        return
+    fig.update_layout(
+        title=title,
+        xaxis_title=xaxis_title,
+        yaxis_title=yaxis_title,
+        height=500,
+        width=700,
+        dragmode="pan",
+        xaxis={"fixedrange": True},
+        yaxis={"fixedrange": True},
+    )
+
+
+@timed("figure.heatmap")
+def create_heatmap(s_range, sigma_range, pnl, option_prices, title, lean=False):
+    if lean:
+        axes = _axis(s_range, "x") | _axis(sigma_range, "y")
+        pnl = np.asarray(pnl, dtype=np.float32)
+        option_prices = np.asarray(option_prices, dtype=np.float32)
+    else:
+        axes = {"x": s_range, "y": sigma_range}
     fig = go.Figure(
         data=go.Heatmap(
             z=pnl,
-            x=s_range,
-            y=sigma_range,
+            **axes,
             colorscale="RdYlGn",
             zmid=0,
             hovertemplate=(
@@ -17,80 +94,122 @@ def create_heatmap(s_range, sigma_range, pnl, option_prices, title):
             customdata=option_prices,
         )
     )
-    fig.update_layout(
-        title=title,
-        xaxis_title="Stock Price",
-        yaxis_title="Volatility",
-        height=500,
-        width=700,
-        dragmode="pan",
-        xaxis={"fixedrange": True},
-        yaxis={"fixedrange": True},
-    )
+    _apply_layout(fig, title, "Stock Price", "Volatility", lean)
     return fig
 
 
-def create_profit_loss_chart(s_range, pnl, break_even, title):
+def _split_at_zero(x, y):
+    # the curve as a profit part and a loss part that only meet on the axis: zero crossings are added to both,
+    # and a run of points on the other side becomes a single NaN gap
+    crossing = np.flatnonzero(np.sign(y[:-1]) * np.sign(y[1:]) < 0)
+    dx, dy = x[crossing + 1] - x[crossing], y[crossing + 1] - y[crossing]
+    x = np.insert(x, crossing + 1, x[crossing] - y[crossing] * dx / dy)
+    y = np.insert(y, crossing + 1, 0.0)
+    parts = []
+    for side in (y >= 0, y <= 0):
+        keep = side | np.append(True, side[:-1])
+        parts.append((np.where(side, x, np.nan)[keep], np.where(side, y, np.nan)[keep]))
+    return parts
+
+
+def _break_even_marker(scatter, break_even):
+    return scatter(
+        x=[break_even],
+        y=[0],
+        mode="markers",
+        name="Break-even",
+        marker={"color": "red", "size": 10},
+        hovertemplate="Break-even Price: $%{x:.2f}<extra></extra>",
+    )
+
+
+@timed("figure.profit_loss")
+def create_profit_loss_chart(s_range, pnl, break_even, title, lean=False, max_points=None, curves=None):
     fig = go.Figure()
-    fig.add_trace(
-        go.Scatter(
-            x=s_range,
-            y=pnl,
-            mode="lines",
-            name="P&L",
-            line={"color": "blue"},
-            hovertemplate="Stock Price: $%{x:.2f}<br>P&L: $%{y:.2f}<extra></extra>",
+    if lean:
+        # one line drawn as two halves that each carry their own fill, instead of a line plus two filled copies
+        scatter = go.Scattergl
+        x, values = _line_data(s_range, pnl, max_points)
+        for (part_x, part_y), name, fillcolor in zip(
+            _split_at_zero(x, values), ("Profit", "Loss"), ("rgba(0,255,0,0.2)", "rgba(255,0,0,0.2)"), strict=True
+        ):
+            fig.add_trace(
+                scatter(
+                    x=part_x.astype(np.float32),
+                    y=part_y.astype(np.float32),
+                    mode="lines",
+                    name=name,
+                    legendgroup="P&L",
+                    line={"color": "blue"},
+                    fill="tozeroy",
+                    fillcolor=fillcolor,
+                    hovertemplate="Stock Price: $%{x:.2f}<br>P&L: $%{y:.2f}<extra></extra>",
+                )
+            )
+        fig.add_trace(_break_even_marker(scatter, break_even))
+        _apply_layout(fig, title, "Stock Price", "Profit/Loss", lean)
+    else:
+        scatter = go.Scatter
+        fig.add_trace(
+            scatter(
+                x=s_range,
+                y=pnl,
+                mode="lines",
+                name="P&L",
+                line={"color": "blue"},
+                hovertemplate="Stock Price: $%{x:.2f}<br>P&L: $%{y:.2f}<extra></extra>",
+            )
         )
-    )
-    fig.add_trace(
-        go.Scatter(
-            x=[break_even],
-            y=[0],
-            mode="markers",
-            name="Break-even",
-            marker={"color": "red", "size": 10},
-            hovertemplate="Break-even Price: $%{x:.2f}<extra></extra>",
+        fig.add_trace(_break_even_marker(scatter, break_even))
+        _apply_layout(fig, title, "Stock Price", "Profit/Loss", lean)
+
+        fig.add_traces(
+            [
+                scatter(
+                    x=s_range,
+                    y=np.maximum(pnl, 0),
+                    fill="tozeroy",
+                    fillcolor="rgba(0,255,0,0.2)",
+                    line={"width": 0},
+                    showlegend=False,
+                    name="Profit",
+                    hoverinfo="skip",
+                ),
+                scatter(
+                    x=s_range,
+                    y=np.minimum(pnl, 0),
+                    fill="tozeroy",
+                    fillcolor="rgba(255,0,0,0.2)",
+                    line={"width": 0},
+                    showlegend=False,
+                    name="Loss",
+                    hoverinfo="skip",
+                ),
+            ]
         )
-    )
-    fig.update_layout(
-        title=title,
-        xaxis_title="Stock Price",
-        yaxis_title="Profit/Loss",
-        height=500,
-        width=700,
-        dragmode="pan",
-        xaxis={"fixedrange": True},
-        yaxis={"fixedrange": True},
-    )
 
-    fig.add_traces(
-        [
-            go.Scatter(
-                x=s_range,
-                y=np.maximum(pnl, 0),
-                fill="tozeroy",
-                fillcolor="rgba(0,255,0,0.2)",
-                line={"width": 0},
-                showlegend=False,
-                name="Profit",
-                hoverinfo="skip",
-            ),
-            go.Scatter(
-                x=s_range,
-                y=np.minimum(pnl, 0),
-                fill="tozeroy",
-                fillcolor="rgba(255,0,0,0.2)",
-                line={"width": 0},
-                showlegend=False,
-                name="Loss",
-                hoverinfo="skip",
-            ),
-        ]
-    )
+    # reference P&L curves at other times to expiry, drawn as dashed lines over the main one
+    for name, values in (curves or {}).items():
+        if lean:
+            curve_x, values = _line_data(s_range, values, max_points)
+            curve_x, values = _axis(curve_x, "x"), values.astype(np.float32)
+        else:
+            curve_x = {"x": s_range}
+        fig.add_trace(
+            scatter(
+                **curve_x,
+                y=values,
+                mode="lines",
+                name=name,
+                line={"dash": "dash", "width": 1},
+                hovertemplate=f"{name}<br>Stock Price: $%{{x:.2f}}<br>P&L: $%{{y:.2f}}<extra></extra>",
+            )
+        )
     return fig
 
 
-def create_greeks_plot(s_range, greeks, title):
+@timed("figure.greeks")
+def create_greeks_plot(s_range, greeks, title, lean=False, max_points=None):
     fig = go.Figure()
     greek_names = {
         "delta_call": "Delta",
@@ -103,23 +222,19 @@ def create_greeks_plot(s_range, greeks, title):
         "rho_put": "Rho",
     }
     for greek, values in greeks.items():
+        if lean:
+            x, values = _line_data(s_range, values, max_points)
+            scatter, x, values = go.Scattergl, _axis(x, "x"), values.astype(np.float32)
+        else:
+            scatter, x = go.Scatter, {"x": s_range}
         fig.add_trace(
-            go.Scatter(
-                x=s_range,
+            scatter(
+                **x,
                 y=values,
                 mode="lines",
                 name=greek_names[greek],
                 hovertemplate=f"{greek_names[greek]}: %{{y:.4f}}<br>Stock Price: $%{{x:.2f}}<extra></extra>",
             )
         )
-    fig.update_layout(
-        title=title,
-        xaxis_title="Stock Price",
-        yaxis_title="Greek Value",
-        height=500,
-        width=700,
-        dragmode="pan",
-        xaxis={"fixedrange": True},
-        yaxis={"fixedrange": True},
-    )
+    _apply_layout(fig, title, "Stock Price", "Greek Value", lean)
     return fig
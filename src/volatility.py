@@ -0,0 +1,306 @@
+import copy
+import threading
+from typing import NamedTuple
+
+import numpy as np
+
+TRADING_DAYS = 252
+DEFAULT_WINDOW = 21
+# RiskMetrics decay for daily data
+EWMA_LAMBDA = 0.94
+GARCH_MIN_OBSERVATIONS = 100
+# GARCH parameters move slowly, so they are refitted about once a month of new bars
+GARCH_REFIT_BARS = 21
+RANGE_METHODS = ("parkinson", "garman-klass")
+
+
+class GarchParams(NamedTuple):
+    omega: float
+    alpha: float
+    beta: float
+
+    @property
+    def persistence(self):
+        return self.alpha + self.beta
+
+    @property
+    def long_run_variance(self):
+        return self.omega / (1 - self.persistence)
+
+
+def log_returns(close):
+    return np.diff(np.log(np.asarray(close, dtype=float)))
+
+
+def _annualize(variance, periods):
+    return np.sqrt(np.maximum(variance, 0.0) * periods)
+
+
+def _rolling_mean(values, window):
+    # running sums, so each window costs the same however long it is
+    values = np.asarray(values, dtype=float)
+    means = np.full(values.shape, np.nan)
+    if window <= values.size:
+        sums = np.cumsum(np.concatenate(([0.0], values)))
+        means[window - 1 :] = (sums[window:] - sums[:-window]) / window
+    return means
+
+
+def _check_range_method(method):
+    if method not in RANGE_METHODS:
+        raise ValueError(f"Unknown range estimator '{method}', expected one of {RANGE_METHODS}")
+
+
+def _range_variance(bars, method):
+    _check_range_method(method)
+    log_hl = np.log(np.asarray(bars["high"], dtype=float) / np.asarray(bars["low"], dtype=float))
+    if method == "parkinson":
+        return log_hl**2 / (4 * np.log(2))
+    log_co = np.log(np.asarray(bars["close"], dtype=float) / np.asarray(bars["open"], dtype=float))
+    return 0.5 * log_hl**2 - (2 * np.log(2) - 1) * log_co**2
+
+
+def _ewma_variance(squared, lam, initial):
+    from scipy.signal import lfilter
+
+    # v[t] = lam * v[t-1] + (1 - lam) * r[t]^2, run as a first-order linear filter
+    return lfilter([1 - lam], [1, -lam], squared, zi=[lam * initial])[0]
+
+
+def garch_variance(returns, params, initial=None):
+    from scipy.signal import lfilter
+
+    # h[t] = omega + alpha * r[t]^2 + beta * h[t-1], the variance forecast for the period after r[t]
+    initial = params.long_run_variance if initial is None else initial
+    inputs = params.omega + params.alpha * np.asarray(returns, dtype=float) ** 2
+    return lfilter([1.0], [1.0, -params.beta], inputs, zi=[params.beta * initial])[0]
+
+
+def rolling_volatility(close, window=DEFAULT_WINDOW, periods=TRADING_DAYS):
+    returns = log_returns(close)
+    mean, mean_square = _rolling_mean(returns, window), _rolling_mean(returns**2, window)
+    return _annualize((mean_square - mean**2) * window / (window - 1), periods)
+
+
+def ewma_volatility(close, lam=EWMA_LAMBDA, initial=None, periods=TRADING_DAYS):
+    squared = log_returns(close) ** 2
+    if not squared.size:
+        return squared
+    initial = squared[:DEFAULT_WINDOW].mean() if initial is None else initial
+    return _annualize(_ewma_variance(squared, lam, initial), periods)
+
+
+def range_volatility(bars, window=DEFAULT_WINDOW, method="parkinson", periods=TRADING_DAYS):
+    return _annualize(_rolling_mean(_range_variance(bars, method), window), periods)
+
+
+def fit_garch(returns):
+    from scipy.optimize import minimize
+
+    returns = np.asarray(returns, dtype=float)
+    sample_variance = returns.var()
+    # alpha and beta are scale-free, so fit on standardized returns; omega follows from variance targeting
+    standardized = (returns - returns.mean()) / np.sqrt(sample_variance)
+    squared = standardized**2
+
+    def negative_log_likelihood(x):
+        params = GarchParams(1 - x[0] - x[1], x[0], x[1])
+        variance = np.concatenate(([1.0], garch_variance(standardized[:-1], params, 1.0)))
+        return 0.5 * np.sum(np.log(variance) + squared / variance)
+
+    result = minimize(
+        negative_log_likelihood,
+        x0=[0.05, 0.9],
+        method="SLSQP",
+        bounds=[(1e-6, 1.0), (0.0, 1.0)],
+        constraints=[{"type": "ineq", "fun": lambda x: 0.999 - x[0] - x[1]}],
+    )
+    alpha, beta = (float(v) for v in result.x)
+    return GarchParams(float(sample_variance) * (1 - alpha - beta), alpha, beta)
+
+
+class _Window:
+    # ring buffer with running sums: pushing k rows costs O(k) and the window is never summed again
+    def __init__(self, size, columns):
+        self.size = size
+        self.values = np.zeros((size, columns))
+        self.sums = np.zeros(columns)
+        self.count = 0
+        self.position = 0
+
+    def push(self, rows):
+        rows = rows[-self.size :]
+        slots = (self.position + np.arange(len(rows))) % self.size
+        if len(rows) == self.size:
+            self.sums = rows.sum(axis=0)
+        else:
+            self.sums += rows.sum(axis=0) - self.values[slots].sum(axis=0)
+        self.values[slots] = rows
+        self.position = (self.position + len(rows)) % self.size
+        self.count = min(self.count + len(rows), self.size)
+
+    def mean(self):
+        return self.sums / self.size if self.count == self.size else np.full(self.sums.shape, np.nan)
+
+
+class _Estimator:
+    def __init__(self, periods):
+        self.periods = periods
+        self.variance = np.nan
+        self.last_close = None
+
+    @property
+    def value(self):
+        return float(_annualize(self.variance, self.periods))
+
+    def update(self, bars):
+        # takes one bar or a batch of BAR_DTYPE records; returns are measured from the last close already seen
+        bars = np.atleast_1d(bars)
+        close = np.asarray(bars["close"], dtype=float)
+        if not close.size:
+            return self.value
+        previous = close[:1] if self.last_close is None else [self.last_close]
+        returns = np.diff(np.log(np.concatenate((previous, close))))
+        if self.last_close is None:
+            returns = returns[1:]
+        self.last_close = float(close[-1])
+        self._update(bars, returns)
+        return self.value
+
+
+class RollingVolatility(_Estimator):
+    def __init__(self, window=DEFAULT_WINDOW, periods=TRADING_DAYS):
+        super().__init__(periods)
+        self.window = _Window(window, 2)
+
+    def _update(self, bars, returns):
+        if returns.size:
+            self.window.push(np.column_stack((returns, returns**2)))
+            mean, mean_square = self.window.mean()
+            self.variance = (mean_square - mean**2) * self.window.size / (self.window.size - 1)
+
+
+class EwmaVolatility(_Estimator):
+    def __init__(self, lam=EWMA_LAMBDA, periods=TRADING_DAYS):
+        super().__init__(periods)
+        self.lam = lam
+
+    def _update(self, bars, returns):
+        if returns.size:
+            squared = returns**2
+            initial = squared[:DEFAULT_WINDOW].mean() if np.isnan(self.variance) else self.variance
+            self.variance = float(_ewma_variance(squared, self.lam, initial)[-1])
+
+
+class RangeVolatility(_Estimator):
+    def __init__(self, window=DEFAULT_WINDOW, method="parkinson", periods=TRADING_DAYS):
+        super().__init__(periods)
+        _check_range_method(method)
+        self.method = method
+        self.window = _Window(window, 1)
+
+    def _update(self, bars, returns):
+        self.window.push(_range_variance(bars, self.method)[:, np.newaxis])
+        self.variance = float(self.window.mean()[0])
+
+
+class GarchVolatility(_Estimator):
+    def __init__(self, params, periods=TRADING_DAYS):
+        super().__init__(periods)
+        self.params = params
+
+    @classmethod
+    def fit(cls, bars, periods=TRADING_DAYS):
+        estimator = cls(fit_garch(log_returns(bars["close"])), periods)
+        estimator.update(bars)
+        return estimator
+
+    def _update(self, bars, returns):
+        if returns.size:
+            initial = None if np.isnan(self.variance) else self.variance
+            self.variance = float(garch_variance(returns, self.params, initial)[-1])
+
+    def forecast(self, periods_ahead):
+        # mean variance over the horizon: forecasts decay geometrically towards the long-run variance
+        long_run, persistence = self.params.long_run_variance, self.params.persistence
+        horizon = np.maximum(np.asarray(periods_ahead, dtype=float), 1.0)
+        decay = (1 - persistence**horizon) / ((1 - persistence) * horizon)
+        return _annualize(long_run + (self.variance - long_run) * decay, self.periods)
+
+
+def estimate_volatility(bars, window=DEFAULT_WINDOW, periods=TRADING_DAYS):
+    # latest annualized estimate from each estimator that has enough bars
+    n_returns = len(bars) - 1
+    if n_returns < 2:
+        return {}
+    window = min(window, n_returns)
+    estimates = {
+        "close-to-close": rolling_volatility(bars["close"], window, periods)[-1],
+        "ewma": ewma_volatility(bars["close"], periods=periods)[-1],
+    }
+    # close-only history has no intraday range to estimate from
+    if np.any(bars["high"] > bars["low"]):
+        for method in RANGE_METHODS:
+            estimates[method] = range_volatility(bars, window, method, periods)[-1]
+    if n_returns >= GARCH_MIN_OBSERVATIONS:
+        estimates["garch"] = GarchVolatility.fit(bars, periods).value
+    return {name: float(value) for name, value in estimates.items()}
+
+
+class VolatilityTracker:
+    # every estimator's state for one price series, so a refresh only feeds the bars appended since the last one
+    def __init__(self, window=DEFAULT_WINDOW, periods=TRADING_DAYS):
+        self.window = window
+        self.periods = periods
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.estimators = {"close-to-close": RollingVolatility(self.window, self.periods)}
+        self.estimators["ewma"] = EwmaVolatility(periods=self.periods)
+        self.estimators |= {method: RangeVolatility(self.window, method, self.periods) for method in RANGE_METHODS}
+        self.garch = None
+        self.has_range = False
+        self.seen = 0
+        self.last_time = None
+        self.bars_since_fit = 0
+
+    def follows(self, bars):
+        return self.seen <= len(bars) and (self.seen == 0 or bars["time"][self.seen - 1] == self.last_time)
+
+    def update(self, bars):
+        # `bars` is the whole settled series; a series that no longer extends what was seen is replayed from scratch
+        if not self.follows(bars):
+            self.reset()
+        new = bars[self.seen :]
+        if not len(new):
+            return
+        for estimator in self.estimators.values():
+            estimator.update(new)
+        self.has_range |= bool(np.any(new["high"] > new["low"]))
+        self.seen, self.last_time = len(bars), bars["time"][-1]
+
+        self.bars_since_fit += len(new)
+        if self.garch is not None and self.bars_since_fit < GARCH_REFIT_BARS:
+            self.garch.update(new)
+        elif len(bars) - 1 >= GARCH_MIN_OBSERVATIONS:
+            self.garch = GarchVolatility.fit(bars, self.periods)
+            self.bars_since_fit = 0
+
+    def estimates(self, pending=()):
+        # `pending` bars (e.g. today's, still being revised) are applied to copies, leaving the settled state alone
+        estimators = dict(self.estimators)
+        if self.garch is not None:
+            estimators["garch"] = self.garch
+        has_range = self.has_range
+        if len(pending):
+            estimators = copy.deepcopy(estimators)
+            for estimator in estimators.values():
+                estimator.update(pending)
+            has_range |= bool(np.any(pending["high"] > pending["low"]))
+        if not has_range:
+            # close-only history has no intraday range to estimate from
+            for method in RANGE_METHODS:
+                estimators.pop(method)
+        values = {name: estimator.value for name, estimator in estimators.items()}
+        return {name: value for name, value in values.items() if np.isfinite(value)}
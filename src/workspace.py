@@ -0,0 +1,135 @@
+import math
+
+import numpy as np
+
+from src.black_scholes import PricingResult
+from src.instrumentation import count
+
+# 4096 contracts x 8 bytes x ~30 live blocks (scratch plus iterator buffers) stays around 1 MB, inside L2
+DEFAULT_BLOCK_SIZE = 4096
+PRECISIONS = {"float64": np.float64, "float32": np.float32}
+
+# float32 results stay within |x32 - x64| <= RELATIVE * |x64| + SCALED * max|x64| of the float64 path, where the
+# max runs over the batch for each output (see tests/test_workspace.py); a price on a 100 spot is good to ~5e-4
+FLOAT32_RELATIVE_TOLERANCE = 5e-5
+FLOAT32_SCALED_TOLERANCE = 5e-6
+
+OUTPUTS = tuple(PricingResult.__dataclass_fields__)[:10]
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+_SCRATCH = 15
+
+
+class PricingWorkspace:
+    # first-order prices and Greeks computed block by block with in-place ufuncs, so peak memory is the outputs
+    # plus a fixed set of block-sized scratch rows instead of a full-size temporary per sub-expression
+    def __init__(self, precision="float64", block_size=DEFAULT_BLOCK_SIZE):
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision '{precision}', expected one of {tuple(PRECISIONS)}")
+        self.dtype = np.dtype(PRECISIONS[precision])
+        self.block_size = block_size
+        self._scratch = np.empty((_SCRATCH, block_size), dtype=self.dtype)
+
+    def calculate_all(self, s, k, t, r, sigma, q=0.0, out=None):
+        from scipy.special import ndtr
+
+        inputs = [np.asarray(v) for v in (s, k, t, r, sigma, q)]
+        outputs = [None] * len(OUTPUTS) if out is None else [getattr(out, name) for name in OUTPUTS]
+        iterator = np.nditer(
+            inputs + outputs,
+            flags=["external_loop", "buffered", "zerosize_ok"],
+            op_flags=[["readonly"]] * len(inputs) + [["writeonly", "allocate", "no_broadcast"]] * len(outputs),
+            op_dtypes=[self.dtype] * (len(inputs) + len(outputs)),
+            casting="same_kind",
+            buffersize=self.block_size,
+        )
+        count("workspace.calculate_all", iterator.itersize)
+        with iterator:
+            for s, k, t, r, sigma, q, *result in iterator:
+                self._block(ndtr, s, k, t, r, sigma, q, dict(zip(OUTPUTS, result, strict=True)))
+            operands = iterator.operands[len(inputs) :]
+        if out is not None:
+            return out
+        return PricingResult(**dict(zip(OUTPUTS, operands, strict=True)))
+
+    def calculate_option_price(self, s, k, t, r, sigma, q=0.0, option_type="call"):
+        result = self.calculate_all(s, k, t, r, sigma, q)
+        return result.call if option_type == "call" else result.put
+
+    def _block(self, ndtr, s, k, t, r, sigma, q, out):
+        n = s.shape[0]
+        sqrt_t, sigma_sqrt_t, d1, d2, q_disc, k_disc, s_disc, nd1, nd2, n_neg_d1, n_neg_d2, pdf_d1, s_disc_pdf = (
+            self._scratch[:13, :n]
+        )
+        tmp, tmp2 = self._scratch[13:, :n]
+
+        np.sqrt(t, out=sqrt_t)
+        np.multiply(sigma, sqrt_t, out=sigma_sqrt_t)
+        # d1 = (log(s / k) + (r - q + sigma^2 / 2) t) / (sigma sqrt(t))
+        np.divide(s, k, out=d1)
+        np.log(d1, out=d1)
+        np.multiply(sigma, sigma, out=tmp)
+        tmp *= 0.5
+        tmp += r
+        tmp -= q
+        tmp *= t
+        d1 += tmp
+        d1 /= sigma_sqrt_t
+        np.subtract(d1, sigma_sqrt_t, out=d2)
+
+        np.multiply(q, t, out=q_disc)
+        np.negative(q_disc, out=q_disc)
+        np.exp(q_disc, out=q_disc)
+        np.multiply(r, t, out=k_disc)
+        np.negative(k_disc, out=k_disc)
+        np.exp(k_disc, out=k_disc)
+        k_disc *= k
+        np.multiply(s, q_disc, out=s_disc)
+
+        # the negated tails are evaluated directly rather than as 1 - N(d), which loses them to cancellation
+        ndtr(d1, out=nd1)
+        ndtr(d2, out=nd2)
+        np.negative(d1, out=n_neg_d1)
+        ndtr(n_neg_d1, out=n_neg_d1)
+        np.negative(d2, out=n_neg_d2)
+        ndtr(n_neg_d2, out=n_neg_d2)
+        np.square(d1, out=pdf_d1)
+        pdf_d1 *= -0.5
+        np.exp(pdf_d1, out=pdf_d1)
+        pdf_d1 *= _INV_SQRT_2PI
+        np.multiply(s_disc, pdf_d1, out=s_disc_pdf)
+
+        np.multiply(s_disc, nd1, out=out["call"])
+        np.multiply(k_disc, nd2, out=tmp)
+        out["call"] -= tmp
+        np.multiply(k_disc, n_neg_d2, out=out["put"])
+        np.multiply(s_disc, n_neg_d1, out=tmp)
+        out["put"] -= tmp
+        np.multiply(q_disc, nd1, out=out["delta_call"])
+        np.multiply(q_disc, n_neg_d1, out=out["delta_put"])
+        np.negative(out["delta_put"], out=out["delta_put"])
+        np.multiply(s, sigma_sqrt_t, out=tmp)
+        np.multiply(q_disc, pdf_d1, out=out["gamma"])
+        out["gamma"] /= tmp
+        np.multiply(s_disc_pdf, sqrt_t, out=out["vega"])
+
+        # theta_decay = -s_disc_pdf * sigma / (2 sqrt(t)), shared by both thetas
+        np.multiply(s_disc_pdf, sigma, out=tmp)
+        tmp /= sqrt_t
+        tmp *= -0.5
+        np.multiply(r, k_disc, out=tmp2)
+        tmp2 *= nd2
+        np.subtract(tmp, tmp2, out=out["theta_call"])
+        np.multiply(q, s_disc, out=tmp2)
+        tmp2 *= nd1
+        out["theta_call"] += tmp2
+        np.multiply(r, k_disc, out=tmp2)
+        tmp2 *= n_neg_d2
+        np.add(tmp, tmp2, out=out["theta_put"])
+        np.multiply(q, s_disc, out=tmp2)
+        tmp2 *= n_neg_d1
+        out["theta_put"] -= tmp2
+
+        np.multiply(k_disc, t, out=tmp)
+        np.multiply(tmp, nd2, out=out["rho_call"])
+        np.multiply(tmp, n_neg_d2, out=out["rho_put"])
+        np.negative(out["rho_put"], out=out["rho_put"])
@@ -0,0 +1,57 @@
+import numpy as np
+
+# maturity in years of the instrument behind each series
+SERIES_MATURITIES = {
+    "DTB4WK": 28 / 365,
+    "DTB3": 0.25,
+    "DTB6": 0.5,
+    "DGS1": 1.0,
+    "DGS2": 2.0,
+    "DGS3": 3.0,
+    "DGS5": 5.0,
+    "DGS7": 7.0,
+    "DGS10": 10.0,
+    "DGS20": 20.0,
+    "DGS30": 30.0,
+}
+
+
+def to_continuous_rate(series_id, quoted_percent):
+    maturity = SERIES_MATURITIES[series_id]
+    quoted = quoted_percent / 100
+    if series_id.startswith("DTB"):
+        # bills are quoted as a bank discount rate on a 360-day year
+        price = 1 - quoted * maturity * 365 / 360
+        return -np.log(price) / maturity
+    # constant-maturity yields are semiannual bond-equivalent; treated as zero yields
+    return 2 * np.log1p(quoted / 2)
+
+
+class YieldCurve:
+    def __init__(self, maturities, zero_rates):
+        order = np.argsort(maturities)
+        self.maturities = np.asarray(maturities, dtype=float)[order]
+        self.zero_rates = np.asarray(zero_rates, dtype=float)[order]
+        self._interpolator = None
+        if self.maturities.size > 1:
+            from scipy.interpolate import PchipInterpolator
+
+            self._interpolator = PchipInterpolator(self.maturities, self.zero_rates)
+
+    @classmethod
+    def from_quotes(cls, quotes):
+        if not quotes:
+            raise ValueError("Cannot build a yield curve without quotes.")
+        series_ids = sorted(quotes, key=SERIES_MATURITIES.get)
+        return cls(
+            [SERIES_MATURITIES[series_id] for series_id in series_ids],
+            [to_continuous_rate(series_id, quotes[series_id]) for series_id in series_ids],
+        )
+
+    def rate(self, maturity_years):
+        t = np.clip(np.asarray(maturity_years, dtype=float), self.maturities[0], self.maturities[-1])
+        rates = self._interpolator(t) if self._interpolator is not None else np.full(t.shape, self.zero_rates[0])
+        return rates if rates.ndim else float(rates)
+
+    def discount_factor(self, maturity_years):
+        return np.exp(-self.rate(maturity_years) * np.asarray(maturity_years, dtype=float))
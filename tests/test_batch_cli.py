@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import batch_cli
+from src.batch_cli import main, run_batch
+from src.black_scholes import BlackScholes
+
+
+@pytest.fixture
+def contracts(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 1_050
+    frame = pd.DataFrame(
+        {
+            "s": rng.uniform(50, 150, n),
+            "k": rng.uniform(50, 150, n),
+            "t": rng.uniform(0.1, 2.0, n),
+            "r": rng.uniform(0.0, 0.08, n),
+            "sigma": rng.uniform(0.1, 0.6, n),
+            "q": rng.uniform(0.0, 0.03, n),
+            "option_type": rng.choice(["call", "put"], n),
+        }
+    )
+    path = tmp_path / "contracts.csv"
+    frame.to_csv(path, index=False)
+    return path, frame
+
+
+def quiet(message):
+    pass
+
+
+def test_csv_output_matches_direct_pricing(contracts, tmp_path):
+    path, frame = contracts
+    stats = run_batch(path, tmp_path / "priced.csv", chunk_rows=200, report=quiet)
+    assert (stats.rows, stats.chunks) == (1_050, 6)
+    priced = pd.read_csv(tmp_path / "priced.csv")
+    expected = BlackScholes(*(frame[c].to_numpy() for c in ("s", "k", "t", "r", "sigma", "q"))).calculate_all()
+    np.testing.assert_allclose(priced["call"], expected.call)
+    np.testing.assert_allclose(priced["vega"], expected.vega)
+    np.testing.assert_allclose(priced["price"], np.where(frame["option_type"] == "call", expected.call, expected.put))
+
+
+def test_parquet_round_trip_with_workers(contracts, tmp_path):
+    path, frame = contracts
+    parquet_input = tmp_path / "contracts.parquet"
+    frame.to_parquet(parquet_input, index=False)
+    run_batch(parquet_input, tmp_path / "priced.parquet", chunk_rows=300, workers=2, report=quiet)
+    priced = pd.read_parquet(tmp_path / "priced.parquet")
+    assert len(list((tmp_path / "priced.parquet").glob("part-*.parquet"))) == 4
+    serial = run_batch(path, tmp_path / "serial.csv", chunk_rows=300, report=quiet)
+    assert serial.rows == len(priced)
+    np.testing.assert_allclose(priced["delta_put"], pd.read_csv(tmp_path / "serial.csv")["delta_put"])
+
+
+@pytest.mark.parametrize("output_name", ["priced.csv", "priced.parquet"])
+def test_resume_continues_after_the_last_completed_chunk(contracts, tmp_path, monkeypatch, output_name):
+    path, _ = contracts
+    output = tmp_path / output_name
+    price_chunk = batch_cli.price_chunk
+    calls = []
+
+    def failing_price_chunk(frame):
+        calls.append(len(frame))
+        if len(calls) == 4:
+            raise RuntimeError("worker died")
+        return price_chunk(frame)
+
+    monkeypatch.setattr(batch_cli, "price_chunk", failing_price_chunk)
+    with pytest.raises(RuntimeError):
+        run_batch(path, output, chunk_rows=200, report=quiet)
+    monkeypatch.setattr(batch_cli, "price_chunk", price_chunk)
+
+    resumed = run_batch(path, output, chunk_rows=200, resume=True, report=quiet)
+    assert resumed.rows == 1_050 - 3 * 200
+    fresh = run_batch(path, tmp_path / f"fresh-{output_name}", chunk_rows=200, report=quiet)
+    read = pd.read_parquet if output_name.endswith(".parquet") else pd.read_csv
+    pd.testing.assert_frame_equal(read(output), read(tmp_path / f"fresh-{output_name}"))
+    assert fresh.rows == 1_050
+
+
+def test_cli_reports_missing_columns(tmp_path, capsys):
+    pd.DataFrame({"s": [100.0], "k": [100.0]}).to_csv(tmp_path / "bad.csv", index=False)
+    assert main([str(tmp_path / "bad.csv"), str(tmp_path / "out.csv"), "--workers", "1"]) == 1
+    assert "missing columns: t, r, sigma" in capsys.readouterr().err
+
+
+def test_resume_rejects_a_different_chunk_size(contracts, tmp_path):
+    path, _ = contracts
+    run_batch(path, tmp_path / "priced.csv", chunk_rows=200, report=quiet)
+    with pytest.raises(ValueError):
+        run_batch(path, tmp_path / "priced.csv", chunk_rows=100, resume=True, report=quiet)
+
+
+def test_csv_sink_without_pyarrow_writes_the_same_rows(contracts, tmp_path):
+    _, frame = contracts
+    sinks = [batch_cli.CsvSink(tmp_path / "arrow.csv"), batch_cli.CsvSink(tmp_path / "pandas.csv")]
+    sinks[1].arrow = False
+    for sink in sinks:
+        sink.write(frame.iloc[:500])
+        sink.write(frame.iloc[500:])
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "arrow.csv"), pd.read_csv(tmp_path / "pandas.csv"))
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from benchmarks import run
+
+
+def test_registry_covers_hot_paths():
+    prefixes = {name.split(".")[0] for name in run.BENCHMARKS}
+    assert prefixes == {"black_scholes", "app", "visualizations", "data", "workspace", "surface"}
+
+
+def test_time_case_scales_loops():
+    calls = []
+    result = run.time_case(lambda: calls.append(1), repeat=3, min_time=0.001)
+    assert result["loops"] > 1
+    assert 0 < result["min_s"] <= result["median_s"]
+    assert len(calls) > 3 * result["loops"]
+
+
+def test_compare_flags_regressions():
+    baseline = {"a": {"min_s": 1.0}, "b": {"min_s": 1.0}, "c": {"min_s": 1.0}}
+    results = {"a": {"min_s": 1.1}, "b": {"min_s": 1.5}, "c": {"min_s": 0.5}, "d": {"min_s": 1.0}}
+    statuses = {name: status for name, _, status in run.compare(results, baseline, threshold=0.25)}
+    assert statuses == {"a": "ok", "b": "regressed", "c": "improved", "d": "new"}
+
+
+@pytest.mark.parametrize("pattern", ["data.fetch_stock_data.*", "black_scholes.*.scalar"])
+def test_cases_run_against_mocked_upstreams(pattern):
+    results = run.run_benchmarks([pattern], repeat=1, min_time=0.0, report=lambda line: None)
+    assert results and all(result["min_s"] > 0 for result in results.values())
+
+
+def test_main_fails_on_regression(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    assert run.main(["black_scholes.price.scalar", "--baseline", str(baseline), "--save-baseline"]) == 0
+    document = json.loads(baseline.read_text())
+    assert set(document["results"]) == {"black_scholes.price.scalar"}
+
+    document["results"]["black_scholes.price.scalar"]["min_s"] = 1e-12
+    baseline.write_text(json.dumps(document))
+    assert run.main(["black_scholes.price.scalar", "--baseline", str(baseline), "--repeat", "1"]) == 1
+    assert "regressed" in capsys.readouterr().out
@@ -1,3 +1,7 @@
+import subprocess
+import sys
+
+import numpy as np
 import pytest
 
 from src.black_scholes import BlackScholes
@@ -33,3 +37,62 @@ def test_profit_loss(bs_instance):
     put_pnl = bs_instance.calculate_profit_loss("put", 10, 90)
     assert call_pnl == 0, "Call PnL should be 0 when stock price equals strike plus premium"
     assert put_pnl == 0, "Put PnL should be 0 when stock price equals strike minus premium"
+
+
+def test_batch_pricing_matches_scalar():
+    s = np.array([80.0, 100.0, 120.0])
+    sigma = np.array([0.1, 0.2, 0.3, 0.4])
+    grid = BlackScholes.grid(s, sigma, k=100, t=1, r=0.05, q=0.01)
+    assert grid.shape == (4, 3)
+
+    call_prices = grid.calculate_option_price("call")
+    put_prices = grid.calculate_option_price("put")
+    assert call_prices.shape == put_prices.shape == (4, 3)
+    for i, sig in enumerate(sigma):
+        for j, spot in enumerate(s):
+            scalar = BlackScholes(spot, 100, 1, 0.05, sig, 0.01)
+            assert call_prices[i, j] == pytest.approx(scalar.calculate_option_price("call"))
+            assert put_prices[i, j] == pytest.approx(scalar.calculate_option_price("put"))
+
+
+def test_batch_greeks_and_profit_loss_broadcast():
+    bs = BlackScholes([90, 100, 110], [95, 100, 105], 0.5, 0.03, 0.25)
+    greeks = bs.calculate_greeks()
+    assert all(np.shape(values) == (3,) for values in greeks.values())
+
+    pnl = bs.calculate_profit_loss("call", 5, np.array([100, 100, 100]))
+    np.testing.assert_allclose(pnl, [0, -5, -5])
+
+
+def test_calculate_all_matches_separate_calls(bs_instance):
+    result = bs_instance.calculate_all()
+    assert result.call == pytest.approx(bs_instance.calculate_option_price("call"))
+    assert result.put == pytest.approx(bs_instance.calculate_option_price("put"))
+    assert result.vanna is None
+    assert set(result.greeks()) == set(bs_instance.calculate_greeks())
+
+
+def test_higher_order_greeks_match_finite_differences():
+    s, k, t, r, sigma, q = 105.0, 100.0, 0.75, 0.04, 0.25, 0.02
+    h = 1e-4
+    result = BlackScholes(s, k, t, r, sigma, q).calculate_all(higher_order=True)
+
+    def bump(**kwargs):
+        params = {"s": s, "k": k, "t": t, "r": r, "sigma": sigma, "q": q} | kwargs
+        return BlackScholes(**params).calculate_all()
+
+    assert result.vanna == pytest.approx(
+        (bump(sigma=sigma + h).delta_call - bump(sigma=sigma - h).delta_call) / (2 * h)
+    )
+    assert result.volga == pytest.approx((bump(sigma=sigma + h).vega - bump(sigma=sigma - h).vega) / (2 * h))
+    assert result.speed == pytest.approx((bump(s=s + h).gamma - bump(s=s - h).gamma) / (2 * h), rel=1e-4)
+    assert result.charm_call == pytest.approx(-(bump(t=t + h).delta_call - bump(t=t - h).delta_call) / (2 * h))
+    assert result.charm_put == pytest.approx(-(bump(t=t + h).delta_put - bump(t=t - h).delta_put) / (2 * h))
+    assert result.color == pytest.approx(-(bump(t=t + h).gamma - bump(t=t - h).gamma) / (2 * h), rel=1e-4)
+
+
+def test_pricing_core_imports_with_numpy_only():
+    heavy = ("scipy", "pandas", "streamlit")
+    code = f"import sys, src.black_scholes; print(sorted(m for m in {heavy!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,85 @@
+import pytest
+
+from src.cache import MarketDataCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return MarketDataCache(path=tmp_path / "cache.sqlite", ttls={"stock": 60}, clock=clock)
+
+
+def test_hit_within_ttl(cache):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"price": 1.0}
+
+    assert cache.get_or_fetch("stock", "AAPL", fetch) == {"price": 1.0}
+    assert cache.get_or_fetch("stock", "AAPL", fetch) == {"price": 1.0}
+    assert len(calls) == 1
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+    assert cache.stats.hit_rate == 0.5
+
+
+def test_refetch_after_ttl(cache, clock):
+    cache.get_or_fetch("stock", "AAPL", lambda: 1.0)
+    clock.now += 61
+    assert cache.get_or_fetch("stock", "AAPL", lambda: 2.0) == 2.0
+    assert cache.stats.misses == 2
+
+
+def test_serves_stale_value_when_upstream_fails(cache, clock):
+    cache.get_or_fetch("stock", "AAPL", lambda: 1.0)
+    clock.now += 3600
+
+    def failing_fetch():
+        raise ConnectionError("upstream down")
+
+    assert cache.get_or_fetch("stock", "AAPL", failing_fetch) == 1.0
+    assert cache.stats.stale_served == 1
+    assert cache.stats.errors == 1
+
+
+def test_failure_without_cached_value_raises(cache):
+    def failing_fetch():
+        raise ConnectionError("upstream down")
+
+    with pytest.raises(ConnectionError):
+        cache.get_or_fetch("stock", "AAPL", failing_fetch)
+
+
+def test_disk_store_survives_restart(tmp_path, cache, clock):
+    cache.get_or_fetch("stock", "AAPL", lambda: {"price": 1.0})
+    restarted = MarketDataCache(path=tmp_path / "cache.sqlite", ttls={"stock": 60}, clock=clock)
+    assert restarted.get("stock", "AAPL") == {"price": 1.0}
+    assert restarted.stats.disk_hits == 1
+
+
+def test_lru_eviction(clock):
+    cache = MarketDataCache(max_entries=2, clock=clock)
+    for ticker in ("A", "B", "A", "C"):
+        cache.get_or_fetch("stock", ticker, lambda: 1.0)
+    assert cache.get("stock", "A") == 1.0
+    assert cache.get("stock", "B") is None
+    assert cache.stats.evictions == 1
+
+
+def test_clear(cache):
+    cache.set("stock", "AAPL", 1.0)
+    cache.clear()
+    assert cache.get("stock", "AAPL") is None
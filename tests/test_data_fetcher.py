@@ -1,7 +1,21 @@
+import json
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
 import pandas as pd
 import pytest
 
-from src.data_fetcher import fetch_stock_data, get_fred_api_key, get_risk_free_rate
+from src import data_fetcher
+from src.cache import MarketDataCache
+from src.data_fetcher import fetch_many, fetch_stock_data, get_fred_api_key, get_risk_free_rate
+from src.history_store import HistoryStore
+from src.yield_curve import SERIES_MATURITIES, to_continuous_rate
 
 
 @pytest.fixture(autouse=True)
@@ -9,6 +23,21 @@ def mock_fred_api_key(monkeypatch):
     monkeypatch.setenv("FRED_API_KEY", "mock_api_key")
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache(monkeypatch, tmp_path):
+    cache = MarketDataCache(path=tmp_path / "market_data.sqlite", ttls=data_fetcher.MARKET_DATA_TTLS)
+    monkeypatch.setattr(data_fetcher, "market_data_cache", cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_history(monkeypatch, tmp_path):
+    store = HistoryStore(tmp_path / "history")
+    monkeypatch.setattr(data_fetcher, "history_store", store)
+    monkeypatch.setattr(data_fetcher, "volatility_trackers", {})
+    return store
+
+
 def test_get_fred_api_key():
     assert get_fred_api_key() == "mock_api_key"
 
@@ -20,6 +49,8 @@ def test_get_risk_free_rate():
 
 @pytest.fixture
 def mock_yfinance(monkeypatch):
+    history_requests = []
+
     class MockTicker:
         @property
         def info(self):
@@ -29,13 +60,16 @@ def mock_yfinance(monkeypatch):
                 "longName": "Test Company",
             }
 
-        def history(self, period):
-            return pd.DataFrame({"Close": [149, 150, 151]})
+        def history(self, period=None, start=None):
+            history_requests.append(start)
+            index = pd.date_range("2024-01-02", periods=3, tz="America/New_York")
+            return pd.DataFrame({"Close": [149, 150, 151]}, index=index)
 
     def mock_ticker(*args, **kwargs):
         return MockTicker()
 
     monkeypatch.setattr("yfinance.Ticker", mock_ticker)
+    return history_requests
 
 
 def test_fetch_stock_data_success(mock_yfinance):
@@ -45,6 +79,16 @@ def test_fetch_stock_data_success(mock_yfinance):
     assert result["company_name"] == "Test Company"
     assert isinstance(result["volatility"], float)
     assert 0 < result["volatility"] < 1
+    assert result["volatility"] == result["volatility_estimates"]["ewma"]
+
+
+def test_fetch_stock_data_fetches_only_missing_history(mock_yfinance, isolated_cache, isolated_history):
+    fetch_stock_data("TEST")
+    isolated_cache.clear()
+    fetch_stock_data("TEST")
+    assert mock_yfinance[0] is None
+    assert str(mock_yfinance[1]) == "2024-01-04"
+    assert len(isolated_history.bars("TEST")) == 3
 
 
 def test_fetch_stock_data_failure(monkeypatch):
@@ -60,3 +104,136 @@ def test_fetch_stock_data_failure(monkeypatch):
         "dividend_yield": 0,
         "company_name": "TEST",
     }
+
+
+def test_fetch_stock_data_is_cached(monkeypatch, mock_yfinance, isolated_cache):
+    first = fetch_stock_data("TEST")
+
+    def mock_ticker_error(*args, **kwargs):
+        raise AssertionError("upstream should not be called while the entry is fresh")
+
+    monkeypatch.setattr("yfinance.Ticker", mock_ticker_error)
+    assert fetch_stock_data("test") == first
+    assert isolated_cache.stats.hits == 1
+
+
+def test_fetch_stock_data_serves_stale_on_failure(monkeypatch, mock_yfinance, isolated_cache):
+    first = fetch_stock_data("TEST")
+    isolated_cache.set("stock", "TEST", first, stored_at=0)
+
+    def mock_ticker_error(*args, **kwargs):
+        raise Exception("API Error")
+
+    monkeypatch.setattr("yfinance.Ticker", mock_ticker_error)
+    assert fetch_stock_data("TEST") == first
+    assert isolated_cache.stats.stale_served == 1
+
+
+def test_get_risk_free_rate_refreshes_curve_once(monkeypatch):
+    calls = []
+
+    class MockFred:
+        def get_series(self, series_id, start, end):
+            calls.append(series_id)
+            return pd.Series([4.5, 4.0 + SERIES_MATURITIES[series_id] / 30])
+
+    monkeypatch.setattr(data_fetcher, "get_fred", MockFred)
+    one_year = get_risk_free_rate(1)
+    assert one_year == pytest.approx(to_continuous_rate("DGS1", 4.0 + 1 / 30))
+    assert one_year < get_risk_free_rate(1.5) < get_risk_free_rate(2)
+    assert get_risk_free_rate(np.array([0.25, 10])).shape == (2,)
+    assert sorted(calls) == sorted(SERIES_MATURITIES)
+
+
+def test_get_risk_free_rate_uses_available_series(monkeypatch):
+    class MockFred:
+        def get_series(self, series_id, start, end):
+            if series_id != "DGS5":
+                raise Exception("API Error")
+            return pd.Series([3.0])
+
+    monkeypatch.setattr(data_fetcher, "get_fred", MockFred)
+    assert get_risk_free_rate(1) == pytest.approx(to_continuous_rate("DGS5", 3.0))
+
+
+def test_import_is_lazy_and_needs_no_api_key(monkeypatch):
+    monkeypatch.delenv("FRED_API_KEY")
+    heavy = ("fredapi", "streamlit", "yfinance")
+    code = f"import sys, src.data_fetcher; print(sorted(m for m in {heavy!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+@pytest.fixture
+def stub_quote_server():
+    state = {"requests": Counter(), "active": 0, "max_active": 0, "failures": {"FLAKY": 2}}
+    lock = threading.Lock()
+
+    class QuoteHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            ticker = self.path.rsplit("/", 1)[-1]
+            with lock:
+                state["requests"][ticker] += 1
+                state["active"] += 1
+                state["max_active"] = max(state["max_active"], state["active"])
+                failing = state["failures"].get(ticker, 0) > 0
+                if failing:
+                    state["failures"][ticker] -= 1
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+
+            if failing or ticker == "DOWN":
+                self.send_response(500)
+                self.end_headers()
+                return
+            body = json.dumps(
+                {"current_price": 100.0, "volatility": 0.2, "dividend_yield": 0.0, "company_name": ticker}
+            )
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body.encode())
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), QuoteHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/quote"
+
+    def fetch(ticker):
+        response = data_fetcher.get_http_session().get(f"{base_url}/{ticker}", timeout=5)
+        response.raise_for_status()
+        return response.json()
+
+    yield fetch, state
+    server.shutdown()
+
+
+def test_fetch_many_deduplicates_and_limits_concurrency(stub_quote_server):
+    fetch, state = stub_quote_server
+    tickers = [f"T{i}" for i in range(12)] + ["t0", "T1"]
+    results = fetch_many(tickers, max_workers=4, fetch=fetch, backoff=0)
+    assert set(results) == {f"T{i}" for i in range(12)}
+    assert all(count == 1 for count in state["requests"].values())
+    assert 1 < state["max_active"] <= 4
+
+
+def test_fetch_many_retries_with_backoff(stub_quote_server):
+    fetch, state = stub_quote_server
+    results = fetch_many(["FLAKY", "DOWN"], fetch=fetch, retries=2, backoff=0.01)
+    assert results["FLAKY"]["current_price"] == 100.0
+    assert state["requests"]["FLAKY"] == 3
+    assert results["DOWN"]["current_price"] == 0
+    assert state["requests"]["DOWN"] == 3
+
+
+def test_concurrent_requests_for_same_ticker_are_coalesced(stub_quote_server):
+    fetch, state = stub_quote_server
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(lambda _: fetch_many(["SAME"], fetch=fetch), range(6)))
+    assert all(result["SAME"]["company_name"] == "SAME" for result in results)
+    assert state["requests"]["SAME"] == 1
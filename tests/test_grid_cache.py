@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from src.black_scholes import BlackScholes
+from src.grid_cache import HeatmapGridCache, axis_percentages
+
+MARKET = {"s": 100.0, "k": 105.0, "t": 0.5, "r": 0.04, "q": 0.01, "sigma": 0.25}
+
+
+@pytest.fixture
+def cache():
+    return HeatmapGridCache(max_entries=2)
+
+
+def reference(s_axis, sigma_axis):
+    grid = BlackScholes.grid(s_axis, sigma_axis, MARKET["k"], MARKET["t"], MARKET["r"], MARKET["q"])
+    return grid.calculate_option_price("call"), grid.calculate_option_price("put")
+
+
+def test_axis_percentages():
+    np.testing.assert_array_equal(axis_percentages((80, 90), 5), [80, 85, 90])
+
+
+def test_grid_matches_direct_pricing(cache):
+    s_axis, sigma_axis, call, put = cache.get(**MARKET, price_range=(80, 120), vol_range=(50, 150))
+    assert call.shape == (sigma_axis.size, s_axis.size) == (51, 41)
+    expected_call, expected_put = reference(s_axis, sigma_axis)
+    np.testing.assert_allclose(call, expected_call)
+    np.testing.assert_allclose(put, expected_put)
+
+
+def test_repeat_request_is_a_hit(cache):
+    first = cache.get(**MARKET, price_range=(80, 120), vol_range=(50, 150))
+    second = cache.get(**MARKET, price_range=(80, 120), vol_range=(50, 150))
+    assert second[2] is first[2]
+    assert cache.stats.hits == 1
+    assert cache.stats.cells_computed == first[2].size
+
+
+def test_widening_only_prices_new_rows_and_columns(cache):
+    cache.get(**MARKET, price_range=(80, 120), vol_range=(50, 150))
+    computed_before = cache.stats.cells_computed
+    s_axis, sigma_axis, call, put = cache.get(**MARKET, price_range=(70, 130), vol_range=(40, 150))
+
+    assert cache.stats.partial_hits == 1
+    assert cache.stats.cells_computed - computed_before == call.size - 41 * 51
+    expected_call, expected_put = reference(s_axis, sigma_axis)
+    np.testing.assert_allclose(call, expected_call)
+    np.testing.assert_allclose(put, expected_put)
+
+
+def test_narrowing_reuses_cached_cells(cache):
+    cache.get(**MARKET, price_range=(80, 120), vol_range=(50, 150))
+    computed_before = cache.stats.cells_computed
+    s_axis, sigma_axis, call, _ = cache.get(**MARKET, price_range=(90, 110), vol_range=(60, 100))
+    assert cache.stats.cells_computed == computed_before
+    np.testing.assert_allclose(call, reference(s_axis, sigma_axis)[0])
+
+
+def test_pricing_inputs_change_the_key_and_evict(cache):
+    cache.get(**MARKET, price_range=(80, 120), vol_range=(50, 150))
+    cache.get(**(MARKET | {"k": 110.0}), price_range=(80, 120), vol_range=(50, 150))
+    cache.get(**(MARKET | {"t": 1.0}), price_range=(80, 120), vol_range=(50, 150))
+    assert cache.stats.misses == 3
+    assert cache.stats.evictions == 1
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from src.black_scholes import BlackScholes
+from src.heatmap_engine import adaptive_axis, price_heatmap, refine_heatmap
+
+MARKET = {"s": 100.0, "k": 100.0, "t": 0.25, "r": 0.04, "q": 0.0, "sigma": 0.2}
+
+
+@pytest.fixture
+def levels():
+    return list(refine_heatmap(**MARKET, price_range=(50, 150), vol_range=(50, 150), resolutions=(20, 60, 200)))
+
+
+def test_levels_refine_progressively(levels):
+    assert [level.resolution for level in levels] == [20, 60, 200]
+    for level in levels:
+        assert level.call.shape == level.put.shape == (level.resolution, level.resolution)
+        assert level.s_axis[0] == pytest.approx(50) and level.s_axis[-1] == pytest.approx(150)
+        assert np.all(np.diff(level.s_axis) > 0) and np.all(np.diff(level.sigma_axis) > 0)
+
+
+def test_refined_values_match_direct_pricing(levels):
+    final = levels[-1]
+    grid = BlackScholes.grid(final.s_axis, final.sigma_axis, MARKET["k"], MARKET["t"], MARKET["r"], MARKET["q"])
+    np.testing.assert_allclose(final.call, grid.calculate_option_price("call"))
+    np.testing.assert_allclose(final.put, grid.calculate_option_price("put"))
+
+
+def test_refinement_concentrates_samples_near_the_strike(levels):
+    s_axis = levels[-1].s_axis
+    near_strike = np.diff(s_axis)[np.abs(s_axis[:-1] - MARKET["k"]) < 5].mean()
+    far_from_strike = np.diff(s_axis)[s_axis[:-1] > 140].mean()
+    assert near_strike < 0.6 * far_from_strike
+
+
+def test_non_adaptive_levels_are_uniform():
+    *_, final = refine_heatmap(
+        **MARKET, price_range=(80, 120), vol_range=(50, 150), resolutions=(10, 40), adaptive=False
+    )
+    np.testing.assert_allclose(np.diff(final.s_axis), np.diff(final.s_axis)[0])
+
+
+def test_adaptive_axis_falls_back_to_uniform_for_flat_surfaces():
+    axis = np.linspace(0, 1, 11)
+    np.testing.assert_allclose(adaptive_axis(axis, np.zeros(11), 5), np.linspace(0, 1, 5))
+
+
+def test_chunked_pricing_matches_single_pass():
+    s_axis, sigma_axis = np.linspace(80, 120, 30), np.linspace(0.1, 0.5, 37)
+    chunked = price_heatmap(s_axis, sigma_axis, 100, 1, 0.05, 0.0, chunk_rows=8)
+    single = price_heatmap(s_axis, sigma_axis, 100, 1, 0.05, 0.0, chunk_rows=100)
+    np.testing.assert_array_equal(chunked[0], single[0])
+    np.testing.assert_array_equal(chunked[1], single[1])
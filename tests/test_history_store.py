@@ -0,0 +1,92 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.history_store import BAR_DTYPE, HistoryStore, frame_to_bars
+
+FIXTURE = Path(__file__).parent / "fixtures" / "price_history_aapl.csv"
+
+
+@pytest.fixture
+def history():
+    frame = pd.read_csv(FIXTURE, index_col="Date", parse_dates=True)
+    frame.index = frame.index.tz_localize("America/New_York")
+    return frame
+
+
+class FixtureFeed:
+    # serves the fixture like yfinance's history(): everything up to `available`, from `start` on
+    def __init__(self, frame, available):
+        self.frame = frame
+        self.available = available
+        self.requests = []
+
+    def __call__(self, start):
+        self.requests.append(start)
+        frame = self.frame.iloc[: self.available]
+        if start is not None:
+            frame = frame[frame.index.date >= start]
+        return frame_to_bars(frame)
+
+
+def test_frame_to_bars_keeps_trading_dates(history):
+    bars = frame_to_bars(history.iloc[:3])
+    assert bars.dtype == BAR_DTYPE
+    assert bars["time"].astype("datetime64[D]").astype(str).tolist() == ["2024-01-02", "2024-01-03", "2024-01-04"]
+    assert np.array_equal(bars["close"], history["Close"].iloc[:3].to_numpy())
+
+
+def test_frame_to_bars_fills_missing_ohlc():
+    frame = pd.DataFrame({"Close": [1.0, 2.0]}, index=pd.to_datetime(["2024-01-02", "2024-01-03"]))
+    bars = frame_to_bars(frame)
+    assert np.array_equal(bars["open"], bars["close"]) and np.array_equal(bars["low"], bars["close"])
+    assert np.all(bars["volume"] == 0)
+
+
+@pytest.mark.parametrize("on_disk", [True, False])
+def test_update_fetches_only_missing_bars(history, tmp_path, on_disk):
+    store = HistoryStore(tmp_path / "history" if on_disk else None)
+    feed = FixtureFeed(history, available=250)
+
+    assert len(store.update("aapl", feed)) == 250
+    feed.available = 260
+    bars = store.update("AAPL", feed)
+
+    assert feed.requests == [None, history.index[249].date()]
+    assert len(bars) == 260
+    assert np.array_equal(bars["close"], history["Close"].iloc[:260].to_numpy())
+    assert np.all(np.diff(bars["time"].astype(np.int64)) > 0)
+
+
+def test_store_persists_across_instances(history, tmp_path):
+    HistoryStore(tmp_path).update("AAPL", FixtureFeed(history, available=100))
+    reopened = HistoryStore(tmp_path)
+    bars = reopened.bars("aapl")
+    assert isinstance(bars, np.memmap)
+    assert len(bars) == 100
+    assert (tmp_path / "AAPL.bars").stat().st_size == 100 * BAR_DTYPE.itemsize
+
+
+def test_append_revises_last_bar_and_skips_old_ones(history, tmp_path):
+    store = HistoryStore(tmp_path)
+    bars = frame_to_bars(history.iloc[:10])
+    store.append("AAPL", bars)
+
+    revised = bars[-3:].copy()
+    revised["close"] += 1.0
+    # bars before the last stored one are history already; only the last may change
+    assert store.append("AAPL", revised) == 0
+    stored = store.bars("AAPL")
+    assert len(stored) == 10
+    assert stored["close"][-1] == bars["close"][-1] + 1.0
+    assert np.array_equal(stored["close"][:-1], bars["close"][:-1])
+
+
+def test_append_sorts_and_deduplicates(history):
+    store = HistoryStore()
+    bars = frame_to_bars(history.iloc[:5])
+    assert store.append("AAPL", np.concatenate((bars[::-1], bars[2:3]))) == 5
+    assert np.array_equal(store.bars("AAPL"), bars)
+    assert store.last_time("MSFT") is None
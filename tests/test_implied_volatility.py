@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from src.black_scholes import BlackScholes
+from src.implied_volatility import implied_volatility
+
+
+@pytest.fixture
+def quote_chain():
+    rng = np.random.default_rng(42)
+    n = 2000
+    s = rng.uniform(80, 120, n)
+    k = rng.uniform(80, 120, n)
+    t = rng.uniform(0.1, 2, n)
+    r = rng.uniform(0, 0.06, n)
+    q = rng.uniform(0, 0.03, n)
+    sigma = rng.uniform(0.15, 1.2, n)
+    is_call = rng.random(n) < 0.5
+    result = BlackScholes(s, k, t, r, sigma, q).calculate_all()
+    price = np.where(is_call, result.call, result.put)
+    return price, s, k, t, r, q, is_call, sigma
+
+
+def test_recovers_volatility_for_calls_and_puts(quote_chain):
+    price, s, k, t, r, q, is_call, sigma = quote_chain
+    result = implied_volatility(price, s, k, t, r, q, is_call)
+    assert result.converged.all()
+    np.testing.assert_allclose(result.sigma, sigma, rtol=1e-6)
+    assert result.iterations.max() <= 12
+
+
+def test_scalar_and_string_option_types():
+    price = BlackScholes(100, 105, 0.5, 0.03, 0.25).calculate_option_price("put")
+    result = implied_volatility(price, 100, 105, 0.5, 0.03, option_type="put")
+    assert result.sigma.shape == ()
+    assert result.converged
+    assert result.sigma == pytest.approx(0.25)
+
+    prices = [BlackScholes(100, 100, 1, 0.05, 0.3).calculate_option_price(kind) for kind in ("call", "put")]
+    result = implied_volatility(prices, 100, 100, 1, 0.05, option_type=["call", "PUT"])
+    np.testing.assert_allclose(result.sigma, [0.3, 0.3])
+
+
+def test_flags_prices_outside_arbitrage_bounds():
+    # below intrinsic, above the underlying and expired quotes cannot be inverted
+    result = implied_volatility([5.0, 150.0, 10.0], 110, 100, [1, 1, 0], 0.0)
+    assert not result.converged.any()
+    assert np.isnan(result.sigma).all()
+
+
+def test_process_pool_matches_serial(quote_chain):
+    price, s, k, t, r, q, is_call, _ = quote_chain
+    serial = implied_volatility(price, s, k, t, r, q, is_call)
+    pooled = implied_volatility(price, s, k, t, r, q, is_call, workers=2, chunk_size=500)
+    np.testing.assert_allclose(pooled.sigma, serial.sigma, rtol=1e-12)
+    np.testing.assert_array_equal(pooled.converged, serial.converged)
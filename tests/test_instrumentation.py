@@ -0,0 +1,141 @@
+import pstats
+import threading
+
+import numpy as np
+import pytest
+
+from src import instrumentation
+from src.black_scholes import BlackScholes
+from src.instrumentation import ProfileCapture, count, finish_run, span, stage, start_run, timed
+
+
+@pytest.fixture
+def enabled():
+    instrumentation.reset()
+    yield
+    finish_run()
+    instrumentation.enable(False)
+    instrumentation.reset()
+
+
+def test_nothing_is_recorded_outside_a_run(enabled):
+    assert span("a") is span("b")
+    with span("a"):
+        count("kernel", 10)
+    assert not instrumentation.span_totals and not instrumentation.counter_totals
+
+
+def test_stages_and_nested_spans(enabled):
+    run = start_run()
+    stage("app.pricing")
+    with span("outer"):
+        with span("inner"):
+            pass
+        with span("inner"):
+            pass
+    stage("app.figures")
+    with span("inner"):
+        pass
+    assert finish_run() is run
+
+    rows = [(row["span"], row["depth"], row["calls"]) for row in run.breakdown()]
+    assert rows == [
+        ("app.pricing", 0, 1),
+        ("outer", 1, 1),
+        ("inner", 2, 2),
+        ("app.figures", 0, 1),
+        ("inner", 1, 1),
+    ]
+    assert sum(row["share"] for row in run.breakdown() if row["depth"] == 0) <= 1.0
+    assert instrumentation.span_totals["inner"][0] == 3
+
+
+def test_kernel_counters(enabled):
+    run = start_run()
+    BlackScholes(np.linspace(80, 120, 50), 100, 1, 0.05, 0.2).calculate_all()
+    BlackScholes(100, 100, 1, 0.05, 0.2).calculate_option_price("put")
+    finish_run()
+    assert run.counters["black_scholes.calculate_all"] == [1, 50]
+    assert run.counters["black_scholes.price"] == [1, 1]
+
+
+def test_timed_keeps_the_function(enabled):
+    @timed("work")
+    def work(x):
+        return 2 * x
+
+    assert work.__name__ == "work"
+    assert work(21) == 42
+    run = start_run()
+    assert work(21) == 42
+    finish_run()
+    assert [path for path, _, _ in run.spans] == [("work",)]
+    assert instrumentation.span_totals["work"][0] == 1
+
+
+def test_runs_are_isolated_per_thread(enabled):
+    run = start_run()
+    other_runs = []
+
+    def background():
+        # e.g. another session's rerun with its debug panel closed, or a shared-store refresh
+        with span("background"):
+            count("kernel")
+        other_runs.append(start_run())
+        with span("other session"):
+            pass
+        finish_run()
+
+    thread = threading.Thread(target=background)
+    thread.start()
+    thread.join()
+    with span("this session"):
+        pass
+    finish_run()
+    assert [path for path, _, _ in run.spans] == [("this session",)] and not run.counters
+    assert [path for path, _, _ in other_runs[0].spans] == [("other session",)]
+    assert "background" not in instrumentation.span_totals
+
+
+def test_global_override_records_outside_runs(enabled):
+    instrumentation.enable(True)
+
+    def background():
+        with span("background"):
+            count("kernel")
+
+    thread = threading.Thread(target=background)
+    thread.start()
+    thread.join()
+    assert instrumentation.span_totals["background"][0] == 1
+    assert instrumentation.counter_totals["kernel"] == [1, 1]
+
+
+def test_cprofile_capture_dumps_a_loadable_file(tmp_path):
+    with ProfileCapture("cprofile") as profiler:
+        BlackScholes(np.linspace(80, 120, 1000), 100, 1, 0.05, 0.2).calculate_all()
+    path = profiler.dump(tmp_path / "rerun.prof")
+    assert "calculate_all" in profiler.summary()
+    assert any(name == "calculate_all" for _, _, name in pstats.Stats(str(path)).stats)
+
+
+def test_sampling_capture(tmp_path):
+    pytest.importorskip("pyinstrument")
+    with ProfileCapture("sampling", interval=0.0001) as profiler:
+        BlackScholes(np.linspace(80, 120, 100_000), 100, 1, 0.05, 0.2).calculate_all()
+    assert profiler.dump(tmp_path / "rerun.html").read_text().startswith("<!DOCTYPE html>")
+
+
+def test_default_profile_directory_is_pruned(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+    for _ in range(5):
+        with ProfileCapture("cprofile") as profiler:
+            sum(range(100))
+        latest = profiler.dump(keep=3)
+    assert len(list(tmp_path.glob("profile-*.prof"))) == 3
+    assert latest.exists()
+
+
+def test_unknown_profile_mode():
+    with pytest.raises(ValueError):
+        ProfileCapture("dtrace")
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from src.black_scholes import BlackScholes
+from src.lattice import LatticePricer, backward_induction
+
+MARKET = {"s": 100.0, "k": 100.0, "t": 1.0, "r": 0.05, "sigma": 0.3, "q": 0.03}
+
+
+@pytest.fixture(scope="module")
+def reference_put():
+    inputs = [np.array([MARKET[name]]) for name in ("s", "k", "t", "r", "sigma", "q")]
+    return backward_induction(*inputs, np.array([False]), np.array([True]), 10_000)[0][0]
+
+
+def test_american_call_without_dividends_matches_black_scholes():
+    market = MARKET | {"q": 0.0}
+    price = LatticePricer(**market).calculate_option_price("call")
+    assert price == pytest.approx(BlackScholes(**market).calculate_option_price("call"), abs=1e-10)
+
+
+@pytest.mark.parametrize("method", ["binomial", "trinomial"])
+def test_american_put_converges_to_reference(method, reference_put):
+    price = LatticePricer(**MARKET, method=method).calculate_option_price("put")
+    assert price == pytest.approx(reference_put, abs=1e-2)
+    assert price > BlackScholes(**MARKET).calculate_option_price("put")
+
+
+@pytest.mark.parametrize("method", ["binomial", "trinomial"])
+def test_control_variate_is_accurate_between_nodes(method):
+    # spots, strikes and maturities that fall between nodes, where the tree error oscillates
+    s, k, t = (v.ravel() for v in np.meshgrid([83.7, 96.1, 104.9, 117.3], [95.0, 110.0], [0.35, 1.3], indexing="ij"))
+    market = {"s": s, "k": k, "t": t, "r": 0.05, "sigma": 0.3, "q": 0.01}
+    inputs = [np.broadcast_to(market[name], s.shape) for name in ("s", "k", "t", "r", "sigma", "q")]
+    # averaging an odd and an even tree cancels the binomial parity oscillation in the reference
+    put, american = np.zeros(s.size, dtype=bool), np.ones(s.size, dtype=bool)
+    reference = sum(backward_induction(*inputs, put, american, steps)[0] for steps in (2000, 2001)) / 2
+
+    def errors(**options):
+        return np.abs(
+            LatticePricer(**market, steps=100, method=method, **options).calculate_option_price("put") - reference
+        )
+
+    default = errors()
+    plain = errors(control_variate=False)
+    extrapolated = errors(richardson=True)
+    assert default.mean() < 0.75 * plain.mean()
+    assert default.max() <= plain.max()
+    assert default.mean() < extrapolated.mean()
+
+
+@pytest.mark.parametrize("method", ["binomial", "trinomial"])
+def test_european_tree_greeks_match_closed_form(method):
+    tree = LatticePricer(**MARKET, steps=400, method=method, american=False, control_variate=False).calculate_all()
+    exact = BlackScholes(**MARKET).calculate_all()
+    for name, value in exact.greeks().items():
+        assert getattr(tree, name) == pytest.approx(value, rel=1e-2), name
+
+
+def test_deep_in_the_money_american_put_is_exercised():
+    result = LatticePricer(60.0, 100.0, 1.0, 0.05, 0.2).calculate_all()
+    assert result.put == pytest.approx(40.0, abs=1e-2)
+    assert result.delta_put == pytest.approx(-1.0, abs=1e-2)
+    assert result.gamma_put == pytest.approx(0.0, abs=1e-3) and result.gamma > result.gamma_put
+
+
+def test_batched_contracts_match_individual_pricing():
+    spots = np.array([[80.0, 100.0], [120.0, 90.0]])
+    batched = LatticePricer(spots, 100.0, 0.5, 0.04, 0.25, 0.02, steps=60).calculate_all()
+    assert batched.put.shape == spots.shape
+    for index, spot in np.ndenumerate(spots):
+        single = LatticePricer(spot, 100.0, 0.5, 0.04, 0.25, 0.02, steps=60).calculate_all()
+        assert batched.put[index] == pytest.approx(single.put)
+        assert batched.delta_call[index] == pytest.approx(single.delta_call)
+        assert batched.vega[index] == pytest.approx(single.vega)
+
+
+def test_unknown_method_raises():
+    with pytest.raises(ValueError):
+        LatticePricer(**MARKET, method="quadrinomial").calculate_option_price("put")
+
+
+@pytest.mark.parametrize("method", ["binomial", "trinomial"])
+def test_low_volatility_and_high_rate_stay_bounded(method):
+    # sigma * sqrt(dt) < (r - q) * dt puts the CRR probabilities outside [0, 1]
+    market = {"s": 100.0, "k": 100.0, "t": 10.0, "r": 0.2, "sigma": 0.01, "q": 0.0}
+    tree = LatticePricer(**market, method=method).calculate_all()
+    exact = BlackScholes(**market).calculate_all()
+    assert tree.call == pytest.approx(exact.call, rel=1e-6)
+    assert tree.delta_call == pytest.approx(exact.delta_call, abs=1e-6)
+    assert tree.theta_call == pytest.approx(exact.theta_call, rel=1e-3)
+    assert 0.0 <= tree.put < 1e-6
+
+    european = LatticePricer(**market, method=method, american=False, control_variate=False).calculate_all()
+    assert european.call == pytest.approx(exact.call, rel=1e-6)
+
+
+def test_vega_at_minimum_volatility():
+    market = {"s": 100.0, "k": 100.0, "t": 1.0, "r": 0.01, "sigma": 0.01, "q": 0.0}
+    tree = LatticePricer(**market, american=False).calculate_all()
+    assert np.isfinite(tree.vega) and np.isfinite(tree.vega_put)
+    assert tree.vega == pytest.approx(BlackScholes(**market).calculate_all().vega, rel=0.02)
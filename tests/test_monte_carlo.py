@@ -0,0 +1,58 @@
+import pytest
+
+from src.black_scholes import BlackScholes
+from src.monte_carlo import MonteCarloPricer
+
+MARKET = {"s": 100.0, "k": 100.0, "t": 0.5, "r": 0.04, "sigma": 0.25, "q": 0.01}
+
+
+def pricer(**kwargs):
+    return MonteCarloPricer(**MARKET, **({"paths": 20_000, "steps": 50, "chunk_size": 4_000, "seed": 7} | kwargs))
+
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+def test_european_price_matches_closed_form(option_type):
+    result = pricer(paths=200_000).price(option_type)
+    exact = BlackScholes(**MARKET).calculate_option_price(option_type)
+    assert result.std_error > 0
+    assert abs(result.price - exact) < 4 * result.std_error
+
+
+def test_same_seed_is_reproducible_across_workers():
+    serial = pricer().price("call", "asian")
+    assert pricer().price("call", "asian") == serial
+    assert pricer(workers=2).price("call", "asian") == serial
+    assert pricer(seed=8).price("call", "asian") != serial
+
+
+def test_variance_reduction_shrinks_standard_error():
+    plain = pricer(antithetic=False, control_variate=False).price("call", "asian")
+    antithetic = pricer(control_variate=False).price("call", "asian")
+    both = pricer().price("call", "asian")
+    assert antithetic.std_error < plain.std_error
+    assert both.std_error < 0.75 * antithetic.std_error
+    assert abs(both.price - plain.price) < 4 * plain.std_error
+
+
+def test_knock_in_and_knock_out_sum_to_the_unbarriered_option():
+    mc = pricer(control_variate=False)
+    knock_out = mc.price("call", "barrier", barrier=120, barrier_type="up-and-out")
+    knock_in = mc.price("call", "barrier", barrier=120, barrier_type="up-and-in")
+    never_hit = mc.price("call", "barrier", barrier=1e9, barrier_type="up-and-out")
+    assert 0 < knock_out.price < never_hit.price
+    assert knock_in.price + knock_out.price == pytest.approx(never_hit.price)
+    exact = BlackScholes(**MARKET).calculate_option_price("call")
+    assert abs(never_hit.price - exact) < 4 * never_hit.std_error
+
+
+def test_path_dependent_prices_are_ordered():
+    mc = pricer(control_variate=False)
+    european, asian, lookback = (mc.price("call", payoff).price for payoff in ("european", "asian", "lookback"))
+    assert asian < european < lookback
+
+
+def test_unknown_payoff_or_missing_barrier_raises():
+    with pytest.raises(ValueError):
+        pricer().price("call", "bermudan")
+    with pytest.raises(ValueError):
+        pricer().price("call", "barrier")
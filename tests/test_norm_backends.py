@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+from src import norm_backends
+from src.black_scholes import BlackScholes
+from src.norm_backends import (
+    ABSOLUTE_TOLERANCE,
+    RELATIVE_TOLERANCE,
+    available_backends,
+    get_backend,
+    select_backend,
+    set_backend,
+    use_backend,
+)
+
+BACKENDS = available_backends()
+
+
+@pytest.fixture
+def reference_points():
+    rng = np.random.default_rng(7)
+    return np.concatenate([np.linspace(-38, 38, 2001), rng.normal(scale=3, size=5000)])
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_backend_accuracy(name, reference_points):
+    backend = get_backend(name)
+    np.testing.assert_allclose(
+        backend.cdf(reference_points), norm.cdf(reference_points), rtol=RELATIVE_TOLERANCE, atol=ABSOLUTE_TOLERANCE
+    )
+    np.testing.assert_allclose(
+        backend.pdf(reference_points), norm.pdf(reference_points), rtol=RELATIVE_TOLERANCE, atol=ABSOLUTE_TOLERANCE
+    )
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_backend_scalar_inputs(name):
+    backend = get_backend(name)
+    assert float(backend.cdf(0.3)) == pytest.approx(norm.cdf(0.3), rel=RELATIVE_TOLERANCE)
+    assert float(backend.pdf(-1.7)) == pytest.approx(norm.pdf(-1.7), rel=RELATIVE_TOLERANCE)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_backend_prices_match_reference(name):
+    s = np.linspace(50, 150, 101)
+    reference = BlackScholes(s, 100, 0.5, 0.03, 0.3, 0.01).calculate_all(higher_order=True)
+    with use_backend(name):
+        result = BlackScholes(s, 100, 0.5, 0.03, 0.3, 0.01).calculate_all(higher_order=True)
+    for greek, values in reference.greeks().items():
+        np.testing.assert_allclose(result.greeks()[greek], values, rtol=1e-10, atol=1e-12)
+    np.testing.assert_allclose(result.call, reference.call, rtol=1e-10, atol=1e-12)
+
+
+def test_select_backend_by_size():
+    assert select_backend(1).name == "math"
+    assert select_backend(100).name == "ndtr"
+
+
+def test_set_backend_override(monkeypatch):
+    monkeypatch.setattr(norm_backends, "_override", None)
+    set_backend("math")
+    assert select_backend(10_000).name == "math"
+    set_backend(None)
+    assert select_backend(10_000).name == "ndtr"
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        set_backend("fortran")
+
+
+def test_available_backends_are_looked_up_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(norm_backends, "_override", None)
+    monkeypatch.setattr(norm_backends, "find_spec", lambda module: calls.append(module) or True)
+    available_backends.cache_clear()
+    try:
+        for _ in range(3):
+            assert select_backend(10).name == "ndtr"
+        assert available_backends() == tuple(norm_backends._LOADERS)
+        assert len(calls) == sum(len(modules) for modules in norm_backends._REQUIREMENTS.values())
+    finally:
+        available_backends.cache_clear()
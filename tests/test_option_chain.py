@@ -0,0 +1,107 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.option_chain import (
+    VolSurface,
+    build_vol_surface,
+    compute_chain_ivs,
+    load_option_chain,
+    normalize_option_chain,
+)
+
+FIXTURE = Path(__file__).parent / "fixtures" / "option_chain_aapl.json"
+
+
+@pytest.fixture
+def recorded_chain():
+    return json.loads(FIXTURE.read_text())
+
+
+@pytest.fixture
+def raw_chain(recorded_chain):
+    return {
+        expiry: (pd.DataFrame(quotes["calls"]), pd.DataFrame(quotes["puts"]))
+        for expiry, quotes in recorded_chain["expiries"].items()
+    }
+
+
+@pytest.fixture
+def chain_with_ivs(recorded_chain, raw_chain):
+    chain = normalize_option_chain(raw_chain, now=recorded_chain["as_of"])
+    return compute_chain_ivs(chain, recorded_chain["spot"], recorded_chain["r"], recorded_chain["q"])
+
+
+@pytest.fixture
+def mock_option_chain(monkeypatch, raw_chain):
+    class MockChain:
+        def __init__(self, calls, puts):
+            self.calls, self.puts = calls, puts
+
+    class MockTicker:
+        options = tuple(raw_chain)
+
+        def option_chain(self, expiry):
+            return MockChain(*raw_chain[expiry])
+
+    monkeypatch.setattr("yfinance.Ticker", lambda *args, **kwargs: MockTicker())
+
+
+def test_normalize_option_chain(recorded_chain, raw_chain):
+    chain = normalize_option_chain(raw_chain, now=recorded_chain["as_of"])
+    assert len(chain) == sum(len(calls) + len(puts) for calls, puts in raw_chain.values())
+    assert set(chain["option_type"]) == {"call", "put"}
+    assert chain["t"].is_monotonic_increasing
+    assert (chain["t"] > 0).all()
+    assert np.allclose(chain["mid"], 0.5 * (chain["bid"] + chain["ask"]))
+
+
+def test_expired_contracts_are_dropped(raw_chain):
+    chain = normalize_option_chain(raw_chain, now="2026-12-01")
+    assert chain["expiry"].min() == pd.Timestamp("2026-12-18")
+
+
+def test_chain_ivs_match_recorded_quotes(chain_with_ivs, raw_chain):
+    recorded = pd.concat([quotes for pair in raw_chain.values() for quotes in pair])
+    assert chain_with_ivs["iv_converged"].mean() > 0.95
+    merged = chain_with_ivs.merge(
+        recorded[["contractSymbol", "impliedVolatility"]], left_on="contract", right_on="contractSymbol"
+    )
+    converged = merged[merged["iv_converged"] & (merged["mid"] > 0.5)]
+    np.testing.assert_allclose(converged["iv"], converged["impliedVolatility"], atol=0.01)
+
+
+def test_vol_surface_reproduces_quotes(recorded_chain, chain_with_ivs):
+    surface = VolSurface.from_chain(chain_with_ivs, recorded_chain["spot"])
+    quotes = chain_with_ivs[(chain_with_ivs["option_type"] == "call") & (chain_with_ivs["strike"] >= 230)]
+    np.testing.assert_allclose(surface.vol(quotes["strike"], quotes["t"]), quotes["iv"], rtol=1e-10)
+
+
+def test_vol_surface_interpolates_and_extrapolates(recorded_chain, chain_with_ivs):
+    surface = VolSurface.from_chain(chain_with_ivs, recorded_chain["spot"])
+    t0, t1 = surface.maturities[:2]
+    mid_vol = surface.vol(230, 0.5 * (t0 + t1))
+    assert min(surface.vol(230, t0), surface.vol(230, t1)) <= mid_vol <= max(surface.vol(230, t0), surface.vol(230, t1))
+    assert surface.vol(230, t0 / 2) == pytest.approx(surface.vol(230, t0))
+    assert surface.vol(1000, t0) == pytest.approx(surface.vol(surface.strikes[-1], t0))
+    assert surface.vol([200, 230, 260], [0.3, 0.3, 0.3]).shape == (3,)
+
+
+def test_build_vol_surface(mock_option_chain, recorded_chain):
+    surface = build_vol_surface(
+        "AAPL", recorded_chain["spot"], recorded_chain["r"], recorded_chain["q"], now=recorded_chain["as_of"]
+    )
+    assert 0.15 < surface.vol(230, 0.25) < 0.35
+
+
+def test_load_option_chain(mock_option_chain, recorded_chain):
+    chain = load_option_chain("AAPL", now=recorded_chain["as_of"])
+    assert chain["expiry"].nunique() == len(recorded_chain["expiries"])
+
+
+def test_vol_surface_requires_quotes(chain_with_ivs):
+    with pytest.raises(ValueError):
+        VolSurface.from_chain(chain_with_ivs.iloc[:0], 230)
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from src.black_scholes import BlackScholes
+from src.portfolio import STRATEGIES, Portfolio
+
+SPOTS = {"AAPL": 100.0, "MSFT": 300.0}
+
+
+@pytest.fixture
+def book():
+    portfolio = Portfolio(capacity=2)
+    portfolio.add_strategy("Iron Condor", "AAPL", 100.0, 5.0, 0.5)
+    portfolio.add_strategy("Long Straddle", "MSFT", 300.0, 0.0, 0.25, quantity=2)
+    portfolio.add_leg("AAPL", "put", 95.0, 1.0, quantity=-3, premium=4.0)
+    return portfolio
+
+
+def test_legs_grow_past_the_initial_capacity(book):
+    assert len(book) == 7
+    assert book.underlyings == ["AAPL", "MSFT"]
+    np.testing.assert_array_equal(book.legs["strike"][:4], [90.0, 95.0, 105.0, 110.0])
+    np.testing.assert_array_equal(book.legs["quantity"][:4], [1.0, -1.0, -1.0, 1.0])
+
+
+def test_net_greeks_sum_the_individual_legs(book):
+    net = book.net_greeks(SPOTS, 0.2, 0.04)
+    expected = 0.0
+    for leg in book.legs:
+        spot = SPOTS[book.underlyings[leg["underlying"]]]
+        greeks = BlackScholes(spot, leg["strike"], leg["expiry"], 0.04, 0.2).calculate_greeks()
+        expected += leg["quantity"] * greeks["delta_call" if leg["is_call"] else "delta_put"]
+    assert net["delta"] == pytest.approx(expected)
+    assert net["pnl"] == pytest.approx(net["value"] + 3 * 4.0)
+
+
+def test_group_by_underlying_and_expiry_partitions_the_book(book):
+    groups = book.group_by(SPOTS, 0.2, 0.04)
+    assert set(groups) == {("AAPL", 0.5), ("AAPL", 1.0), ("MSFT", 0.25)}
+    net = book.net_greeks(SPOTS, 0.2, 0.04)
+    assert sum(group["vega"] for group in groups.values()) == pytest.approx(net["vega"])
+    assert book.group_by(SPOTS, 0.2, 0.04, by=("underlying",))[("MSFT",)]["gamma"] > 0
+
+
+def test_remove_legs_compacts_in_place(book):
+    book.remove_legs([0, 4])
+    assert len(book) == 5
+    np.testing.assert_array_equal(book.legs["strike"], [95.0, 105.0, 110.0, 300.0, 95.0])
+    assert book.net_greeks(SPOTS, 0.2, 0.04)["value"] == pytest.approx(sum(book.evaluate(SPOTS, 0.2, 0.04)["value"]))
+
+
+def test_evaluate_subset_matches_full_book(book):
+    vols = np.linspace(0.15, 0.45, len(book))
+    full = book.evaluate(SPOTS, vols, 0.04)
+    subset = book.evaluate(SPOTS, vols, 0.04, indices=[1, 5, 6])
+    for name, values in subset.items():
+        np.testing.assert_allclose(values, full[name][[1, 5, 6]])
+
+
+def test_marked_premiums_open_at_zero_pnl(book):
+    book.mark_premiums(SPOTS, 0.2, 0.04)
+    assert book.net_greeks(SPOTS, 0.2, 0.04)["pnl"] == pytest.approx(0.0, abs=1e-12)
+
+
+def test_iron_condor_payoff_is_capped_on_both_sides():
+    portfolio = Portfolio()
+    portfolio.add_strategy("Iron Condor", "SPY", 100.0, 5.0, 0.5)
+    payoff = portfolio.payoff_at_expiry(np.linspace(70, 130, 61))
+    assert payoff.max() == pytest.approx(0.0)
+    assert payoff.min() == pytest.approx(-5.0)
+    assert payoff[0] == payoff[-1] == pytest.approx(-5.0)
+
+
+@pytest.mark.parametrize("name", sorted(STRATEGIES))
+def test_every_strategy_builds(name):
+    portfolio = Portfolio()
+    portfolio.add_strategy(name, "SPY", 100.0, 5.0, 0.5)
+    assert len(portfolio) == len(STRATEGIES[name])
+    assert np.isfinite(portfolio.net_greeks(100.0, 0.2, 0.04)["value"])
+
+
+def test_large_book_evaluates_in_one_pass():
+    rng = np.random.default_rng(0)
+    portfolio = Portfolio()
+    n = 20_000
+    portfolio.add_legs(
+        rng.choice(["AAPL", "MSFT"], n),
+        rng.choice(["call", "put"], n),
+        rng.uniform(80, 320, n),
+        rng.uniform(0.1, 2.0, n),
+        rng.integers(-5, 6, n),
+    )
+    position = portfolio.evaluate(SPOTS, 0.25, 0.04)
+    assert position["delta"].shape == (n,)
+    assert np.isfinite(position["delta"]).all()
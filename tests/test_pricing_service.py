@@ -0,0 +1,94 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.black_scholes import BlackScholes
+from src.pricing_service import Histogram, PricingServer
+
+CONTRACT = {"s": 100.0, "k": 105.0, "t": 0.5, "r": 0.04, "sigma": 0.25, "q": 0.01}
+
+
+@pytest.fixture
+def service():
+    server = PricingServer(("127.0.0.1", 0), max_batch=64, max_wait=0.02)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def request(path, payload=None):
+        data = None if payload is None else json.dumps(payload).encode()
+        try:
+            with urllib.request.urlopen(urllib.request.Request(base_url + path, data=data), timeout=5) as response:
+                body = response.read().decode()
+                return response.status, json.loads(body) if path != "/metrics" else body
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    yield server, request
+    server.shutdown()
+    server.server_close()
+
+
+def test_single_contract_matches_black_scholes(service):
+    _, request = service
+    status, body = request("/price", CONTRACT | {"option_type": "put"})
+    expected = BlackScholes(**CONTRACT).calculate_all()
+    assert status == 200
+    assert body["call"] == pytest.approx(expected.call)
+    assert body["price"] == pytest.approx(expected.put)
+    assert body["vega"] == pytest.approx(expected.vega)
+
+
+def test_concurrent_requests_are_coalesced_into_batches(service):
+    server, request = service
+    strikes = [80.0 + i for i in range(40)]
+    with ThreadPoolExecutor(max_workers=40) as pool:
+        responses = list(pool.map(lambda k: request("/price", CONTRACT | {"k": k}), strikes))
+    for k, (status, body) in zip(strikes, responses, strict=True):
+        assert status == 200
+        assert body["put"] == pytest.approx(BlackScholes(**(CONTRACT | {"k": k})).calculate_option_price("put"))
+    sizes = server.batcher.batch_sizes
+    assert sizes.sum == 40
+    assert sizes.count < 40
+
+
+def test_bulk_endpoint_broadcasts_scalars(service):
+    _, request = service
+    status, body = request("/price/bulk", CONTRACT | {"k": [90.0, 100.0, 110.0], "option_type": "call"})
+    expected = BlackScholes(**(CONTRACT | {"k": [90.0, 100.0, 110.0]})).calculate_option_price("call")
+    assert status == 200
+    assert body["price"] == pytest.approx(list(expected))
+    assert len(body["delta_put"]) == 3
+
+
+def test_invalid_requests_are_rejected(service):
+    _, request = service
+    assert request("/price", {"s": 100.0})[0] == 400
+    assert request("/price", CONTRACT | {"k": [1.0, 2.0]})[0] == 400
+    assert request("/price/bulk", CONTRACT | {"k": [1.0, 2.0], "s": [1.0, 2.0, 3.0]})[0] == 400
+    assert request("/unknown", CONTRACT)[0] == 404
+
+
+def test_metrics_expose_latency_batches_and_queue_depth(service):
+    _, request = service
+    request("/price", CONTRACT)
+    request("/price", {"s": "abc"})
+    status, metrics = request("/metrics")
+    assert status == 200
+    assert 'pricing_request_latency_seconds_count{endpoint="/price"} 1' in metrics
+    assert 'pricing_batch_size_bucket{le="+Inf"} 1' in metrics
+    assert "pricing_queue_depth 0" in metrics
+    assert "pricing_request_errors_total 1" in metrics
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((1, 5, 10))
+    for value in (0.5, 3, 3, 7, 50):
+        histogram.observe(value)
+    lines = histogram.render("h")
+    assert lines[:4] == ['h_bucket{le="1"} 1', 'h_bucket{le="5"} 3', 'h_bucket{le="10"} 4', 'h_bucket{le="+Inf"} 5']
+    assert lines[-1] == "h_count 5"
@@ -0,0 +1,65 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from src.portfolio import Portfolio
+from src.scenarios import ScenarioGrid, run_scenarios
+
+SPOTS = {"AAPL": 100.0, "MSFT": 300.0}
+GRID = ScenarioGrid.build(spot_steps=11, vol_steps=5, days=(0, 10, 200), rate_steps=3)
+
+
+@pytest.fixture
+def book():
+    portfolio = Portfolio()
+    portfolio.add_strategy("Iron Condor", "AAPL", 100.0, 5.0, 0.5)
+    portfolio.add_strategy("Long Straddle", "MSFT", 300.0, 0.0, 0.25, quantity=2)
+    return portfolio
+
+
+def test_unshocked_scenario_has_zero_pnl(book):
+    grid = ScenarioGrid(np.array([0.0]), np.array([0.0]), np.array([0.0]), np.array([0.0]))
+    report = run_scenarios(book, SPOTS, 0.2, 0.04, grid=grid)
+    assert report.pnl.shape == (1, 1, 1, 1)
+    assert report.pnl.item() == pytest.approx(0.0, abs=1e-10)
+
+
+def test_scenario_pnl_matches_full_revaluation(book):
+    report = run_scenarios(book, SPOTS, 0.2, 0.04, grid=GRID)
+    i, j, k, m = 2, 4, 1, 0
+    shocked_spots = {name: spot * (1 + GRID.spot[i]) for name, spot in SPOTS.items()}
+    shocked = Portfolio()
+    legs = book.legs
+    shocked.add_legs(
+        [book.underlyings[code] for code in legs["underlying"]],
+        np.where(legs["is_call"], "call", "put"),
+        legs["strike"],
+        legs["expiry"] - GRID.days[k] / 365,
+        legs["quantity"],
+        book.evaluate(SPOTS, 0.2, 0.04)["value"] / legs["quantity"],
+    )
+    expected = shocked.net_greeks(shocked_spots, 0.2 + GRID.vol[j], 0.04 + GRID.rate[m])["pnl"]
+    assert report.pnl[i, j, k, m] == pytest.approx(expected)
+    assert sum(report.pnl_by_underlying.values())[i, j, k, m] == pytest.approx(expected)
+
+
+def test_chunking_and_workers_do_not_change_results(book):
+    whole = run_scenarios(book, SPOTS, 0.2, 0.04, grid=GRID)
+    chunked = run_scenarios(book, SPOTS, 0.2, 0.04, grid=GRID, chunk_cells=100)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        pooled = run_scenarios(book, SPOTS, 0.2, 0.04, grid=GRID, workers=2, chunk_cells=100)
+    np.testing.assert_allclose(chunked.pnl, whole.pnl)
+    np.testing.assert_allclose(pooled.pnl, whole.pnl)
+
+
+def test_risk_measures_and_worst_cases(book):
+    report = run_scenarios(book, SPOTS, 0.2, 0.04, grid=GRID, worst_count=5)
+    assert report.expected_shortfall[0.99] >= report.var[0.99] >= report.var[0.95]
+    assert report.expected_shortfall[0.95] >= report.var[0.95]
+    worst_pnl = [case["pnl"] for case in report.worst]
+    assert worst_pnl == sorted(worst_pnl) and len(worst_pnl) == 5
+    assert worst_pnl[0] == pytest.approx(report.pnl.min())
+    # expired straddle legs lose most when the spot does not move
+    assert report.worst[0]["days"] == 200
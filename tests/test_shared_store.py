@@ -0,0 +1,82 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src import data_fetcher
+from src.cache import MarketDataCache
+from src.shared_store import SharedMarketStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture(autouse=True)
+def upstream(monkeypatch, clock):
+    calls = []
+    lock = threading.Lock()
+
+    def fake_fetch_stock_data(ticker):
+        with lock:
+            calls.append(ticker)
+        time.sleep(0.05)
+        return {"current_price": 100.0 + len(calls), "volatility": 0.2, "dividend_yield": 0.0, "company_name": ticker}
+
+    cache = MarketDataCache(ttls=data_fetcher.MARKET_DATA_TTLS, clock=clock)
+    monkeypatch.setattr(data_fetcher, "market_data_cache", cache)
+    monkeypatch.setattr(data_fetcher, "_fetch_stock_data", fake_fetch_stock_data)
+    monkeypatch.setattr(data_fetcher, "_fetch_treasury_quotes", lambda: {"DGS1": 4.0})
+    return calls
+
+
+def test_concurrent_sessions_share_one_fetch(upstream):
+    store = SharedMarketStore()
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        results = list(executor.map(lambda _: store.stock_data("AAPL"), range(10)))
+    assert upstream == ["AAPL"]
+    assert all(result == results[0] for result in results)
+
+
+def test_refresh_ahead_of_expiry(upstream, clock):
+    store = SharedMarketStore(refresh_ahead=0.8, clock=clock)
+    first = store.stock_data("AAPL")
+    store.risk_free_rate(1)
+    assert store.refresh_due() == []
+
+    clock.now += data_fetcher.MARKET_DATA_TTLS["stock"] * 0.9
+    assert store.refresh_due() == [("stock", "AAPL")]
+    assert store.stock_data("AAPL") != first
+    assert upstream == ["AAPL", "AAPL"]
+
+
+def test_idle_keys_stop_refreshing(upstream, clock):
+    store = SharedMarketStore(idle_timeout=60, clock=clock)
+    store.stock_data("AAPL")
+    clock.now += 3600
+    assert store.refresh_due() == []
+    assert store.watched() == []
+
+
+def test_warm_and_background_thread(upstream):
+    store = SharedMarketStore(refresh_interval=0.01, refresh_ahead=0.0)
+    store.warm(["AAPL", "MSFT"])
+    assert store.watched() == [("stock", "AAPL"), ("stock", "MSFT"), ("yield_curve", "treasury")]
+    store.start()
+    try:
+        deadline = time.time() + 5
+        while store.refreshes < 3 and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        store.stop()
+    assert store.refreshes >= 3
@@ -0,0 +1,197 @@
+import asyncio
+import json
+import socketserver
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.portfolio import Portfolio
+from src.streaming import QuoteStream, StreamingPricer, open_feed, parse_quote, replay_feed
+
+FIXTURE = Path(__file__).parent / "fixtures" / "quotes_replay.jsonl"
+SPOTS = {"AAPL": 100.0, "MSFT": 300.0}
+
+
+@pytest.fixture
+def book():
+    portfolio = Portfolio()
+    portfolio.add_strategy("Iron Condor", "AAPL", 100.0, 5.0, 0.5)
+    portfolio.add_strategy("Long Straddle", "MSFT", 300.0, 0.0, 0.25)
+    return portfolio
+
+
+def last_prices():
+    quotes = [json.loads(line) for line in FIXTURE.read_text().splitlines()]
+    return {quote["symbol"]: quote["price"] for quote in quotes}
+
+
+@pytest.fixture
+def gateway():
+    servers = []
+
+    def serve(*connections):
+        # each connection gets the next payload and is then closed by the server; later ones get nothing
+        payloads = iter(connections)
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                self.wfile.write(next(payloads, b""))
+
+        server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"tcp://127.0.0.1:{server.server_address[1]}"
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+
+async def collect(feed):
+    return [quote async for quote in feed]
+
+
+def test_replay_feed_reads_jsonl_and_csv(tmp_path):
+    quotes = asyncio.run(collect(replay_feed(FIXTURE, speed=0)))
+    assert len(quotes) == 41
+    assert quotes[0].symbol == "AAPL"
+
+    path = tmp_path / "quotes.csv"
+    path.write_text("symbol,price,timestamp\naapl,101.5,1\nmsft,299,2\n")
+    assert [(q.symbol, q.price) for q in asyncio.run(collect(open_feed(f"replay://{path}?speed=0")))] == [
+        ("AAPL", 101.5),
+        ("MSFT", 299.0),
+    ]
+
+
+def test_invalid_quotes_and_feeds_are_rejected():
+    with pytest.raises(ValueError):
+        parse_quote('{"symbol": "AAPL"}')
+    with pytest.raises(ValueError):
+        open_feed("kafka://quotes")
+
+
+def test_bursts_coalesce_into_rate_limited_updates(book):
+    updates, published_at = [], []
+
+    def on_update(update):
+        updates.append(update)
+        published_at.append(time.perf_counter())
+
+    pricer = StreamingPricer(book, SPOTS, 0.2, 0.04, max_rate=20, on_update=on_update)
+    final = asyncio.run(pricer.run(replay_feed(FIXTURE, speed=1)))
+
+    # 40 ticks over 0.4 s collapse into roughly one repricing per 50 ms slot
+    assert 3 <= len(updates) <= 12
+    assert sum(update.ticks for update in updates) == 40
+    assert np.all(np.diff(published_at) >= 0.045)
+    assert final.spot == {symbol: last_prices()[symbol] for symbol in SPOTS}
+    expected = book.evaluate(final.spot, 0.2, 0.04)
+    for name, values in expected.items():
+        np.testing.assert_allclose(final.position[name], values)
+    assert final.totals["delta"] == pytest.approx(expected["delta"].sum())
+
+
+def test_only_legs_on_moved_underlyings_are_repriced(book):
+    pricer = StreamingPricer(book, SPOTS, 0.2, 0.04, max_rate=1000)
+    before = pricer.latest.position["value"]
+
+    async def aapl_only():
+        for price in (101.0, 102.0, 103.0):
+            yield parse_quote({"symbol": "AAPL", "price": price})
+        yield parse_quote({"symbol": "TSLA", "price": 250.0})
+
+    update = asyncio.run(pricer.run(aapl_only()))
+    assert update.symbols == ("AAPL",)
+    assert update.repriced == 4
+    assert update.spot == {"AAPL": 103.0, "MSFT": 300.0}
+    is_aapl = book.legs["underlying"] == 0
+    np.testing.assert_array_equal(update.position["value"][~is_aapl], before[~is_aapl])
+    assert not np.allclose(update.position["value"][is_aapl], before[is_aapl])
+
+
+def test_socket_feed_stand_in(book):
+    lines = FIXTURE.read_bytes()
+
+    async def scenario():
+        async def serve(reader, writer):
+            writer.write(lines)
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(serve, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            pricer = StreamingPricer(book, SPOTS, 0.2, 0.04, max_rate=50)
+            return await pricer.run(open_feed(f"tcp://127.0.0.1:{port}"))
+
+    assert asyncio.run(scenario()).spot == {symbol: last_prices()[symbol] for symbol in SPOTS}
+
+
+def test_quote_stream_fans_out_to_subscribers(book):
+    stream = QuoteStream(f"replay://{FIXTURE}?speed=0.5").start()
+    try:
+        pricers = [stream.subscribe(StreamingPricer(book, SPOTS, 0.2, 0.04, max_rate=50)) for _ in range(2)]
+        deadline = time.monotonic() + 5
+        while len(stream.quotes) < 3 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        time.sleep(0.1)
+    finally:
+        stream.stop()
+    assert set(stream.quotes) == {"AAPL", "MSFT", "TSLA"}
+    assert all(pricer.latest.sequence > 0 for pricer in pricers)
+    assert stream.errors == 0
+
+
+def test_quote_stream_skips_bad_records(gateway):
+    url = gateway(b'not json\n{"symbol": "AAPL"}\n' + FIXTURE.read_bytes())
+    stream = QuoteStream(url, reconnect_delay=0.05).start()
+    try:
+        assert wait_for(lambda: len(stream.quotes) == 3)
+        assert stream._thread.is_alive()
+    finally:
+        stream.stop()
+    assert stream.rejected == 2
+    assert stream.quotes["AAPL"].price == last_prices()["AAPL"]
+
+
+def test_quote_stream_reconnects_after_the_server_disconnects(gateway, book):
+    url = gateway(b'{"symbol": "AAPL", "price": 101}\n', b'{"symbol": "AAPL", "price": 102}\n')
+    stream = QuoteStream(url, reconnect_delay=0.05).start()
+    try:
+        pricer = stream.subscribe(StreamingPricer(book, SPOTS, 0.2, 0.04, max_rate=50))
+        assert wait_for(lambda: "AAPL" in stream.quotes and stream.quotes["AAPL"].price == 102)
+        assert wait_for(lambda: pricer.latest.spot["AAPL"] == 102)
+        assert stream._thread.is_alive()
+    finally:
+        stream.stop()
+    assert stream.errors >= 1
+    assert stream.rejected == 0
+
+
+def test_quote_stream_restarts_after_its_feed_ends():
+    stream = QuoteStream(f"replay://{FIXTURE}?speed=0").start()
+    first = stream._thread
+    first.join(timeout=5)
+    assert not first.is_alive()
+    assert len(stream.quotes) == 3
+
+    stream.start()
+    assert stream._thread is not first
+    stream.stop()
+
+    broken = QuoteStream("kafka://quotes").start()
+    broken._thread.join(timeout=5)
+    assert broken.errors == 1
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from src.black_scholes import BlackScholes
+from src.surface import DAYS_PER_YEAR, FIELDS, SurfaceCache, TimeSurface
+
+K, T, R, SIGMA, Q = 150.0, 1.0, 0.05, 0.25, 0.01
+
+
+@pytest.fixture
+def s_axis():
+    return np.linspace(75, 225, 100)
+
+
+@pytest.fixture
+def surface(s_axis):
+    return TimeSurface.build(s_axis, K, T, R, SIGMA, Q)
+
+
+def test_rows_match_direct_pricing(surface, s_axis):
+    for row in (1, 40, surface.steps):
+        reference = BlackScholes(s_axis, K, surface.t_axis[row], R, SIGMA, Q).calculate_all()
+        for name in FIELDS:
+            np.testing.assert_allclose(surface.values[name][row], getattr(reference, name), rtol=1e-12, atol=1e-14)
+    assert surface.t_axis[-1] == T
+
+
+def test_expiry_row_is_the_payoff(surface, s_axis):
+    at_expiry = surface.at(0.0)
+    np.testing.assert_array_equal(at_expiry["call"], np.maximum(s_axis - K, 0))
+    np.testing.assert_array_equal(at_expiry["put"], np.maximum(K - s_axis, 0))
+    np.testing.assert_array_equal(at_expiry["delta_call"] - at_expiry["delta_put"], 1.0)
+    assert not at_expiry["gamma"].any() and not at_expiry["theta_call"].any()
+
+
+def test_interpolated_curves_between_rows(surface, s_axis):
+    for days in (1, 7, 30, 100, 250):
+        remaining = days / DAYS_PER_YEAR
+        reference = BlackScholes(s_axis, K, remaining, R, SIGMA, Q).calculate_all()
+        curves = surface.at(remaining)
+        for name in ("call", "put"):
+            np.testing.assert_allclose(curves[name], getattr(reference, name), atol=2e-3)
+        np.testing.assert_allclose(curves["delta_call"], reference.delta_call, atol=2e-3)
+
+
+def test_frames_and_pnl(surface):
+    remaining = np.linspace(T, 0, 24)
+    frames = surface.at(remaining, "call")
+    assert frames.shape == (24, surface.s_axis.size)
+    np.testing.assert_allclose(frames[5], surface.at(remaining[5], "call"))
+    # time value only decays towards expiry
+    assert np.all(np.diff(frames[:, 50]) <= 1e-12)
+    np.testing.assert_allclose(surface.pnl(0.5, "put", 4.0), surface.at(0.5, "put") - 4.0)
+    with pytest.raises(ValueError):
+        surface.values["call"][0, 0] = 1.0
+
+
+def test_cache_hits_and_evictions(s_axis):
+    cache = SurfaceCache(max_entries=2, steps=16)
+    surface = cache.get(s_axis, K, T, R, SIGMA, Q)
+    assert cache.get(s_axis, K, T, R, SIGMA, Q) is surface
+    cache.get(s_axis, K, 2 * T, R, SIGMA, Q)
+    cache.get(s_axis, K, T, R, 0.3, Q)
+    assert cache.get(s_axis, K, T, R, SIGMA, Q) is not surface
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.evictions) == (1, 4, 2)
+    assert cache.stats.cells_computed == 4 * 17 * s_axis.size
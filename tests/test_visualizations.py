@@ -5,6 +5,7 @@ from src.visualizations import (
     create_greeks_plot,
     create_heatmap,
     create_profit_loss_chart,
+    lttb_downsample,
 )
 
 
@@ -80,3 +81,76 @@ def test_create_greeks_plot(stock_range, greek_data, expected_greek_count):
     for i, name in enumerate(expected_names):
         assert fig.data[i].name == name
         assert np.array_equal(fig.data[i].x, stock_range)
+
+
+def test_lean_heatmap_uses_float32_and_compact_axes(stock_range, volatility_range, random_2d_data):
+    fig = create_heatmap(stock_range, volatility_range, random_2d_data, random_2d_data, "Lean Heatmap", lean=True)
+
+    assert fig.data[0].z.dtype == np.float32
+    assert fig.data[0].x is None
+    assert fig.data[0].x0 == pytest.approx(stock_range[0])
+    assert fig.data[0].dx == pytest.approx(stock_range[1] - stock_range[0])
+    assert fig.layout.template.layout.height == 500
+    assert len(fig.to_json()) < len(
+        create_heatmap(stock_range, volatility_range, random_2d_data, random_2d_data, "Heatmap").to_json()
+    )
+
+
+def test_lean_heatmap_keeps_non_uniform_axes(volatility_range, random_2d_data):
+    s_axis = np.geomspace(90, 110, 10)
+    fig = create_heatmap(s_axis, volatility_range, random_2d_data, random_2d_data, "Lean Heatmap", lean=True)
+    np.testing.assert_allclose(fig.data[0].x, s_axis, rtol=1e-6)
+
+
+def test_lean_line_charts_use_webgl(stock_range, random_1d_data, greek_data):
+    pnl_fig = create_profit_loss_chart(stock_range, random_1d_data, 100, "Lean P&L", lean=True)
+    assert [trace.name for trace in pnl_fig.data] == ["Profit", "Loss", "Break-even"]
+    assert all(trace.type == "scattergl" for trace in pnl_fig.data)
+
+    greeks_fig = create_greeks_plot(stock_range, greek_data, "Lean Greeks", lean=True)
+    assert [trace.name for trace in greeks_fig.data] == ["Delta", "Gamma", "Vega", "Theta", "Rho"]
+    assert greeks_fig.data[0].y.dtype == np.float32
+
+
+def test_profit_loss_chart_reference_curves(stock_range, random_1d_data):
+    curves = {"Today": random_1d_data + 1, "Expiry": random_1d_data - 1}
+    fig = create_profit_loss_chart(stock_range, random_1d_data, 100, "P&L", curves=curves)
+    assert [trace.name for trace in fig.data] == ["P&L", "Break-even", "Profit", "Loss", "Today", "Expiry"]
+    assert fig.data[4].line.dash == "dash"
+
+    lean_fig = create_profit_loss_chart(stock_range, random_1d_data, 100, "P&L", lean=True, curves=curves)
+    assert [trace.name for trace in lean_fig.data][3:] == ["Today", "Expiry"]
+    assert lean_fig.data[4].type == "scattergl" and lean_fig.data[4].y.dtype == np.float32
+
+
+def test_lean_profit_loss_chart_splits_one_line_at_zero():
+    x = np.linspace(0, 4, 5)
+    fig = create_profit_loss_chart(x, np.array([2.0, -2.0, -1.0, 0.0, 3.0]), 0.5, "Split", lean=True)
+    profit, loss = fig.data[:2]
+    np.testing.assert_array_equal(profit.x, [0, 0.5, np.nan, 3, 4])
+    np.testing.assert_array_equal(profit.y, [2, 0, np.nan, 0, 3])
+    np.testing.assert_array_equal(loss.x, [np.nan, 0.5, 1, 2, 3, np.nan])
+    np.testing.assert_array_equal(loss.y, [np.nan, 0, -2, -1, 0, np.nan])
+    # the two parts only share the crossings, so the line is sent once
+    shared = np.intersect1d(profit.x[~np.isnan(profit.x)], loss.x[~np.isnan(loss.x)])
+    np.testing.assert_array_equal(shared, [0.5, 3])
+
+
+def test_lean_line_charts_downsample():
+    x = np.linspace(0, 10, 10_000)
+    fig = create_profit_loss_chart(x, np.sin(x), 0, "Downsampled", lean=True, max_points=200)
+    points = sum(np.count_nonzero(~np.isnan(trace.y)) for trace in fig.data[:2])
+    # the crossings of zero are the only points sent twice
+    assert 200 <= points <= 200 + 2 * 4
+
+
+def test_lttb_downsample_keeps_endpoints_and_extremes():
+    x = np.arange(1000.0)
+    y = np.zeros(1000)
+    y[500] = 10.0
+    keep = lttb_downsample(x, y, 50)
+    assert keep.size == 50
+    assert keep[0] == 0 and keep[-1] == 999
+    assert 500 in keep
+    assert np.all(np.diff(keep) > 0)
+    np.testing.assert_array_equal(lttb_downsample(x[:10], y[:10], 50), np.arange(10))
@@ -0,0 +1,154 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import volatility
+from src.history_store import frame_to_bars
+from src.volatility import (
+    EwmaVolatility,
+    GarchParams,
+    GarchVolatility,
+    RangeVolatility,
+    RollingVolatility,
+    VolatilityTracker,
+    estimate_volatility,
+    ewma_volatility,
+    fit_garch,
+    garch_variance,
+    log_returns,
+    range_volatility,
+    rolling_volatility,
+)
+
+FIXTURE = Path(__file__).parent / "fixtures" / "price_history_aapl.csv"
+# the fixture was simulated at 25% volatility
+FIXTURE_VOL = 0.25
+
+
+@pytest.fixture(scope="module")
+def bars():
+    return frame_to_bars(pd.read_csv(FIXTURE, index_col="Date", parse_dates=True))
+
+
+def test_rolling_volatility_matches_pandas(bars):
+    expected = pd.Series(log_returns(bars["close"])).rolling(21).std().to_numpy() * np.sqrt(252)
+    np.testing.assert_allclose(rolling_volatility(bars["close"], 21), expected, rtol=1e-8, equal_nan=True)
+
+
+def test_ewma_matches_recursion(bars):
+    squared = log_returns(bars["close"]) ** 2
+    variance, expected = squared[:21].mean(), []
+    for value in squared:
+        variance = 0.94 * variance + 0.06 * value
+        expected.append(np.sqrt(variance * 252))
+    np.testing.assert_allclose(ewma_volatility(bars["close"]), expected, rtol=1e-10)
+
+
+@pytest.mark.parametrize("method", ["parkinson", "garman-klass"])
+def test_range_estimators_recover_simulated_volatility(bars, method):
+    estimate = range_volatility(bars, window=len(bars), method=method)[-1]
+    assert estimate == pytest.approx(FIXTURE_VOL, rel=0.2)
+    with pytest.raises(ValueError):
+        range_volatility(bars, method="rogers-satchell")
+
+
+def test_fit_garch_recovers_parameters():
+    rng = np.random.default_rng(1)
+    true = GarchParams(2e-6, 0.08, 0.9)
+    returns, variance = np.empty(3000), true.long_run_variance
+    for i in range(returns.size):
+        returns[i] = rng.normal() * np.sqrt(variance)
+        variance = true.omega + true.alpha * returns[i] ** 2 + true.beta * variance
+
+    fitted = fit_garch(returns)
+    assert fitted.alpha == pytest.approx(true.alpha, abs=0.04)
+    assert fitted.beta == pytest.approx(true.beta, abs=0.05)
+    assert fitted.long_run_variance == pytest.approx(returns.var())
+    np.testing.assert_allclose(garch_variance(returns[:1], true), [true.omega + true.alpha * returns[0] ** 2 + 0.9e-4])
+
+
+def test_garch_forecast_reverts_to_long_run():
+    estimator = GarchVolatility(GarchParams(2e-6, 0.08, 0.9))
+    estimator.variance = 4e-4
+    near, far = estimator.forecast([1, 10_000])
+    assert near == pytest.approx(estimator.value)
+    assert far == pytest.approx(np.sqrt(1e-4 * 252), rel=0.01)
+
+
+@pytest.mark.parametrize(
+    "make, batch",
+    [
+        (lambda: RollingVolatility(21), lambda bars: rolling_volatility(bars["close"], 21)[-1]),
+        (lambda: EwmaVolatility(), lambda bars: ewma_volatility(bars["close"])[-1]),
+        (lambda: RangeVolatility(21, "parkinson"), lambda bars: range_volatility(bars, 21, "parkinson")[-1]),
+        (lambda: RangeVolatility(21, "garman-klass"), lambda bars: range_volatility(bars, 21, "garman-klass")[-1]),
+    ],
+)
+def test_incremental_estimators_match_batch(bars, make, batch):
+    # the first batch seeds the EWMA with a full window, as the batch estimator does
+    estimator = make()
+    estimator.update(bars[:40])
+    for bar in bars[40:200]:
+        estimator.update(bar)
+    estimator.update(bars[200:260])
+    estimator.update(bars[260:])
+    assert estimator.value == pytest.approx(batch(bars), rel=1e-9)
+
+
+def test_incremental_garch_matches_batch(bars):
+    estimator = GarchVolatility.fit(bars[:250])
+    for bar in bars[250:]:
+        estimator.update(bar)
+    returns = log_returns(bars["close"])
+    expected = garch_variance(returns, estimator.params)[-1]
+    assert estimator.value == pytest.approx(np.sqrt(expected * 252), rel=1e-9)
+
+
+def test_estimate_volatility(bars):
+    estimates = estimate_volatility(bars)
+    assert set(estimates) == {"close-to-close", "ewma", "parkinson", "garman-klass", "garch"}
+    assert all(0.1 < value < 0.5 for value in estimates.values())
+    assert "garch" not in estimate_volatility(bars[:50])
+    assert estimate_volatility(bars[:2]) == {}
+
+
+def test_estimate_volatility_skips_range_estimators_without_ranges(bars):
+    closes_only = bars.copy()
+    for field in ("open", "high", "low"):
+        closes_only[field] = closes_only["close"]
+    assert set(estimate_volatility(closes_only)) == {"close-to-close", "ewma", "garch"}
+
+
+def test_tracker_feeds_only_new_bars(bars, monkeypatch):
+    expected = estimate_volatility(bars)
+    fits = []
+    monkeypatch.setattr(volatility, "fit_garch", lambda returns: fits.append(returns.size) or fit_garch(returns))
+    tracker = VolatilityTracker()
+    for end in range(250, len(bars) + 1, 5):
+        tracker.update(bars[: end - 1])
+        estimates = tracker.estimates(bars[end - 1 : end])
+    for name in ("close-to-close", "ewma", "parkinson", "garman-klass"):
+        assert estimates[name] == pytest.approx(expected[name], rel=1e-9)
+    assert estimates["garch"] == pytest.approx(expected["garch"], rel=0.05)
+    # fitted on the first update, then again once GARCH_REFIT_BARS new bars have arrived (every 25 in steps of 5)
+    assert fits == [248, 273, 298]
+
+
+def test_tracker_pending_bars_do_not_change_state(bars):
+    tracker = VolatilityTracker()
+    tracker.update(bars[:-1])
+    settled = tracker.estimates()
+    assert tracker.estimates(bars[-1:]) != settled
+    assert tracker.estimates() == settled and tracker.seen == len(bars) - 1
+
+
+def test_tracker_replays_a_series_it_does_not_extend(bars):
+    tracker = VolatilityTracker()
+    tracker.update(bars[:200])
+    tracker.update(bars[100:250])
+    assert tracker.seen == 150
+    fresh = VolatilityTracker()
+    fresh.update(bars[100:250])
+    assert tracker.estimates() == fresh.estimates()
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from src.black_scholes import BlackScholes
+from src.workspace import FLOAT32_RELATIVE_TOLERANCE, FLOAT32_SCALED_TOLERANCE, OUTPUTS, PricingWorkspace
+
+
+@pytest.fixture
+def book():
+    # a wide spread of moneyness, expiries and volatilities, including a day to expiry
+    rng = np.random.default_rng(3)
+    s = rng.uniform(1, 1000, 50_000)
+    return s, s * rng.uniform(0.5, 1.5, s.size), rng.uniform(1 / 365, 5, s.size), 0.04, rng.uniform(0.03, 1.5, s.size)
+
+
+def test_float64_matches_black_scholes(book):
+    reference = BlackScholes(*book, 0.01).calculate_all()
+    result = PricingWorkspace(block_size=1000).calculate_all(*book, 0.01)
+    for name in OUTPUTS:
+        assert getattr(result, name).dtype == np.float64
+        np.testing.assert_allclose(getattr(result, name), getattr(reference, name), rtol=1e-12, atol=1e-12)
+
+
+def test_float32_error_bounds(book):
+    reference = BlackScholes(*book, 0.01).calculate_all()
+    result = PricingWorkspace("float32").calculate_all(*book, 0.01)
+    for name in OUTPUTS:
+        values, expected = getattr(result, name), getattr(reference, name)
+        assert values.dtype == np.float32
+        scale = np.abs(expected).max()
+        np.testing.assert_allclose(
+            values, expected, rtol=FLOAT32_RELATIVE_TOLERANCE, atol=FLOAT32_SCALED_TOLERANCE * scale, err_msg=name
+        )
+
+
+def test_broadcast_grid_and_scalars():
+    grid = BlackScholes.grid(np.linspace(80, 120, 30), np.linspace(0.1, 0.5, 20), 100, 1, 0.05, 0.01)
+    result = PricingWorkspace(block_size=64).calculate_all(grid.s, grid.k, grid.t, grid.r, grid.sigma, grid.q)
+    assert result.call.shape == (20, 30)
+    np.testing.assert_allclose(result.call, grid.calculate_option_price("call"), rtol=1e-12)
+
+    workspace = PricingWorkspace()
+    assert float(workspace.calculate_option_price(100, 100, 1, 0.05, 0.2, option_type="put")) == pytest.approx(
+        BlackScholes(100, 100, 1, 0.05, 0.2).calculate_option_price("put"), rel=1e-12
+    )
+
+
+def test_outputs_are_reused(book):
+    workspace = PricingWorkspace()
+    out = workspace.calculate_all(*book)
+    call = out.call
+    repriced = workspace.calculate_all(book[0] * 1.01, *book[1:], out=out)
+    assert repriced is out and repriced.call is call
+    np.testing.assert_allclose(call, BlackScholes(book[0] * 1.01, *book[1:]).calculate_option_price("call"), rtol=1e-12)
+
+
+def test_empty_batch_and_unknown_precision():
+    assert PricingWorkspace().calculate_all(np.array([]), 100, 1, 0.05, 0.2).call.shape == (0,)
+    with pytest.raises(ValueError):
+        PricingWorkspace("float16")
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from src.yield_curve import YieldCurve, to_continuous_rate
+
+
+@pytest.fixture
+def quotes():
+    return {"DTB4WK": 4.3, "DTB3": 4.2, "DTB6": 4.1, "DGS1": 4.0, "DGS2": 3.8, "DGS5": 3.9, "DGS10": 4.2, "DGS30": 4.5}
+
+
+def test_bill_and_bond_conversions():
+    assert to_continuous_rate("DGS10", 4.0) == pytest.approx(2 * np.log(1.02))
+    bill_rate = to_continuous_rate("DTB3", 4.0)
+    assert bill_rate == pytest.approx(-np.log(1 - 0.04 * 0.25 * 365 / 360) / 0.25)
+    assert bill_rate > 0.04
+
+
+def test_curve_passes_through_pillars(quotes):
+    curve = YieldCurve.from_quotes(quotes)
+    for series_id, quoted in quotes.items():
+        maturity = curve.maturities[list(curve.zero_rates).index(to_continuous_rate(series_id, quoted))]
+        assert curve.rate(maturity) == pytest.approx(to_continuous_rate(series_id, quoted))
+
+
+def test_interpolation_is_monotone_between_pillars(quotes):
+    curve = YieldCurve.from_quotes(quotes)
+    between = curve.rate(np.linspace(2, 5, 50))
+    assert np.all(np.diff(between) >= 0)
+    assert between.min() >= curve.rate(2) and between.max() <= curve.rate(5)
+
+
+def test_flat_extrapolation_and_vectorized_queries(quotes):
+    curve = YieldCurve.from_quotes(quotes)
+    assert curve.rate(0.01) == curve.rate(curve.maturities[0])
+    assert curve.rate(50) == curve.rate(30)
+    rates = curve.rate(np.array([[0.5, 1.0], [7.0, 20.0]]))
+    assert rates.shape == (2, 2)
+    np.testing.assert_allclose(curve.discount_factor([1.0, 2.0]), np.exp(-curve.rate([1.0, 2.0]) * [1.0, 2.0]))
+
+
+def test_single_quote_curve_is_flat():
+    curve = YieldCurve.from_quotes({"DGS1": 4.0})
+    assert curve.rate(0.1) == curve.rate(10) == pytest.approx(to_continuous_rate("DGS1", 4.0))
+
+
+def test_empty_quotes():
+    with pytest.raises(ValueError):
+        YieldCurve.from_quotes({})